@@ -0,0 +1,132 @@
+"""
+Conditional GETs: ``ETag`` on the read routes and ``304 Not Modified`` for a matching
+``If-None-Match``.
+
+A route's entity tag is made of the versions (:mod:`app.db.versions`) of the tables its
+response is read from, so it changes whenever one of them is written. The
+:func:`conditional` dependency computes it before the route runs; on a match it answers
+304 from the in-memory versions, without opening a session. Otherwise it leaves the tag
+for :class:`ETagMiddleware`, which adds it to the successful response, including the
+ones the routes build themselves (``FAST_JSON``, exports).
+The async read routes use :func:`async_conditional`, which reads the versions through
+the asynchronous engine instead.
+
+Because the versions are read before the rows, a concurrent write can only make a tag
+older than its body, never newer. That holds only when the body comes from the database
+in the same request, so the routes served from per-worker caches (by-ID lookups through
+the entity cache, timetables, free classrooms) are not tagged: their body may lag behind
+the versions. Tags are weak; equal tags mean equal documents, not always equal bytes.
+"""
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple, Type
+from fastapi import HTTPException, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.db.base import Base
+from app.db.database import get_async_engine, get_engine
+from app.db.versions import versions
+from app.repositories.expand import expanded_tables, parse_expand
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an ``If-None-Match`` header matches the tag, using weak comparison.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque
+               for candidate in if_none_match.split(","))
+
+
+def _route_tables(request: Request, tables: Sequence[str],
+                  expandable: Optional[Type[Base]]) -> List[str]:
+    """
+    The tables a route's response is read from, including its ``?expand=`` ones.
+    """
+    names: List[str] = list(tables)
+    if expandable is not None:
+        names += expanded_tables(
+            expandable, parse_expand(expandable, request.query_params.get("expand")))
+    return names
+
+
+def _check(request: Request, current: Optional[Tuple[int, ...]]) -> None:
+    """
+    Answers 304 when the request's ``If-None-Match`` matches the tag of the versions,
+    else leaves the tag for :class:`ETagMiddleware`.
+    """
+    if current is None:
+        return
+    etag = f'W/"{".".join(map(str, current))}"'
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    request.state.etag = etag
+
+
+def conditional(*tables: str, expandable: Optional[Type[Base]] = None) -> Callable[[Request], None]:
+    """
+    Builds the dependency that tags a read route and answers its conditional requests.
+
+    Args:
+        *tables (str): Tables the response is read from.
+        expandable (Optional[Type[Base]]): Listed model whose ``?expand=`` relationships
+            add their tables to the tag.
+
+    Returns:
+        Callable[[Request], None]: The dependency, for the route's ``dependencies``.
+    """
+    def check(request: Request) -> None:
+        _check(request, versions.get(get_engine(), _route_tables(request, tables, expandable)))
+
+    return check
+
+
+def async_conditional(
+    *tables: str, expandable: Optional[Type[Base]] = None
+) -> Callable[[Request], Awaitable[None]]:
+    """
+    Same as :func:`conditional` for the async read routes (``DB_MODE=async``): the
+    versions are read through the asynchronous engine on the event loop, so the route
+    takes no threadpool thread and no connection of the synchronous pool.
+
+    Args:
+        *tables (str): Tables the response is read from.
+        expandable (Optional[Type[Base]]): Listed model whose ``?expand=`` relationships
+            add their tables to the tag.
+
+    Returns:
+        Callable[[Request], Awaitable[None]]: The dependency, for the route's
+        ``dependencies``.
+    """
+    async def check(request: Request) -> None:
+        _check(request, await versions.get_async(
+            get_async_engine(), _route_tables(request, tables, expandable)))
+
+    return check
+
+
+class ETagMiddleware:
+    """
+    Adds the tag computed by :func:`conditional` to successful responses.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                etag = (scope.get("state") or {}).get("etag")
+                if etag is not None:
+                    message["headers"] = [*message.get("headers", []), (b"etag", etag.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
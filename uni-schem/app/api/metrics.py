@@ -0,0 +1,121 @@
+"""
+Prometheus instrumentation of the HTTP routes.
+
+:class:`MetricsMiddleware` records, labelled by method and route template (e.g.
+``/schedule/course/{course_id}``, never the raw path, so the label set stays bounded):
+    - ``http_requests_total``: finished requests, also labelled by status code;
+    - ``http_request_duration_seconds``: latency histogram, until the last body chunk;
+    - ``http_requests_in_progress``: requests being served;
+    - ``http_response_size_bytes``: histogram of the body sizes sent.
+Requests that match no route are labelled ``unmatched``.
+
+Under gunicorn every worker has its own counters. With ``PROMETHEUS_MULTIPROC_DIR`` set
+(see ``gunicorn.conf.py``) prometheus_client keeps them in files in that directory, and
+:func:`render` merges the files of all the workers of the replica, so whichever worker
+answers the scrape reports the replica's totals. Prometheus scrapes each replica.
+"""
+import os
+import time
+from typing import Optional, Tuple
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter,
+                               Gauge, Histogram, generate_latest, multiprocess)
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+UNMATCHED = "unmatched"
+
+# Seconds: cache hits and 304s take about a millisecond, exports and solves up to seconds.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Bytes: from a lookup of one row to a full export.
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+REQUESTS = Counter(
+    "http_requests_total", "Finished HTTP requests.", ["method", "route", "status"])
+LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to serve an HTTP request.", ["method", "route"],
+    buckets=LATENCY_BUCKETS)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served.", ["method", "route"],
+    multiprocess_mode="livesum")
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Size of the HTTP response bodies.", ["method", "route"],
+    buckets=SIZE_BUCKETS)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Returns the path template of the route that serves a request.
+
+    Resolves it the way the router will, in registration order, so that with
+    ``DB_MODE=async`` the async read routes win over the sync ones.
+
+    Args:
+        scope (Scope): The request scope; ``scope["app"]`` is the application.
+
+    Returns:
+        str: The route's path, e.g. ``/schedule/course/{course_id}``, or ``unmatched``.
+    """
+    partial: Optional[str] = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    Renders the metrics in the Prometheus text format.
+
+    Returns:
+        Tuple[bytes, str]: The exposition, merged across the workers when
+        ``PROMETHEUS_MULTIPROC_DIR`` is set, and its content type.
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    Records the count, latency, concurrency and response size of the HTTP requests.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, route = scope["method"], route_template(scope)
+        status, size = 500, 0
+
+        async def send_counted(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+            REQUESTS.labels(method, route, str(status)).inc()
+            in_progress.dec()
@@ -0,0 +1,51 @@
+"""
+Opt-in fast JSON responses (``FAST_JSON=true``).
+
+With the setting on, the list and lookup routes encode their rows with
+:class:`~app.schemas.serializer.RowSerializer` and return the bytes directly, which
+FastAPI sends without validating them against the ``response_model`` (still used for
+the OpenAPI schema), and every other route renders its validated response with orjson
+(:data:`default_response_class`). With it off, responses go through FastAPI's usual path.
+"""
+import os
+from typing import Any, Dict, Iterable, Type, Union
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+from app.schemas.serializer import serializer_for
+
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() == "true"
+
+default_response_class = ORJSONResponse if FAST_JSON else JSONResponse
+
+
+def page_response(page: Dict[str, Any], schema: Type[BaseModel]) -> Union[Dict[str, Any], Response]:
+    """
+    Returns a list route's page, pre-encoded when ``FAST_JSON`` is on.
+
+    Args:
+        page (Dict[str, Any]): ``items`` (ORM instances) and ``next_cursor``.
+        schema (Type[BaseModel]): The item schema of the route's ``Page`` response model.
+
+    Returns:
+        Union[Dict[str, Any], Response]: The page itself, or the encoded JSON response.
+    """
+    if not FAST_JSON:
+        return page
+    return Response(content=serializer_for(schema).encode_page(page), media_type="application/json")
+
+
+def list_response(rows: Iterable[Any], schema: Type[BaseModel]) -> Union[Iterable[Any], Response]:
+    """
+    Returns a lookup route's rows, pre-encoded when ``FAST_JSON`` is on.
+
+    Args:
+        rows (Iterable[Any]): The ORM instances.
+        schema (Type[BaseModel]): The item schema of the route's ``List`` response model.
+
+    Returns:
+        Union[Iterable[Any], Response]: The rows themselves, or the encoded JSON response.
+    """
+    if not FAST_JSON:
+        return rows
+    return Response(content=serializer_for(schema).encode_list(rows), media_type="application/json")
@@ -0,0 +1,47 @@
+"""
+``Server-Timing`` header with the SQL totals of each request.
+
+:class:`ServerTimingMiddleware` collects the statements of the request (see
+:mod:`app.db.queries`) and, when the response starts, reports
+``db;dur=<ms>;desc="<n> queries"`` and ``app;dur=<ms>``, the time spent until then,
+which browser devtools and most HTTP clients display. Statements run while a streamed
+response (an export) is being sent come after the header and are not in it. When the
+request ends, the statement shapes it repeated are logged.
+"""
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.db.queries import finish_request, start_request
+
+
+class ServerTimingMiddleware:
+    """
+    Adds the ``Server-Timing`` header and logs the repeated statements of each request.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = start_request(f"{scope['method']} {scope['path']}")
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = (time.perf_counter() - started) * 1000
+                timing = (f'db;dur={queries.seconds * 1000:.1f};desc="{queries.count} queries", '
+                          f"app;dur={elapsed:.1f}")
+                message["headers"] = [*message.get("headers", []),
+                                      (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish_request(queries)
@@ -0,0 +1,181 @@
+"""
+Asynchronous read routes, served when the application runs with ``DB_MODE=async``.
+
+They mirror the GET-by-ID, paginated list and lookup endpoints of the sync routers with the
+same paths, response models, dependencies and error messages, and call the same service
+functions, through :meth:`AsyncSession.run_sync
+<sqlalchemy.ext.asyncio.AsyncSession.run_sync>`: the services see a regular ``Session``
+whose statements run on the aiomysql engine, on the event loop, instead of occupying a
+threadpool thread per request. By-ID lookups therefore go through the entity caches as
+well; with ``CACHE_BACKEND=redis`` those cache calls block the event loop for a round
+trip. The routers are registered before the sync ones so they take precedence; write
+endpoints and the remaining lookups keep using the sync routers.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.conditional import async_conditional
+from app.api.edge import edge_cached
+from app.api.responses import list_response, page_response
+from app.db.base import Base
+from app.db.session import get_async_db
+from app.models.availability import Availability
+from app.models.course import Course
+from app.models.schedule import Schedule
+from app.models.student_course import StudentCourse
+from app.schemas.availability import AvailabilityExpandedOut, AvailabilityOut
+from app.schemas.classroom import ClassroomOut
+from app.schemas.course import CourseExpandedOut, CourseOut
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from app.schemas.professor import ProfessorOut
+from app.schemas.schedule import ScheduleExpandedOut, ScheduleOut
+from app.schemas.student import StudentOut
+from app.schemas.student_course import StudentCourseExpandedOut, StudentCourseOut
+from app.services import (availability_service, classroom_service, course_service,
+                          professor_service, schedule_service, student_course_service,
+                          student_service)
+
+# A service function and the 404 message returned when it finds nothing.
+Read = Tuple[Callable[..., Any], str]
+
+
+def _lookup_route(lookup: Callable[..., List[Any]], schema: Type[BaseModel], empty_detail: str):
+    """
+    Builds an endpoint that lists the rows a service lookup returns for the path value.
+
+    Args:
+        lookup (Callable[..., List[Any]]): Service function taking the session and value.
+        schema (Type[BaseModel]): The item schema of the response.
+        empty_detail (str): 404 message returned when no row matches.
+
+    Returns:
+        Callable: The async endpoint function.
+    """
+    async def lookup_route(value: int, db: AsyncSession = Depends(get_async_db)):
+        rows = await db.run_sync(lookup, value)
+        if not rows:
+            raise HTTPException(status_code=404, detail=empty_detail)
+        return list_response(rows, schema)
+
+    return lookup_route
+
+
+def build_router(
+    table: str,
+    schema: Type[BaseModel],
+    list_page: Callable[..., dict],
+    get: Optional[Read] = None,
+    lookups: Optional[Dict[str, Read]] = None,
+    expandable: Optional[Type[Base]] = None,
+    list_schema: Optional[Type[BaseModel]] = None,
+    edge: bool = False,
+    cached: bool = False,
+) -> APIRouter:
+    """
+    Builds the async read router for one entity.
+
+    Args:
+        table (str): Table name of the entity.
+        schema (Type[BaseModel]): The response schema.
+        list_page (Callable[..., dict]): Service function returning a page, taking the
+            session, ``after`` and ``limit`` (and ``expand`` when ``expandable``).
+        get (Optional[Read]): Service function and 404 message of the GET-by-ID route, or
+            None if the entity has no such route.
+        lookups (Optional[Dict[str, Read]]): Path segment mapped to the service function
+            listing the rows of a parent and the 404 message returned when it finds none.
+        expandable (Optional[Type[Base]]): Listed model whose list route reads ``expand``.
+        list_schema (Optional[Type[BaseModel]]): Item schema of the list route, when it
+            differs from ``schema`` (list items with ``?expand=`` relationships).
+        edge (bool): Whether the responses may be cached at the edge, with the same
+            surrogate keys as the sync routes.
+        cached (bool): Whether by-ID lookups go through an entity cache. Their response
+            may lag behind the table versions, so, like the sync route, it is not tagged.
+
+    Returns:
+        APIRouter: Router to mount under the entity prefix.
+    """
+    router = APIRouter(include_in_schema=False)
+
+    def dependencies(*keys: str, tagged: bool = True,
+                     expandable: Optional[Type[Base]] = None) -> list:
+        checks = [Depends(async_conditional(table, expandable=expandable))] if tagged else []
+        if edge:
+            checks.append(Depends(edge_cached(*keys, expandable=expandable)))
+        return checks
+
+    @router.get("/", response_model=Page[list_schema or schema],
+                dependencies=dependencies(table, expandable=expandable))
+    async def list_route(
+        after: Optional[int] = Query(None, ge=0),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        expand: Optional[str] = Query(None),
+        db: AsyncSession = Depends(get_async_db),
+    ):
+        # Like the sync routes, only the expandable list routes read ``expand``.
+        page = await (db.run_sync(list_page, after, limit, expand) if expandable
+                      else db.run_sync(list_page, after, limit))
+        return page_response(page, list_schema or schema)
+
+    if get:
+        get_entity, not_found = get
+
+        @router.get("/{entity_id:int}", response_model=schema,
+                    dependencies=dependencies(f"{table}:{{entity_id}}", tagged=not cached))
+        async def get_route(entity_id: int, db: AsyncSession = Depends(get_async_db)):
+            entity = await db.run_sync(get_entity, entity_id)
+            if not entity:
+                raise HTTPException(status_code=404, detail=not_found)
+            return entity
+
+    for segment, (lookup, empty_detail) in (lookups or {}).items():
+        router.add_api_route(
+            f"/{segment}/{{value:int}}",
+            _lookup_route(lookup, schema, empty_detail),
+            methods=["GET"],
+            response_model=List[schema],
+            dependencies=dependencies(f"{table}:{segment}:{{value}}"),
+        )
+
+    return router
+
+
+routers = {
+    "/availability": build_router(
+        "availability", AvailabilityOut, availability_service.list_availabilities,
+        get=(availability_service.get_availability, "Availability not found"),
+        lookups={"professor": (availability_service.get_availabilities_by_professor_id,
+                               "No availabilities found for this professor")},
+        expandable=Availability, list_schema=AvailabilityExpandedOut),
+    "/classroom": build_router(
+        "classroom", ClassroomOut, classroom_service.list_classrooms,
+        get=(classroom_service.get_classroom, "Classroom not found"),
+        edge=True, cached=True),
+    "/course": build_router(
+        "course", CourseOut, course_service.list_courses,
+        get=(course_service.get_course, "Course not found"),
+        lookups={"professor": (course_service.get_courses_by_professor_id,
+                               "No courses found for this professor")},
+        expandable=Course, list_schema=CourseExpandedOut, edge=True, cached=True),
+    "/professor": build_router(
+        "professor", ProfessorOut, professor_service.list_professors,
+        get=(professor_service.get_professor, "Professor not found"), cached=True),
+    "/schedule": build_router(
+        "schedule", ScheduleOut, schedule_service.list_schedules,
+        get=(schedule_service.get_schedule, "Schedule not found"),
+        lookups={"course": (schedule_service.get_schedules_by_course_id,
+                            "No schedules found for this course"),
+                 "classroom": (schedule_service.get_schedules_by_classroom_id,
+                               "No schedules found for this classroom")},
+        expandable=Schedule, list_schema=ScheduleExpandedOut, edge=True),
+    "/student-course": build_router(
+        "student_course", StudentCourseOut, student_course_service.list_student_courses,
+        lookups={"course": (student_course_service.get_students_by_course_id,
+                            "No students found for this course"),
+                 "student": (student_course_service.get_courses_by_student_id,
+                             "No courses found for this student")},
+        expandable=StudentCourse, list_schema=StudentCourseExpandedOut),
+    "/student": build_router(
+        "student", StudentOut, student_service.list_students,
+        get=(student_service.get_student, "Student not found"), cached=True),
+}
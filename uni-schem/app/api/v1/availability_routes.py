@@ -1,13 +1,19 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.schemas.availability import (
     AvailabilityCreate,
+    AvailabilityExpandedOut,
     AvailabilityUpdate,
     AvailabilityOut,
 )
+from app.api.conditional import conditional
+from app.models.availability import Availability
+from app.api.responses import list_response, page_response
 from app.services import availability_service
 from app.db.session import get_db
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
 
 router = APIRouter()
 
@@ -39,21 +45,48 @@ def create_availability_route(data: AvailabilityCreate, db: Session = Depends(ge
             status_code=500, detail="An error occurred during availability creation.")
 
 
-@router.get("/", response_model=List[AvailabilityOut])
-def list_availabilities_route(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[AvailabilityExpandedOut],
+            dependencies=[Depends(conditional("availability", expandable=Availability))])
+def list_availabilities_route(
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieves all professor availability entries from the database.
+    Retrieves all professor availability entries from the database, paginated by ID.
 
     Args:
+        after (Optional[int]): Cursor from the previous page's ``next_cursor``.
+        limit (int): Page size (1-1000, defaults to 100).
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (professor).
         db (Session): SQLAlchemy session, injected by FastAPI.
 
     Returns:
-        List[AvailabilityOut]: A list of all registered availability records.
+        Page[AvailabilityExpandedOut]: A list of all registered availability records, one page at a time.
+    """
+    return page_response(
+        availability_service.list_availabilities(db, after, limit, expand),
+        AvailabilityExpandedOut)
+
+
+@router.get("/export",
+            dependencies=[Depends(conditional("availability"))])
+def export_availabilities_route():
+    """
+    Streams every availability entry as newline-delimited JSON (one object per line),
+    ordered by ID, for full-table syncs that would not fit in a list response.
+
+    Returns:
+        StreamingResponse: The ``application/x-ndjson`` stream.
     """
-    return availability_service.list_availabilities(db)
+    return StreamingResponse(
+        availability_service.export_availabilities(), media_type="application/x-ndjson")
 
 
-@router.get("/{availability_id}", response_model=AvailabilityOut)
+@router.get("/{availability_id}", response_model=AvailabilityOut,
+            dependencies=[Depends(conditional("availability"))])
 def get_availability_route(availability_id: int, db: Session = Depends(get_db)):
     """
     Retrieves a single availability entry by its ID.
@@ -120,7 +153,8 @@ def delete_availability_route(availability_id: int, db: Session = Depends(get_db
     return {"message": "Availability deleted successfully"}
 
 
-@router.get("/professor/{professor_id}", response_model=List[AvailabilityOut])
+@router.get("/professor/{professor_id}", response_model=List[AvailabilityOut],
+            dependencies=[Depends(conditional("availability"))])
 def get_availabilities_by_professor_route(
     professor_id: int, db: Session = Depends(get_db)
 ):
@@ -139,4 +173,4 @@ def get_availabilities_by_professor_route(
     if not availabilities:
         raise HTTPException(
             status_code=404, detail="No availabilities found for this professor")
-    return availabilities
+    return list_response(availabilities, AvailabilityOut)
@@ -1,10 +1,16 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.schemas.classroom import ClassroomCreate, ClassroomUpdate, ClassroomOut
-from app.services import classroom_service
+from app.api.conditional import conditional
+from app.api.edge import edge_cached
+from app.api.responses import list_response, page_response
+from app.services import classroom_service, timetable_service
 from app.db.session import get_db
-from app.models.classroom import Classroom
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from app.schemas.timetable import TimetableEntry
+from app.models.day import Day
 
 router = APIRouter()
 
@@ -12,8 +18,8 @@ router = APIRouter()
 @router.post("/", response_model=ClassroomOut)
 def create_classroom_route(data: ClassroomCreate, db: Session = Depends(get_db)):
     """
-    Creates a new classroom entry after checking if the classroom name is unique,
-    and ensuring the capacity is within valid bounds.
+    Creates a new classroom entry. The service checks that the name is unique and the
+    capacity is within valid bounds.
 
     Args:
         data (ClassroomCreate): The classroom information to be registered.
@@ -25,40 +31,65 @@ def create_classroom_route(data: ClassroomCreate, db: Session = Depends(get_db))
     Raises:
         HTTPException: If the classroom name already exists or if the capacity is invalid.
     """
-    if data.capacity < 5 or data.capacity > 40:
-        raise HTTPException(
-            status_code=400,
-            detail="Classroom capacity must be between 5 and 40."
-        )
-
-    existing_classroom = db.query(Classroom).filter(
-        Classroom.name == data.name).first()
-    if existing_classroom:
-        raise HTTPException(
-            status_code=400, detail="Classroom with this name already exists."
-        )
-
     try:
         return classroom_service.register_classroom(db, data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
-@router.get("/", response_model=List[ClassroomOut])
-def list_classrooms_route(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[ClassroomOut], dependencies=[
+    Depends(conditional("classroom")), Depends(edge_cached("classroom"))])
+def list_classrooms_route(
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieves all classroom entries from the database.
+    Retrieves all classroom entries from the database, paginated by ID.
 
     Args:
+        after (Optional[int]): Cursor from the previous page's ``next_cursor``.
+        limit (int): Page size (1-1000, defaults to 100).
         db (Session): SQLAlchemy session, injected by FastAPI.
 
     Returns:
-        List[ClassroomOut]: A list of all registered classrooms.
+        Page[ClassroomOut]: A list of all registered classrooms, one page at a time.
     """
-    return classroom_service.list_classrooms(db)
+    return page_response(classroom_service.list_classrooms(db, after, limit), ClassroomOut)
+
+
+@router.get("/free", response_model=List[ClassroomOut],
+            dependencies=[Depends(edge_cached("classroom", "schedule"))])
+def list_free_classrooms_route(
+    day: int = Query(..., ge=1, le=len(Day)),
+    start: time = Query(...),
+    end: time = Query(...),
+    min_capacity: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieves the classrooms that have no session overlapping the given time window and
+    can hold at least ``min_capacity`` students.
 
+    Args:
+        day (int): Day of the week (1 = Monday ... 6 = Saturday).
+        start (time): Start of the window.
+        end (time): End of the window.
+        min_capacity (int): Minimum capacity required (defaults to 0).
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        List[ClassroomOut]: The free classrooms, smallest capacity first.
 
-@router.get("/{classroom_id}", response_model=ClassroomOut)
+    Raises:
+        HTTPException: If the start time is not before the end time (400).
+    """
+    content = classroom_service.find_free_classrooms(db, Day(day), start, end, min_capacity)
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/{classroom_id}", response_model=ClassroomOut,
+            dependencies=[Depends(edge_cached("classroom:{classroom_id}"))])
 def get_classroom_route(classroom_id: int, db: Session = Depends(get_db)):
     """
     Retrieves a classroom entry by its unique ID.
@@ -79,6 +110,29 @@ def get_classroom_route(classroom_id: int, db: Session = Depends(get_db)):
     return classroom
 
 
+@router.get("/{classroom_id}/timetable", response_model=List[TimetableEntry], dependencies=[
+    Depends(edge_cached("classroom:{classroom_id}", "schedule", "course", "professor"))])
+def get_classroom_timetable_route(classroom_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieves the weekly timetable of a classroom: every session booked in it, with
+    its course and professor.
+
+    Args:
+        classroom_id (int): The unique identifier of the classroom.
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        List[TimetableEntry]: The sessions, ordered by day and start time.
+
+    Raises:
+        HTTPException: If the classroom is not found, returns a 404 Not Found error.
+    """
+    content = timetable_service.get_classroom_timetable(db, classroom_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Classroom not found")
+    return Response(content=content, media_type="application/json")
+
+
 @router.put("/{classroom_id}", response_model=ClassroomOut)
 def update_classroom_route(classroom_id: int, updates: ClassroomUpdate, db: Session = Depends(get_db)):
     """
@@ -121,7 +175,8 @@ def delete_classroom_route(classroom_id: int, db: Session = Depends(get_db)):
     return {"message": "Classroom deleted successfully"}
 
 
-@router.get("/capacity/{capacity}", response_model=List[ClassroomOut])
+@router.get("/capacity/{capacity}", response_model=List[ClassroomOut], dependencies=[
+    Depends(conditional("classroom")), Depends(edge_cached("classroom"))])
 def get_classrooms_by_capacity_route(capacity: int, db: Session = Depends(get_db)):
     """
     Retrieves classrooms by their capacity.
@@ -133,4 +188,5 @@ def get_classrooms_by_capacity_route(capacity: int, db: Session = Depends(get_db
     Returns:
         List[ClassroomOut]: A list of classrooms matching the given capacity.
     """
-    return classroom_service.get_classrooms_by_capacity(db, capacity)
+    return list_response(
+        classroom_service.get_classrooms_by_capacity(db, capacity), ClassroomOut)
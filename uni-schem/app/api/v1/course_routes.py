@@ -1,11 +1,14 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from app.schemas.course import CourseCreate, CourseExpandedOut, CourseUpdate, CourseOut
+from app.api.conditional import conditional
+from app.api.edge import edge_cached
 from app.models.course import Course
-from app.schemas.course import CourseCreate, CourseUpdate, CourseOut
+from app.api.responses import list_response, page_response
 from app.services import course_service
 from app.db.session import get_db
-from app.models.professor import Professor
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
 
 router = APIRouter()
 
@@ -23,44 +26,40 @@ def create_course_route(course: CourseCreate, db: Session = Depends(get_db)):
         CourseOut: The newly created course record.
 
     Raises:
-        HTTPException: If a ValueError occurs during registration, returns a 400 Bad Request
-        with the corresponding error message.
+        HTTPException: If the professor does not exist (404), or if the course name or
+        code is already taken (400).
     """
-    professor = db.query(Professor).filter(
-        Professor.professor_id == course.professor_id).first()
-    if not professor:
-        raise HTTPException(status_code=404, detail="Professor not found")
-
-    existing_course_by_name = db.query(Course).filter(
-        Course.name == course.name).first()
-    if existing_course_by_name:
-        raise HTTPException(
-            status_code=400, detail="Course with this name already exists.")
-
-    existing_course_by_code = db.query(Course).filter(
-        Course.code == course.code).first()
-    if existing_course_by_code:
-        raise HTTPException(
-            status_code=400, detail="Course with this code already exists.")
-
     return course_service.register_course(db, course)
 
 
-@router.get("/", response_model=List[CourseOut])
-def list_courses_route(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[CourseExpandedOut], dependencies=[
+    Depends(conditional("course", expandable=Course)),
+    Depends(edge_cached("course", expandable=Course))])
+def list_courses_route(
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieves all course entries from the database.
+    Retrieves all course entries from the database, paginated by ID.
 
     Args:
+        after (Optional[int]): Cursor from the previous page's ``next_cursor``.
+        limit (int): Page size (1-1000, defaults to 100).
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (professor).
         db (Session): SQLAlchemy session, injected by FastAPI.
 
     Returns:
-        List[CourseOut]: A list of all registered courses.
+        Page[CourseExpandedOut]: A list of all registered courses, one page at a time.
     """
-    return course_service.list_courses(db)
+    return page_response(
+        course_service.list_courses(db, after, limit, expand), CourseExpandedOut)
 
 
-@router.get("/name/{course_name}", response_model=CourseOut)
+@router.get("/name/{course_name}", response_model=CourseOut, dependencies=[
+    Depends(conditional("course")), Depends(edge_cached("course"))])
 def get_course_by_name_route(course_name: str, db: Session = Depends(get_db)):
     """
     Retrieves a course by its name.
@@ -81,7 +80,8 @@ def get_course_by_name_route(course_name: str, db: Session = Depends(get_db)):
     return course
 
 
-@router.get("/professor/{professor_id}", response_model=List[CourseOut])
+@router.get("/professor/{professor_id}", response_model=List[CourseOut], dependencies=[
+    Depends(conditional("course")), Depends(edge_cached("course:professor:{professor_id}"))])
 def get_courses_by_professor_id_route(professor_id: int, db: Session = Depends(get_db)):
     """
     Retrieves courses by professor ID.
@@ -100,10 +100,11 @@ def get_courses_by_professor_id_route(professor_id: int, db: Session = Depends(g
     if not courses:
         raise HTTPException(
             status_code=404, detail="No courses found for this professor")
-    return courses
+    return list_response(courses, CourseOut)
 
 
-@router.get("/{course_id}", response_model=CourseOut)
+@router.get("/{course_id}", response_model=CourseOut,
+            dependencies=[Depends(edge_cached("course:{course_id}"))])
 def get_course_route(course_id: int, db: Session = Depends(get_db)):
     """
     Retrieves a course entry by its unique ID.
@@ -140,12 +141,6 @@ def update_course_route(course_id: int, updates: CourseUpdate, db: Session = Dep
     Raises:
         HTTPException: If the course is not found, returns a 404 Not Found error.
     """
-    if updates.professor_id:
-        professor = db.query(Professor).filter(
-            Professor.professor_id == updates.professor_id).first()
-        if not professor:
-            raise HTTPException(status_code=404, detail="Professor not found")
-
     updated = course_service.modify_course(db, course_id, updates)
     if not updated:
         raise HTTPException(status_code=404, detail="Course not found")
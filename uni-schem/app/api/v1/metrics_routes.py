@@ -0,0 +1,82 @@
+import os
+from fastapi import APIRouter, Response
+from app.api.metrics import render
+from app.db.database import get_async_engine, get_engine
+from app.db.pool import pool_stats
+from app.cache.edge import purger
+from app.cache.entity_cache import cache_stats
+from app.cache.invalidation import bus
+
+router = APIRouter()
+
+
+@router.get("", response_class=Response)
+def prometheus_metrics_route():
+    """
+    Exposes the HTTP request metrics in the Prometheus text format.
+
+    Unlike the other metrics routes, the counters are merged across the gunicorn workers
+    of the replica (see ``app.api.metrics``), so any worker gives the same answer.
+
+    Returns:
+        Response: Request counts, latency and response size histograms, and in-progress
+        requests, per method and route template.
+    """
+    content, media_type = render()
+    return Response(content=content, media_type=media_type)
+
+
+@router.get("/pool")
+def pool_metrics_route():
+    """
+    Reports the database connection pool state of the worker serving the request.
+
+    Each gunicorn worker owns its own pools, so the response includes the worker PID;
+    repeated calls may be answered by different workers.
+
+    Returns:
+        dict: The worker PID and, per engine (``sync`` and, with ``DB_MODE=async``,
+        ``async``), the pool size, connections in use, idle and in overflow, and the
+        checkout count, timeouts and wait-time histogram.
+    """
+    pools = {"sync": pool_stats(get_engine().pool)}
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        pools["async"] = pool_stats(async_engine.sync_engine.pool)
+    return {"pid": os.getpid(), "pools": pools}
+
+
+@router.get("/cache")
+def cache_metrics_route():
+    """
+    Reports the entity cache counters of the worker serving the request.
+
+    Returns:
+        dict: The worker PID, the cache backend and its size (None when it is shared),
+        and the hits, misses and backend errors per cached table.
+    """
+    return {"pid": os.getpid(), **cache_stats()}
+
+
+@router.get("/invalidation")
+def invalidation_metrics_route():
+    """
+    Reports the invalidation bus counters of the worker serving the request.
+
+    Returns:
+        dict: The worker PID, the transport and whether it is connected, the published,
+        received, late, reset and error counts, and the delivery lag of received events.
+    """
+    return {"pid": os.getpid(), **bus.stats()}
+
+
+@router.get("/edge")
+def edge_metrics_route():
+    """
+    Reports the edge cache purge counters of the worker serving the request.
+
+    Returns:
+        dict: The worker PID, whether purging is enabled, the cached responses' max age,
+        and the purge requests sent, keys purged and failed requests.
+    """
+    return {"pid": os.getpid(), **purger.stats()}
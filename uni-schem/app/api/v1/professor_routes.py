@@ -1,10 +1,16 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from app.models.day import Day
 from app.schemas.professor import ProfessorCreate, ProfessorUpdate, ProfessorOut
-from app.services import professor_service
+from app.api.conditional import conditional
+from app.api.responses import page_response
+from app.services import professor_service, timetable_service
 from app.db.session import get_db
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from app.schemas.timetable import TimetableEntry
 
 router = APIRouter()
 
@@ -31,18 +37,51 @@ def create_professor_route(professor: ProfessorCreate, db: Session = Depends(get
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
-@router.get("/", response_model=List[ProfessorOut])
-def list_professors_route(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[ProfessorOut],
+            dependencies=[Depends(conditional("professor"))])
+def list_professors_route(
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieves all professors, paginated by ID.
+
+    Args:
+        after (Optional[int]): Cursor from the previous page's ``next_cursor``.
+        limit (int): Page size (1-1000, defaults to 100).
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        Page[ProfessorOut]: A list of all registered professors, one page at a time.
     """
-    Retrieves all professors.
+    return page_response(professor_service.list_professors(db, after, limit), ProfessorOut)
+
+
+@router.get("/free", response_model=List[ProfessorOut])
+def list_free_professors_route(
+    day: int = Query(..., ge=1, le=len(Day)),
+    start: time = Query(...),
+    end: time = Query(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieves the professors who are available during the whole time window and teach
+    no session overlapping it.
 
     Args:
+        day (int): Day of the week (1 = Monday ... 6 = Saturday).
+        start (time): Start of the window.
+        end (time): End of the window.
         db (Session): SQLAlchemy session, injected by FastAPI.
 
     Returns:
-        List[ProfessorOut]: A list of all registered professors.
+        List[ProfessorOut]: The free professors, ordered by ID.
+
+    Raises:
+        HTTPException: If the start time is not before the end time (400).
     """
-    return professor_service.list_professors(db)
+    return professor_service.find_free_professors(db, Day(day), start, end)
 
 
 @router.get("/{professor_id}", response_model=ProfessorOut)
@@ -66,7 +105,8 @@ def get_professor_route(professor_id: int, db: Session = Depends(get_db)):
     return professor
 
 
-@router.get("/dni/{dni}", response_model=ProfessorOut)
+@router.get("/dni/{dni}", response_model=ProfessorOut,
+            dependencies=[Depends(conditional("professor"))])
 def get_professor_by_dni_route(dni: str, db: Session = Depends(get_db)):
     """
     Retrieves a professor by their DNI.
@@ -87,6 +127,28 @@ def get_professor_by_dni_route(dni: str, db: Session = Depends(get_db)):
     return professor
 
 
+@router.get("/{professor_id}/timetable", response_model=List[TimetableEntry])
+def get_professor_timetable_route(professor_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieves the weekly timetable of a professor: the sessions of every course they
+    teach, with their course and classroom.
+
+    Args:
+        professor_id (int): The unique identifier of the professor.
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        List[TimetableEntry]: The sessions, ordered by day and start time.
+
+    Raises:
+        HTTPException: If the professor is not found, returns a 404 Not Found error.
+    """
+    content = timetable_service.get_professor_timetable(db, professor_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Professor not found")
+    return Response(content=content, media_type="application/json")
+
+
 @router.put("/{professor_id}", response_model=ProfessorOut)
 def update_professor_route(
     professor_id: int, updates: ProfessorUpdate, db: Session = Depends(get_db)
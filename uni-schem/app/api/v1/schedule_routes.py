@@ -1,9 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleOut
+from app.schemas.schedule import (ScheduleBulkCreate, ScheduleBulkOut, ScheduleCreate,
+                                  ScheduleExpandedOut, ScheduleUpdate, ScheduleOut,
+                                  ScheduleSolveRequest, ScheduleSolveOut)
+from app.api.conditional import conditional
+from app.api.edge import edge_cached
+from app.models.schedule import Schedule
+from app.api.responses import list_response, page_response
 from app.services import schedule_service
 from app.db.session import get_db
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
 
 router = APIRouter()
 
@@ -35,21 +43,99 @@ def create_schedule_route(schedule: ScheduleCreate, db: Session = Depends(get_db
             status_code=500, detail="An error occurred during schedule creation.")
 
 
-@router.get("/", response_model=List[ScheduleOut])
-def list_schedules_route(db: Session = Depends(get_db)):
+@router.post("/bulk", response_model=ScheduleBulkOut)
+def create_schedules_bulk_route(data: ScheduleBulkCreate, db: Session = Depends(get_db)):
     """
-    Retrieves all schedule entries.
+    Imports many schedule entries at once in a single transaction.
+
+    Rows referencing unknown courses or classrooms, with invalid times, or overlapping an
+    existing session or an earlier row of the same request are rejected individually; the
+    valid rows are still inserted.
+
+    Args:
+        data (ScheduleBulkCreate): The sessions to import.
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        ScheduleBulkOut: Created and rejected counts and the per-row results.
+
+    Raises:
+        HTTPException: If the insert fails, returns 500 Internal Server Error.
+    """
+    return schedule_service.register_schedules(db, data)
+
+
+@router.post("/solve", response_model=ScheduleSolveOut)
+def solve_schedules_route(request: ScheduleSolveRequest, db: Session = Depends(get_db)):
+    """
+    Automatically generates a conflict-free timetable for the courses that have no schedule
+    yet, respecting professor availability, classroom capacity and student clashes.
+
+    Args:
+        request (ScheduleSolveRequest): Solver parameters (sessions per course, session length,
+            allowed days and hours, and whether to store the result).
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        ScheduleSolveOut: The placed sessions and the courses that could not be fully placed.
+
+    Raises:
+        HTTPException: If the parameters are invalid (400) or a requested course does not
+        exist (404).
+    """
+    try:
+        return schedule_service.solve_schedules(db, request)
+    except HTTPException as e:
+        db.rollback()
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500, detail="An error occurred while solving the timetable.")
+
+
+@router.get("/", response_model=Page[ScheduleExpandedOut], dependencies=[
+    Depends(conditional("schedule", expandable=Schedule)),
+    Depends(edge_cached("schedule", expandable=Schedule))])
+def list_schedules_route(
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieves all schedule entries, paginated by ID.
 
     Args:
+        after (Optional[int]): Cursor from the previous page's ``next_cursor``.
+        limit (int): Page size (1-1000, defaults to 100).
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (course, classroom).
         db (Session): SQLAlchemy session, injected by FastAPI.
 
     Returns:
-        List[ScheduleOut]: A list of all schedules.
+        Page[ScheduleExpandedOut]: A list of all schedules, one page at a time.
+    """
+    return page_response(
+        schedule_service.list_schedules(db, after, limit, expand), ScheduleExpandedOut)
+
+
+@router.get("/export", dependencies=[
+    Depends(conditional("schedule")), Depends(edge_cached("schedule"))])
+def export_schedules_route():
+    """
+    Streams every schedule entry as newline-delimited JSON (one object per line),
+    ordered by ID, for full-table syncs that would not fit in a list response.
+
+    Returns:
+        StreamingResponse: The ``application/x-ndjson`` stream.
     """
-    return schedule_service.list_schedules(db)
+    return StreamingResponse(
+        schedule_service.export_schedules(), media_type="application/x-ndjson")
 
 
-@router.get("/{schedule_id}", response_model=ScheduleOut)
+@router.get("/{schedule_id}", response_model=ScheduleOut, dependencies=[
+    Depends(conditional("schedule")), Depends(edge_cached("schedule:{schedule_id}"))])
 def get_schedule_route(schedule_id: int, db: Session = Depends(get_db)):
     """
     Retrieves a schedule entry by its unique ID.
@@ -70,7 +156,8 @@ def get_schedule_route(schedule_id: int, db: Session = Depends(get_db)):
     return schedule
 
 
-@router.get("/course/{course_id}", response_model=List[ScheduleOut])
+@router.get("/course/{course_id}", response_model=List[ScheduleOut], dependencies=[
+    Depends(conditional("schedule")), Depends(edge_cached("schedule:course:{course_id}"))])
 def get_schedules_by_course_id_route(course_id: int, db: Session = Depends(get_db)):
     """
     Retrieves all schedules for a specific course by its ID.
@@ -89,10 +176,12 @@ def get_schedules_by_course_id_route(course_id: int, db: Session = Depends(get_d
     if not schedules:
         raise HTTPException(
             status_code=404, detail="No schedules found for this course")
-    return schedules
+    return list_response(schedules, ScheduleOut)
 
 
-@router.get("/classroom/{classroom_id}", response_model=List[ScheduleOut])
+@router.get("/classroom/{classroom_id}", response_model=List[ScheduleOut], dependencies=[
+    Depends(conditional("schedule")),
+    Depends(edge_cached("schedule:classroom:{classroom_id}"))])
 def get_schedules_by_classroom_id_route(classroom_id: int, db: Session = Depends(get_db)):
     """
     Retrieves all schedules for a specific classroom by its ID.
@@ -112,7 +201,7 @@ def get_schedules_by_classroom_id_route(classroom_id: int, db: Session = Depends
     if not schedules:
         raise HTTPException(
             status_code=404, detail="No schedules found for this classroom")
-    return schedules
+    return list_response(schedules, ScheduleOut)
 
 
 @router.put("/{schedule_id}", response_model=ScheduleOut)
@@ -1,12 +1,20 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.schemas.student_course import (
+    StudentCourseBulkCreate,
+    StudentCourseBulkOut,
     StudentCourseCreate,
+    StudentCourseExpandedOut,
     StudentCourseOut,
 )
+from app.api.conditional import conditional
+from app.models.student_course import StudentCourse
+from app.api.responses import list_response, page_response
 from app.services import student_course_service
 from app.db.session import get_db
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
 
 router = APIRouter()
 
@@ -34,21 +42,71 @@ def create_student_course_route(
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
-@router.get("/", response_model=List[StudentCourseOut])
-def list_student_courses_route(db: Session = Depends(get_db)):
+@router.post("/bulk", response_model=StudentCourseBulkOut)
+def create_student_courses_bulk_route(
+    data: StudentCourseBulkCreate, db: Session = Depends(get_db)
+):
+    """
+    Enrolls many students at once in a single transaction.
+
+    Rows referencing unknown students or courses, or duplicating an existing or earlier
+    enrollment, are rejected individually; the valid rows are still inserted.
+
+    Args:
+        data (StudentCourseBulkCreate): The enrollments to register.
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        StudentCourseBulkOut: Created and rejected counts and the per-row results.
+
+    Raises:
+        HTTPException: If the insert fails, returns 500 Internal Server Error.
     """
-    Retrieves all student-course enrollment records from the database.
+    return student_course_service.register_student_courses(db, data)
+
+
+@router.get("/", response_model=Page[StudentCourseExpandedOut],
+            dependencies=[Depends(conditional("student_course", expandable=StudentCourse))])
+def list_student_courses_route(
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieves all student-course enrollment records from the database, paginated by ID.
 
     Args:
+        after (Optional[int]): Cursor from the previous page's ``next_cursor``.
+        limit (int): Page size (1-1000, defaults to 100).
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (student, course).
         db (Session): SQLAlchemy session, injected by FastAPI.
 
     Returns:
-        List[StudentCourseOut]: A list of all registered student-course enrollments.
+        Page[StudentCourseExpandedOut]: A list of all registered student-course enrollments, one page at a time.
+    """
+    return page_response(
+        student_course_service.list_student_courses(db, after, limit, expand),
+        StudentCourseExpandedOut)
+
+
+@router.get("/export",
+            dependencies=[Depends(conditional("student_course"))])
+def export_student_courses_route():
+    """
+    Streams every student-course enrollment as newline-delimited JSON (one object per line),
+    ordered by ID, for full-table syncs that would not fit in a list response.
+
+    Returns:
+        StreamingResponse: The ``application/x-ndjson`` stream.
     """
-    return student_course_service.list_student_courses(db)
+    return StreamingResponse(
+        student_course_service.export_student_courses(), media_type="application/x-ndjson")
 
 
-@router.get("/course/{course_id}", response_model=List[StudentCourseOut])
+@router.get("/course/{course_id}", response_model=List[StudentCourseOut],
+            dependencies=[Depends(conditional("student_course"))])
 def get_student_courses_by_course_route(course_id: int, db: Session = Depends(get_db)):
     """
     Retrieves all students enrolled in a specific course by course ID.
@@ -67,10 +125,11 @@ def get_student_courses_by_course_route(course_id: int, db: Session = Depends(ge
     if not relations:
         raise HTTPException(
             status_code=404, detail="No students found for this course")
-    return relations
+    return list_response(relations, StudentCourseOut)
 
 
-@router.get("/student/{student_id}", response_model=List[StudentCourseOut])
+@router.get("/student/{student_id}", response_model=List[StudentCourseOut],
+            dependencies=[Depends(conditional("student_course"))])
 def get_student_courses_by_student_route(student_id: int, db: Session = Depends(get_db)):
     """
     Retrieves all courses a specific student is enrolled in by student ID.
@@ -90,7 +149,7 @@ def get_student_courses_by_student_route(student_id: int, db: Session = Depends(
     if not relations:
         raise HTTPException(
             status_code=404, detail="No courses found for this student")
-    return relations
+    return list_response(relations, StudentCourseOut)
 
 
 @router.delete("/{relation_id}")
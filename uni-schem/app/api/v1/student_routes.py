@@ -1,9 +1,14 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.schemas.student import StudentCreate, StudentUpdate, StudentOut
-from app.services import student_service
+from app.api.conditional import conditional
+from app.api.responses import page_response
+from app.services import student_service, timetable_service
 from app.db.session import get_db
+from app.schemas.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from app.schemas.timetable import TimetableEntry
 
 router = APIRouter()
 
@@ -29,18 +34,39 @@ def create_student_route(student: StudentCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
-@router.get("/", response_model=List[StudentOut])
-def list_students_route(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[StudentOut],
+            dependencies=[Depends(conditional("student"))])
+def list_students_route(
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieves all student records.
+    Retrieves all student records, paginated by ID.
 
     Args:
+        after (Optional[int]): Cursor from the previous page's ``next_cursor``.
+        limit (int): Page size (1-1000, defaults to 100).
         db (Session): The database session dependency.
 
     Returns:
-        List[StudentOut]: A list of all registered students.
+        Page[StudentOut]: A list of all registered students, one page at a time.
     """
-    return student_service.list_students(db)
+    return page_response(student_service.list_students(db, after, limit), StudentOut)
+
+
+@router.get("/export",
+            dependencies=[Depends(conditional("student"))])
+def export_students_route():
+    """
+    Streams every student as newline-delimited JSON (one object per line),
+    ordered by ID, for full-table syncs that would not fit in a list response.
+
+    Returns:
+        StreamingResponse: The ``application/x-ndjson`` stream.
+    """
+    return StreamingResponse(
+        student_service.export_students(), media_type="application/x-ndjson")
 
 
 @router.get("/{student_id}", response_model=StudentOut)
@@ -64,7 +90,8 @@ def get_student_route(student_id: int, db: Session = Depends(get_db)):
     return student
 
 
-@router.get("/dni/{dni}", response_model=StudentOut)
+@router.get("/dni/{dni}", response_model=StudentOut,
+            dependencies=[Depends(conditional("student"))])
 def get_student_by_dni_route(dni: str, db: Session = Depends(get_db)):
     """
     Retrieves a student record by their DNI (document number).
@@ -85,6 +112,28 @@ def get_student_by_dni_route(dni: str, db: Session = Depends(get_db)):
     return student
 
 
+@router.get("/{student_id}/timetable", response_model=List[TimetableEntry])
+def get_student_timetable_route(student_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieves the weekly timetable of a student: the sessions of every course they
+    are enrolled in, with their course, classroom and professor.
+
+    Args:
+        student_id (int): The unique identifier of the student.
+        db (Session): SQLAlchemy session, injected by FastAPI.
+
+    Returns:
+        List[TimetableEntry]: The sessions, ordered by day and start time.
+
+    Raises:
+        HTTPException: If the student is not found, returns a 404 Not Found error.
+    """
+    content = timetable_service.get_student_timetable(db, student_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return Response(content=content, media_type="application/json")
+
+
 @router.put("/{student_id}", response_model=StudentOut)
 def update_student_route(student_id: int, updates: StudentUpdate, db: Session = Depends(get_db)):
     """
@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local").lower()
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://redis:6379/0")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface of the entity caches. Values are JSON-serializable dicts so that a
+    backend shared by every replica can store them.
+
+    Attributes:
+        shared (bool): Whether every worker and replica sees the same entries, which a
+            worker therefore keeps when its invalidation subscriber reconnects.
+    """
+
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the value stored under ``key``, or None if absent or expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Stores ``value`` under ``key`` for ``ttl`` seconds.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Removes ``key`` if present.
+        """
+
+    @abstractmethod
+    def clear(self, prefix: str) -> None:
+        """
+        Removes every key starting with ``prefix``.
+        """
+
+    def size(self) -> Optional[int]:
+        """
+        Returns the number of stored entries, or None if the backend cannot tell cheaply.
+        """
+        return None
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    Per-process LRU cache with a time-to-live per entry. Each gunicorn worker has its own;
+    writes made by other workers evict entries through the invalidation bus, or at the
+    latest when they expire.
+
+    Args:
+        max_entries (int): Entries kept before the least recently used one is evicted.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker and replica, stored in Redis as JSON strings. Requires
+    the ``redis`` package.
+
+    Args:
+        url (str): Redis connection URL.
+        prefix (str): Prefix added to every key.
+    """
+
+    shared = True
+
+    def __init__(self, url: str = CACHE_REDIS_URL, prefix: str = "uni-schem:"):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self._prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(self._prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def clear(self, prefix: str) -> None:
+        keys = list(self._client.scan_iter(match=self._prefix + prefix + "*", count=1000))
+        if keys:
+            self._client.delete(*keys)
+
+
+def build_backend() -> CacheBackend:
+    """
+    Creates the backend selected by ``CACHE_BACKEND``.
+
+    Returns:
+        CacheBackend: A :class:`LocalCacheBackend` (``local``) or :class:`RedisCacheBackend`
+        (``redis``).
+
+    Raises:
+        ValueError: If ``CACHE_BACKEND`` has any other value.
+    """
+    if CACHE_BACKEND == "local":
+        return LocalCacheBackend()
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend()
+    raise ValueError("CACHE_BACKEND must be either 'local' or 'redis'.")
@@ -0,0 +1,174 @@
+"""
+Purging of the responses kept by the HTTP cache in front of the replicas.
+
+Edge-cached read routes (see :mod:`app.api.edge`) list in a ``Surrogate-Key`` header the
+keys of the rows their response is built from:
+    - ``<table>`` for responses over the whole table (lists, exports, filtered lookups);
+    - ``<table>:<id>`` for a single row;
+    - ``<table>:<parent>:<id>`` for the rows of one parent, e.g. ``schedule:classroom:12``.
+After committing, the repository writes call :func:`purge` with the keys of every row
+they updated (before and after the change) or deleted, and the cache drops every response
+tagged with one of them. Inserts purge only the table and parent keys: no response can
+be cached under the key of a row that did not exist yet.
+
+A purge is an ``EDGE_PURGE_METHOD`` request to ``EDGE_PURGE_URL`` carrying the keys in a
+``Surrogate-Key`` header, as understood by Varnish (xkey), Souin and Fastly, sent by a
+background thread of the worker so that writes do not wait for the cache. Without a URL
+purging is disabled and responses stay cached until ``EDGE_CACHE_MAX_AGE`` expires.
+"""
+import logging
+import os
+import threading
+import urllib.request
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+EDGE_CACHE_MAX_AGE = int(os.getenv("EDGE_CACHE_MAX_AGE", "5"))
+EDGE_PURGE_URL = os.getenv("EDGE_PURGE_URL", "")
+EDGE_PURGE_METHOD = os.getenv("EDGE_PURGE_METHOD", "PURGE").upper()
+EDGE_PURGE_TIMEOUT = float(os.getenv("EDGE_PURGE_TIMEOUT", "1"))
+
+# Keys per purge request, which keeps the header far below the usual 8 KB limit.
+PURGE_BATCH_SIZE = 200
+
+
+def keys_for(table: str, row_id: Optional[int] = None, **parents: Optional[int]) -> List[str]:
+    """
+    Builds the surrogate keys of a written row.
+
+    Args:
+        table (str): Table name of the row.
+        row_id (Optional[int]): Primary key of the row, if known.
+        **parents (Optional[int]): Parent name mapped to the row's foreign key value,
+            e.g. ``classroom=12``; None values are skipped.
+
+    Returns:
+        List[str]: The table key, the row key and one key per parent.
+    """
+    keys = [table]
+    if row_id is not None:
+        keys.append(f"{table}:{row_id}")
+    keys += [f"{table}:{parent}:{parent_id}"
+             for parent, parent_id in parents.items() if parent_id is not None]
+    return keys
+
+
+class EdgePurger:
+    """
+    Sends purge requests to the HTTP cache from a background thread.
+
+    :meth:`purge` only queues the keys, so writes never wait on the cache. The sender
+    thread takes every key queued so far, deduplicated, and sends them in batches of
+    ``PURGE_BATCH_SIZE``; keys queued meanwhile wait for the next round.
+
+    Args:
+        url (str): Purge endpoint of the cache; empty to disable purging.
+        method (str): HTTP method of the purge requests.
+        timeout (float): Seconds to wait for the cache to answer.
+    """
+
+    def __init__(self, url: str = EDGE_PURGE_URL, method: str = EDGE_PURGE_METHOD,
+                 timeout: float = EDGE_PURGE_TIMEOUT):
+        self.url = url
+        self.method = method
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pending: Set[str] = set()
+        self._sending = False
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"requests": 0, "keys": 0, "errors": 0}
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def purge(self, keys: Iterable[str]) -> None:
+        """
+        Queues the keys for purging and returns at once.
+
+        Args:
+            keys (Iterable[str]): Surrogate keys, duplicates allowed.
+        """
+        if not self.url:
+            return
+        with self._lock:
+            self._pending.update(keys)
+            if self._thread is None or not self._thread.is_alive():
+                # Started on first use, so that it runs in the forked gunicorn worker.
+                self._thread = threading.Thread(
+                    target=self._run, name="edge-purger", daemon=True)
+                self._thread.start()
+            self._changed.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._changed.wait()
+                keys = sorted(self._pending)
+                self._pending.clear()
+                self._sending = True
+            try:
+                for start in range(0, len(keys), PURGE_BATCH_SIZE):
+                    self._send(keys[start:start + PURGE_BATCH_SIZE])
+            finally:
+                with self._lock:
+                    self._sending = False
+                    self._changed.notify_all()
+
+    def _send(self, batch: List[str]) -> None:
+        # A failure is logged and counted, never retried: the write has been committed
+        # anyway, and the cached responses expire after ``EDGE_CACHE_MAX_AGE`` seconds.
+        request = urllib.request.Request(
+            self.url, method=self.method, headers={"Surrogate-Key": " ".join(batch)})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except Exception:
+            logger.warning("Could not purge %d edge cache key(s)", len(batch), exc_info=True)
+            self._count("errors")
+            return
+        self._count("requests")
+        self._count("keys", len(batch))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued key has been sent.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most; None to wait indefinitely.
+
+        Returns:
+            bool: True if nothing is left to send.
+        """
+        with self._lock:
+            return self._changed.wait_for(
+                lambda: not self._pending and not self._sending, timeout)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns the purge counters.
+
+        Returns:
+            Dict[str, object]: Whether purging is enabled, the cached responses' max age,
+            the keys waiting to be sent, and the ``requests``, ``keys`` and ``errors``
+            counters.
+        """
+        with self._lock:
+            return {"enabled": bool(self.url), "max_age": EDGE_CACHE_MAX_AGE,
+                    "pending": len(self._pending), **self._counters}
+
+
+purger = EdgePurger()
+
+
+def purge(*keys: str) -> None:
+    """
+    Queues keys on the process-wide purger (see :meth:`EdgePurger.purge`).
+
+    Args:
+        *keys (str): Surrogate keys, usually built with :func:`keys_for`.
+    """
+    purger.purge(keys)
@@ -0,0 +1,181 @@
+import logging
+import threading
+from typing import Callable, Dict, Optional, Type
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.cache.backends import CACHE_TTL, CacheBackend, build_backend
+from app.cache.invalidation import ALL, subscribe
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+# Every EntityCache registers itself here, keyed by table name, for the metrics endpoint.
+caches: Dict[str, "EntityCache"] = {}
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> CacheBackend:
+    """
+    Returns the process-wide cache backend, creating it on first use.
+
+    Returns:
+        CacheBackend: The backend selected by ``CACHE_BACKEND``.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = build_backend()
+    return _backend
+
+
+def set_backend(backend: CacheBackend) -> None:
+    """
+    Replaces the cache backend, e.g. with a :class:`~app.cache.backends.LocalCacheBackend`
+    standing in for a shared one.
+
+    Args:
+        backend (CacheBackend): The backend every entity cache will use from now on.
+    """
+    global _backend
+    _backend = backend
+
+
+class EntityCache:
+    """
+    Read-through cache of one model's rows by primary key.
+
+    The cached value is the row's column dict. On a hit, the instance is rebuilt as a
+    detached object and merged into the caller's session without a SELECT, so it behaves
+    like a freshly loaded one: it can be modified and committed, and its relationships
+    lazy-load. Entries expire after ``CACHE_TTL`` seconds and are dropped when the
+    invalidation bus reports a write to the row, from this process or any other.
+
+    Args:
+        model (Type[Base]): The mapped model class.
+        ttl (float): Seconds an entry stays valid.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that went to the database.
+        errors (int): Backend failures; the lookup then falls back to the database.
+    """
+
+    def __init__(self, model: Type[Base], ttl: float = CACHE_TTL):
+        self.model = model
+        self.ttl = ttl
+        self.name = model.__tablename__
+        # The table, not the mapper: reading mapper attributes configures every mapper, which
+        # fails while the models of the relationships are not imported yet.
+        self._columns = [column.key for column in model.__table__.columns]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        caches[self.name] = self
+        subscribe(self._on_invalidation)
+
+    def _key(self, entity_id: int) -> str:
+        return f"{self.name}:{entity_id}"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, db: Session, entity_id: int, load: Callable[[], Optional[Base]]) -> Optional[Base]:
+        """
+        Returns the row with the given ID, from the cache or else from ``load``.
+
+        Args:
+            db (Session): The session the instance is attached to.
+            entity_id (int): The primary key value.
+            load (Callable[[], Optional[Base]]): Queries the database on a miss.
+
+        Returns:
+            Optional[Base]: The instance, or None if the row does not exist. Missing rows
+            are not cached.
+        """
+        key = self._key(entity_id)
+        try:
+            values = get_backend().get(key)
+        except Exception:
+            logger.warning("Cache backend failed reading %s", key, exc_info=True)
+            self._count("errors")
+            return load()
+
+        if values is not None:
+            self._count("hits")
+            instance = self.model(**values)
+            make_transient_to_detached(instance)
+            return db.merge(instance, load=False)
+
+        self._count("misses")
+        instance = load()
+        if instance is not None:
+            try:
+                get_backend().set(
+                    key, {column: getattr(instance, column) for column in self._columns}, self.ttl)
+            except Exception:
+                logger.warning("Cache backend failed writing %s", key, exc_info=True)
+                self._count("errors")
+        return instance
+
+    def invalidate(self, entity_id: int) -> None:
+        """
+        Drops the entry of a row that was updated or deleted. Repository writes go through
+        :func:`~app.cache.invalidation.publish` instead, which calls this in every process.
+
+        Args:
+            entity_id (int): The primary key value.
+        """
+        try:
+            get_backend().delete(self._key(entity_id))
+        except Exception:
+            logger.warning("Cache backend failed deleting %s", self._key(entity_id), exc_info=True)
+            self._count("errors")
+
+    def _on_invalidation(self, entity: str, entity_id: Optional[int]) -> None:
+        if entity == ALL:
+            if not get_backend().shared:
+                self.clear()
+        elif entity == self.name:
+            if entity_id is None:
+                self.clear()
+            else:
+                self.invalidate(entity_id)
+
+    def clear(self) -> None:
+        """
+        Drops every entry of this cache.
+        """
+        try:
+            get_backend().clear(f"{self.name}:")
+        except Exception:
+            logger.warning("Cache backend failed clearing %s", self.name, exc_info=True)
+            self._count("errors")
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Returns the counters of this cache.
+
+        Returns:
+            Dict[str, int]: ``hits``, ``misses`` and ``errors``.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+def cache_stats() -> dict:
+    """
+    Collects the counters of every entity cache.
+
+    Returns:
+        dict: The backend class and size, and per-table ``hits``, ``misses`` and ``errors``.
+    """
+    backend = get_backend()
+    return {
+        "backend": type(backend).__name__,
+        "size": backend.size(),
+        "entities": {name: cache.snapshot() for name, cache in caches.items()},
+    }
@@ -0,0 +1,366 @@
+"""
+Cross-process invalidation bus for the per-process caches (entity caches, occupancy index).
+
+Repository write functions call :func:`publish` with the table name and primary key of
+every row they insert, update or delete; bulk inserts publish a single event for the
+whole table instead of one per row. The handlers registered with :func:`subscribe`
+run immediately in the writing worker, so it reads its own writes, and the event is sent
+through the transport to every other worker and replica, which run the same handlers on
+receipt.
+
+Transports (``INVALIDATION_TRANSPORT``):
+    - local: in-process queues, reaching only buses in the same process (tests, single
+      worker);
+    - redis: Redis pub/sub on ``INVALIDATION_CHANNEL``, shared by every replica.
+
+Delivery is best effort. When the subscriber loses its connection, events are missed;
+on reconnect every handler is called with :data:`ALL`, so caches are flushed instead of
+serving what changed meanwhile, and the cache TTLs bound staleness in between.
+"""
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_TRANSPORT = os.getenv("INVALIDATION_TRANSPORT", "local").lower()
+INVALIDATION_REDIS_URL = os.getenv(
+    "INVALIDATION_REDIS_URL", os.getenv("CACHE_REDIS_URL", "redis://redis:6379/0"))
+INVALIDATION_CHANNEL = os.getenv("INVALIDATION_CHANNEL", "uni-schem:invalidation")
+INVALIDATION_MAX_LAG = float(os.getenv("INVALIDATION_MAX_LAG", "1"))
+
+# Entity name of the event sent to handlers after a reconnect: everything may be stale.
+ALL = "*"
+
+Handler = Callable[[str, Optional[int]], None]
+EventCallback = Callable[[dict], None]
+ResetCallback = Callable[[], None]
+
+
+class InvalidationTransport(ABC):
+    """
+    Carries invalidation events between processes. Events are JSON-serializable dicts.
+    """
+
+    @abstractmethod
+    def publish(self, event: dict) -> None:
+        """
+        Sends an event to every subscribed process, including the sender.
+        """
+
+    @abstractmethod
+    def start(self, on_event: EventCallback, on_reset: ResetCallback) -> None:
+        """
+        Starts delivering received events to ``on_event`` in a background thread;
+        ``on_reset`` is called after the subscription is re-established following a failure.
+        """
+
+    @abstractmethod
+    def stop(self) -> None:
+        """
+        Stops the background delivery.
+        """
+
+    @property
+    def connected(self) -> bool:
+        """
+        Whether events published by other processes are currently being received.
+        """
+        return False
+
+
+class LocalTransport(InvalidationTransport):
+    """
+    Delivers events through a queue per started transport, in the current process only.
+    Several buses with their own ``LocalTransport`` behave like separate workers.
+    """
+
+    _peers: List["LocalTransport"] = []
+    _peers_lock = threading.Lock()
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, event: dict) -> None:
+        with self._peers_lock:
+            peers = list(self._peers)
+        for peer in peers:
+            peer._queue.put(event)
+
+    def start(self, on_event: EventCallback, on_reset: ResetCallback) -> None:
+        def deliver():
+            while (event := self._queue.get()) is not None:
+                on_event(event)
+
+        with self._peers_lock:
+            self._peers.append(self)
+        self._thread = threading.Thread(target=deliver, name="invalidation-local", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._peers_lock:
+            if self in self._peers:
+                self._peers.remove(self)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def connected(self) -> bool:
+        return self._thread is not None
+
+
+class RedisTransport(InvalidationTransport):
+    """
+    Delivers events through a Redis pub/sub channel shared by every worker and replica.
+    Requires the ``redis`` package. The subscriber reconnects with exponential backoff.
+
+    Args:
+        url (str): Redis connection URL.
+        channel (str): Pub/sub channel name.
+    """
+
+    def __init__(self, url: str = INVALIDATION_REDIS_URL, channel: str = INVALIDATION_CHANNEL):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._channel = channel
+        self._stopped = threading.Event()
+        self._connected = False
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, event: dict) -> None:
+        self._client.publish(self._channel, json.dumps(event))
+
+    def start(self, on_event: EventCallback, on_reset: ResetCallback) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen, args=(on_event, on_reset), name="invalidation-redis",
+            daemon=True)
+        self._thread.start()
+
+    def _listen(self, on_event: EventCallback, on_reset: ResetCallback) -> None:
+        failed = False
+        backoff = 0.1
+        while not self._stopped.is_set():
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self._channel)
+                self._connected = True
+                backoff = 0.1
+                if failed:
+                    on_reset()
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        on_event(json.loads(message["data"]))
+            except Exception:
+                logger.warning("Invalidation subscriber disconnected; retrying in %.1f s",
+                               backoff, exc_info=True)
+                failed = True
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 5.0)
+            finally:
+                self._connected = False
+                pubsub.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+
+def build_transport() -> InvalidationTransport:
+    """
+    Creates the transport selected by ``INVALIDATION_TRANSPORT``.
+
+    Returns:
+        InvalidationTransport: A :class:`LocalTransport` (``local``) or
+        :class:`RedisTransport` (``redis``).
+
+    Raises:
+        ValueError: If ``INVALIDATION_TRANSPORT`` has any other value.
+    """
+    if INVALIDATION_TRANSPORT == "local":
+        return LocalTransport()
+    if INVALIDATION_TRANSPORT == "redis":
+        return RedisTransport()
+    raise ValueError("INVALIDATION_TRANSPORT must be either 'local' or 'redis'.")
+
+
+class InvalidationBus:
+    """
+    Publishes invalidation events and runs the subscribed handlers, locally on publish and
+    on receipt of events from other processes.
+
+    Handlers take the entity (table name, or :data:`ALL`) and the primary key, which is
+    None when any row of the entity may have changed. They run in the publishing thread or
+    in the transport's thread, so they must be thread-safe and quick.
+
+    Args:
+        transport (Optional[InvalidationTransport]): The transport; built from the
+            environment on first use when omitted.
+        max_lag (float): Delivery delay, in seconds, above which an event counts as late.
+    """
+
+    def __init__(self, transport: Optional[InvalidationTransport] = None,
+                 max_lag: float = INVALIDATION_MAX_LAG):
+        self._transport = transport
+        self.max_lag = max_lag
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: List[Handler] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._counters = {"published": 0, "received": 0, "late": 0, "resets": 0, "errors": 0}
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._lag_last: Optional[float] = None
+
+    @property
+    def transport(self) -> InvalidationTransport:
+        """
+        The transport, created from the environment on first use.
+        """
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = build_transport()
+        return self._transport
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def subscribe(self, handler: Handler) -> None:
+        """
+        Registers a handler for every event.
+
+        Args:
+            handler (Callable[[str, Optional[int]], None]): Called with the entity and ID.
+        """
+        self._handlers.append(handler)
+
+    def _dispatch(self, entity: str, entity_id: Optional[int]) -> None:
+        for handler in self._handlers:
+            try:
+                handler(entity, entity_id)
+            except Exception:
+                logger.exception("Invalidation handler failed for %s %s", entity, entity_id)
+                self._count("errors")
+
+    def publish(self, entity: str, entity_id: Optional[int] = None) -> None:
+        """
+        Invalidates a row in this process and sends the event to the others. A transport
+        failure is logged and counted, never raised: the write has already been committed.
+
+        Args:
+            entity (str): Table name of the changed row.
+            entity_id (Optional[int]): Primary key of the changed row, or None for any row.
+        """
+        self._dispatch(entity, entity_id)
+        event = {"entity": entity, "id": entity_id, "origin": self.origin,
+                 "published_at": time.time()}
+        try:
+            self.transport.publish(event)
+        except Exception:
+            logger.warning("Could not publish invalidation of %s %s", entity, entity_id,
+                           exc_info=True)
+            self._count("errors")
+            return
+        self._count("published")
+
+    def _receive(self, event: dict) -> None:
+        if event.get("origin") == self.origin:
+            return
+        lag = max(0.0, time.time() - event["published_at"])
+        with self._lock:
+            self._counters["received"] += 1
+            self._counters["late"] += lag > self.max_lag
+            self._lag_total += lag
+            self._lag_max = max(self._lag_max, lag)
+            self._lag_last = lag
+        self._dispatch(event["entity"], event["id"])
+
+    def _reset(self) -> None:
+        logger.info("Invalidation subscriber reconnected; flushing local caches")
+        self._count("resets")
+        self._dispatch(ALL, None)
+
+    def start(self) -> None:
+        """
+        Starts receiving events from other processes. Call once per worker, after forking.
+        """
+        if not self._started:
+            self.transport.start(self._receive, self._reset)
+            self._started = True
+
+    def stop(self) -> None:
+        """
+        Stops receiving events.
+        """
+        if self._started:
+            self.transport.stop()
+            self._started = False
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns the delivery counters and the lag of received events.
+
+        Returns:
+            Dict[str, object]: The transport class and whether it is connected, the
+            ``published``, ``received``, ``late`` (lag above ``max_lag``), ``resets`` and
+            ``errors`` counters, and the ``last``, ``mean`` and ``max`` lag in seconds.
+        """
+        # Outside the lock: building the transport on first use takes it.
+        transport = self.transport
+        with self._lock:
+            received = self._counters["received"]
+            return {
+                "transport": type(transport).__name__,
+                "connected": self._started and transport.connected,
+                **self._counters,
+                "max_lag_allowed": self.max_lag,
+                "lag_seconds": {
+                    "last": self._lag_last,
+                    "mean": self._lag_total / received if received else None,
+                    "max": self._lag_max,
+                },
+            }
+
+
+bus = InvalidationBus()
+
+
+def publish(entity: str, entity_id: Optional[int] = None) -> None:
+    """
+    Publishes an invalidation on the process-wide bus (see :meth:`InvalidationBus.publish`).
+
+    Args:
+        entity (str): Table name of the changed row.
+        entity_id (Optional[int]): Primary key of the changed row, or None for any row.
+    """
+    bus.publish(entity, entity_id)
+
+
+def subscribe(handler: Handler) -> None:
+    """
+    Registers a handler on the process-wide bus (see :meth:`InvalidationBus.subscribe`).
+
+    Args:
+        handler (Callable[[str, Optional[int]], None]): Called with the entity and ID.
+    """
+    bus.subscribe(handler)
@@ -0,0 +1,5 @@
+from sqlalchemy.orm import declarative_base
+
+# Declarative base for the models. Kept apart from app.db.database so that importing a
+# model does not configure or connect to the database.
+Base = declarative_base()
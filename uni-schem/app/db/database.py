@@ -1,26 +1,132 @@
 import os
+import threading
+from typing import Optional
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_options
+from app.db.queries import track_queries
+from app.db.versions import track_writes
 
-MYSQL_USER = os.getenv("MYSQL_USER")
-MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
-MYSQL_HOST = os.getenv("MYSQL_HOST")
-MYSQL_DB = os.getenv("MYSQL_DB")
+# "sync" serves every route through the PyMySQL engine in Starlette's threadpool;
+# "async" additionally serves the read routes through an aiomysql engine on the event loop.
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
 
-if not all([MYSQL_USER, MYSQL_PASSWORD, MYSQL_HOST, MYSQL_DB]):
-    raise ValueError(
-        "Missing MySQL environment variables. Check Docker setup.")
+if DB_MODE not in ("sync", "async"):
+    raise ValueError("DB_MODE must be either 'sync' or 'async'.")
 
-DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:3306/{MYSQL_DB}"
+# The engines are built on first use (normally by the application lifespan), so importing
+# this module reads no credentials and opens no connections.
+_lock = threading.Lock()
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def database_url(driver: str = "pymysql") -> str:
+    """
+    Builds the MySQL URL from the environment.
 
-Base = declarative_base()
+    Args:
+        driver (str): DBAPI driver name (``pymysql`` or ``aiomysql``).
 
-Base.metadata.create_all(bind=engine)
+    Returns:
+        str: The SQLAlchemy database URL.
+
+    Raises:
+        ValueError: If any of the MySQL environment variables is missing.
+    """
+    user = os.getenv("MYSQL_USER")
+    password = os.getenv("MYSQL_PASSWORD")
+    host = os.getenv("MYSQL_HOST")
+    name = os.getenv("MYSQL_DB")
+
+    if not all([user, password, host, name]):
+        raise ValueError(
+            "Missing MySQL environment variables. Check Docker setup.")
+
+    return f"mysql+{driver}://{user}:{password}@{host}:3306/{name}"
+
+
+def get_engine() -> Engine:
+    """
+    Returns the synchronous engine, creating it and its session factory on first use.
+
+    Returns:
+        Engine: The PyMySQL engine.
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = create_engine(
+                    database_url(),
+                    pool_pre_ping=True,
+                    poolclass=InstrumentedQueuePool,
+                    **pool_options(),
+                )
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                track_writes(_session_factory)
+                track_queries(engine)
+                _engine = engine
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    """
+    Returns the factory for synchronous sessions bound to :func:`get_engine`.
+
+    Returns:
+        sessionmaker: The session factory.
+    """
+    get_engine()
+    return _session_factory
+
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """
+    Returns the asynchronous engine, creating it and its session factory on first use.
+
+    Returns:
+        Optional[AsyncEngine]: The aiomysql engine, or None unless ``DB_MODE=async``.
+    """
+    global _async_engine, _async_session_factory
+    if DB_MODE != "async":
+        return None
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                engine = create_async_engine(
+                    database_url("aiomysql"),
+                    pool_pre_ping=True,
+                    poolclass=InstrumentedAsyncQueuePool,
+                    **pool_options(),
+                )
+                _async_session_factory = async_sessionmaker(
+                    engine, autoflush=False, expire_on_commit=False)
+                track_queries(engine.sync_engine)
+                _async_engine = engine
+    return _async_engine
+
+
+def get_async_sessionmaker() -> Optional[async_sessionmaker]:
+    """
+    Returns the factory for asynchronous sessions bound to :func:`get_async_engine`.
+
+    Returns:
+        Optional[async_sessionmaker]: The session factory, or None unless ``DB_MODE=async``.
+    """
+    get_async_engine()
+    return _async_session_factory
+
+
+async def dispose_engines() -> None:
+    """
+    Closes the pooled connections of the engines created so far.
+    """
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
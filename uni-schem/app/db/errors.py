@@ -0,0 +1,46 @@
+import re
+from typing import Dict, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+
+# MySQL error 1062: "Duplicate entry 'x' for key 'table.key_name'" (the table prefix
+# is only present from MySQL 8.0.19 on).
+DUPLICATE_ENTRY = 1062
+_DUPLICATE_KEY = re.compile(r"for key '(?:[^'.]+\.)?([^'.]+)'")
+
+DEFAULT_INTEGRITY_DETAIL = "The request conflicts with an existing record."
+
+
+def duplicate_key(exc: IntegrityError) -> Optional[str]:
+    """
+    Extracts the name of the unique key violated by a duplicate-entry error.
+
+    Args:
+        exc (IntegrityError): The error raised by the failed statement.
+
+    Returns:
+        Optional[str]: The key name (the constraint name, or the column name for
+        single-column ``unique=True`` columns), or None for other integrity errors.
+    """
+    args = getattr(exc.orig, "args", ())
+    if len(args) < 2 or args[0] != DUPLICATE_ENTRY:
+        return None
+    match = _DUPLICATE_KEY.search(str(args[1]))
+    return match.group(1) if match else None
+
+
+def integrity_http_exception(exc: IntegrityError, messages: Dict[str, str]) -> HTTPException:
+    """
+    Translates an IntegrityError into the 400 response the endpoint would have returned
+    had it checked for the duplicate before inserting.
+
+    Args:
+        exc (IntegrityError): The error raised by the failed statement.
+        messages (Dict[str, str]): Error detail for each unique key name.
+
+    Returns:
+        HTTPException: A 400 Bad Request with the matching message, or a generic one when
+        the violated key is not listed (e.g. a foreign key).
+    """
+    detail = messages.get(duplicate_key(exc), DEFAULT_INTEGRITY_DETAIL)
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -0,0 +1,172 @@
+"""
+Versioned schema migrations.
+
+Every module in ``app/db/migrations`` named ``<version>_<description>.py`` defines an
+``upgrade(conn)`` function. Versions are applied in order, each in its own transaction,
+and recorded in the ``schema_version`` table so they run only once per database.
+
+MySQL commits DDL implicitly, so a migration interrupted halfway cannot be rolled back;
+migrations therefore use the idempotent helpers below and can simply be run again.
+
+Usage:
+    python -m app.db.migrate
+"""
+import importlib
+import logging
+import pkgutil
+from typing import List, Sequence, Set, Tuple
+from sqlalchemy import (Column, DateTime, Index, Integer, MetaData, String, Table, func,
+                        inspect, insert, select)
+from sqlalchemy.engine import Connection, Engine
+from app.db import migrations
+from app.db.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+
+def discover() -> List[Tuple[int, str]]:
+    """
+    Lists the migration modules shipped in ``app/db/migrations``.
+
+    Returns:
+        List[Tuple[int, str]]: ``(version, module name)`` pairs, in version order.
+
+    Raises:
+        ValueError: If two modules share the same version number.
+    """
+    found = {}
+    for module in pkgutil.iter_modules(migrations.__path__):
+        version, _, _ = module.name.partition("_")
+        if not version.isdigit():
+            continue
+        if int(version) in found:
+            raise ValueError(f"Duplicate migration version {int(version)}.")
+        found[int(version)] = module.name
+    return sorted(found.items())
+
+
+def applied_versions(conn: Connection) -> Set[int]:
+    """
+    Reads the versions already applied, creating the ``schema_version`` table if needed.
+
+    Args:
+        conn (Connection): Open database connection.
+
+    Returns:
+        Set[int]: The applied versions.
+    """
+    schema_version.create(conn, checkfirst=True)
+    return set(conn.execute(select(schema_version.c.version)).scalars())
+
+
+def upgrade(engine: Engine) -> List[int]:
+    """
+    Applies every pending migration in version order.
+
+    Args:
+        engine (Engine): Engine bound to the database to migrate.
+
+    Returns:
+        List[int]: The versions applied by this call (empty when already up to date).
+    """
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for version, name in discover():
+        if version in done:
+            continue
+        module = importlib.import_module(f"{migrations.__name__}.{name}")
+        logger.info("Applying migration %s", name)
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(insert(schema_version).values(version=version, name=name))
+        applied.append(version)
+    return applied
+
+
+def create_index(
+    conn: Connection, name: str, table: str, columns: Sequence[str], unique: bool = False
+) -> None:
+    """
+    Creates an index unless one with the same name already exists on the table, which is
+    the case for databases created from the models after the index was added to them.
+
+    Args:
+        conn (Connection): Open database connection.
+        name (str): Index name.
+        table (str): Table name.
+        columns (Sequence[str]): Indexed columns, in order.
+        unique (bool): Whether to create a unique index.
+    """
+    inspector = inspect(conn)
+    existing = {index["name"] for index in inspector.get_indexes(table)}
+    existing |= {constraint["name"] for constraint in inspector.get_unique_constraints(table)}
+    if name in existing:
+        return
+
+    reflected = Table(table, MetaData(), autoload_with=conn)
+    Index(name, *(reflected.c[column] for column in columns), unique=unique).create(conn)
+
+
+def require_unique(conn: Connection, keys: Sequence[Tuple[str, str, Sequence[str]]]) -> None:
+    """
+    Checks that existing rows do not already break the unique keys about to be added,
+    so that a migration stops with an explanation instead of a raw duplicate-key error
+    halfway through.
+
+    Args:
+        conn (Connection): Open database connection.
+        keys (Sequence[Tuple[str, str, Sequence[str]]]): ``(index name, table, columns)``
+            of each unique key.
+
+    Raises:
+        ValueError: If any key has duplicate rows; the message lists, per key, the number
+        of duplicate groups, a few of the duplicated values and the query listing them.
+    """
+    problems = []
+    for name, table, columns in keys:
+        reflected = Table(table, MetaData(), autoload_with=conn)
+        key = [reflected.c[column] for column in columns]
+        duplicates = select(*key, func.count().label("rows")).group_by(*key) \
+            .having(func.count() > 1)
+        groups = conn.execute(select(func.count()).select_from(duplicates.subquery())).scalar()
+        if not groups:
+            continue
+        examples = ", ".join(f"{tuple(row[:-1])} x{row[-1]}"
+                             for row in conn.execute(duplicates.limit(3)))
+        listing = (f"SELECT {', '.join(columns)}, COUNT(*) FROM {table} "
+                   f"GROUP BY {', '.join(columns)} HAVING COUNT(*) > 1")
+        problems.append(f"- {name}: {groups} group(s) of {table} rows share "
+                        f"({', '.join(columns)}), e.g. {examples}. List them with: {listing}")
+    if problems:
+        raise ValueError(
+            "Cannot add unique keys while duplicate rows exist. Merge or delete the "
+            "duplicates (keep one row per value and repoint or drop the rows referencing "
+            "the others), then run the migrations again:\n" + "\n".join(problems))
+
+
+def main() -> None:
+    """Applies the pending migrations to the database configured in the environment."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    try:
+        applied = upgrade(get_engine())
+    except ValueError as exc:
+        logger.error("%s", exc)
+        raise SystemExit(1) from exc
+    if applied:
+        logger.info("Applied %d migration(s).", len(applied))
+    else:
+        logger.info("Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
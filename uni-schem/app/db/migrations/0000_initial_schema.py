@@ -0,0 +1,83 @@
+"""
+Creates the tables as they were before versioned migrations, when the application built
+them with ``create_all`` at startup. The definitions are frozen here on purpose: later
+schema changes belong in their own migrations, not in the models alone.
+
+Tables that already exist are left untouched, so databases created by the old startup
+path are adopted as they are and only receive the later migrations.
+"""
+from sqlalchemy import Column, Enum, ForeignKey, Integer, MetaData, String, Table, Time
+from sqlalchemy.engine import Connection
+from app.models.day import Day
+
+metadata = MetaData()
+
+Table(
+    "professor", metadata,
+    Column("professor_id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("email", String(320), unique=True, nullable=False),
+    Column("phone", String(15), unique=True, nullable=False),
+    Column("dni", String(20), unique=True, nullable=False),
+)
+
+Table(
+    "student", metadata,
+    Column("student_id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("email", String(320), unique=True, nullable=False),
+    Column("phone", String(15), nullable=True),
+    Column("dni", String(20), unique=True, nullable=False),
+)
+
+Table(
+    "classroom", metadata,
+    Column("classroom_id", Integer, primary_key=True, index=True),
+    Column("name", String(50), nullable=False),
+    Column("capacity", Integer, nullable=False),
+    Column("location", String(100), nullable=True),
+)
+
+Table(
+    "course", metadata,
+    Column("course_id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("code", String(20), nullable=False),
+    Column("semester", String(20), nullable=False),
+    Column("professor_id", Integer, ForeignKey("professor.professor_id"), nullable=False),
+)
+
+Table(
+    "schedule", metadata,
+    Column("schedule_id", Integer, primary_key=True, index=True),
+    Column("course_id", Integer,
+           ForeignKey("course.course_id", ondelete="SET NULL"), nullable=True),
+    Column("day", Enum(Day), nullable=False),
+    Column("start_time", Time, nullable=False),
+    Column("end_time", Time, nullable=False),
+    Column("classroom_id", Integer,
+           ForeignKey("classroom.classroom_id", ondelete="SET NULL"), nullable=True),
+)
+
+Table(
+    "availability", metadata,
+    Column("availability_id", Integer, primary_key=True, index=True),
+    Column("professor_id", Integer,
+           ForeignKey("professor.professor_id", ondelete="SET NULL"), nullable=True),
+    Column("day", Enum(Day), nullable=False),
+    Column("start_time", Time, nullable=False),
+    Column("end_time", Time, nullable=False),
+)
+
+Table(
+    "student_course", metadata,
+    Column("student_course_id", Integer, primary_key=True, index=True),
+    Column("student_id", Integer,
+           ForeignKey("student.student_id", ondelete="CASCADE"), nullable=False),
+    Column("course_id", Integer,
+           ForeignKey("course.course_id", ondelete="CASCADE"), nullable=False),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, checkfirst=True)
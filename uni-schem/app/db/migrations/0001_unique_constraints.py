@@ -0,0 +1,22 @@
+"""
+Adds the unique keys on course code, classroom name and (student, course) enrollments.
+Duplicate inserts are rejected by these keys instead of being checked beforehand.
+
+Rows written by the old check-then-insert paths may already be duplicated; the migration
+then stops before creating any key and lists them (see ``require_unique``), and must be
+run again once they are merged or deleted.
+"""
+from sqlalchemy.engine import Connection
+from app.db.migrate import create_index, require_unique
+
+UNIQUE_KEYS = [
+    ("uq_course_code", "course", ["code"]),
+    ("uq_classroom_name", "classroom", ["name"]),
+    ("uq_student_course", "student_course", ["student_id", "course_id"]),
+]
+
+
+def upgrade(conn: Connection) -> None:
+    require_unique(conn, UNIQUE_KEYS)
+    for name, table, columns in UNIQUE_KEYS:
+        create_index(conn, name, table, columns, unique=True)
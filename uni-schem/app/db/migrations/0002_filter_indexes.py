@@ -0,0 +1,20 @@
+"""
+Adds composite indexes for the filter predicates of the hot read paths: conflict checks
+and occupancy reloads on schedule and availability, enrollment lookups by course, and the
+``get_*_by_*`` lookups on course and classroom. Lookups by ``student_course.student_id``
+are served by ``uq_student_course`` from migration 0001.
+"""
+from sqlalchemy.engine import Connection
+from app.db.migrate import create_index
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(conn, "ix_schedule_classroom_day_start", "schedule",
+                 ["classroom_id", "day", "start_time"])
+    create_index(conn, "ix_schedule_course_day", "schedule", ["course_id", "day"])
+    create_index(conn, "ix_availability_professor_day_start", "availability",
+                 ["professor_id", "day", "start_time"])
+    create_index(conn, "ix_student_course_course_id", "student_course", ["course_id"])
+    create_index(conn, "ix_course_professor_id", "course", ["professor_id"])
+    create_index(conn, "ix_course_name", "course", ["name"])
+    create_index(conn, "ix_classroom_capacity", "classroom", ["capacity"])
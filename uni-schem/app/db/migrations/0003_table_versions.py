@@ -0,0 +1,19 @@
+"""
+Adds ``table_versions``, the per-table write counters behind the ``ETag`` of the read
+routes (see :mod:`app.db.versions`), with a counter for every application table.
+"""
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
+from app.db.versions import table_versions
+
+TABLES = ("availability", "classroom", "course", "professor", "schedule", "student",
+          "student_course")
+
+
+def upgrade(conn: Connection) -> None:
+    table_versions.create(conn, checkfirst=True)
+    existing = set(conn.execute(select(table_versions.c.table_name)).scalars())
+    missing = [table for table in TABLES if table not in existing]
+    if missing:
+        conn.execute(insert(table_versions),
+                     [{"table_name": table, "version": 1} for table in missing])
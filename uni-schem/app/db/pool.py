@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from typing import List
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Every gunicorn worker of every replica owns its own pool, so the connections opened
+# against MySQL add up to replicas x workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def pool_options() -> dict:
+    """
+    Builds the connection pool arguments for ``create_engine`` from the environment.
+
+    Returns:
+        dict: ``pool_size``, ``max_overflow``, ``pool_recycle`` and ``pool_timeout``.
+    """
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters for the time spent waiting on pool checkouts.
+
+    Attributes:
+        checkouts (int): Successful checkouts.
+        timeouts (int): Checkouts that gave up after ``pool_timeout`` seconds.
+        wait_seconds_total (float): Accumulated checkout wait.
+        wait_seconds_max (float): Longest single checkout wait.
+        wait_buckets (List[int]): Cumulative checkout counts per ``WAIT_BUCKETS`` bound,
+            plus a final ``+Inf`` bucket.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets: List[int] = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe(self, wait: float) -> None:
+        """
+        Records a successful checkout.
+
+        Args:
+            wait (float): Seconds spent obtaining the connection.
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if wait <= bound:
+                    self.wait_buckets[i] += 1
+            self.wait_buckets[-1] += 1
+
+    def record_timeout(self) -> None:
+        """
+        Records a checkout that timed out waiting for a free connection.
+        """
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns a consistent copy of the counters.
+
+        Returns:
+            dict: The counters, with the wait histogram keyed by bucket bound.
+        """
+        with self._lock:
+            bounds = [str(bound) for bound in WAIT_BUCKETS] + ["+Inf"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_buckets": dict(zip(bounds, self.wait_buckets)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every ``connect()`` call, i.e. the wait for a pooled connection (including
+    opening a new one when the pool is not yet full).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """
+    ``QueuePool`` that records checkout wait metrics.
+    """
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    ``AsyncAdaptedQueuePool`` that records checkout wait metrics.
+    """
+
+
+def pool_stats(pool) -> dict:
+    """
+    Describes the current state of a pool together with its checkout metrics.
+
+    Args:
+        pool (Pool): The engine's pool (``engine.pool``).
+
+    Returns:
+        dict: Configured size and overflow, connections in use, idle and in overflow,
+        plus the checkout metrics when the pool is instrumented.
+    """
+    stats = {
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
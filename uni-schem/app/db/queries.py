@@ -0,0 +1,170 @@
+"""
+Per-request SQL statistics: statement count and time, slow queries and repeated shapes.
+
+:func:`track_queries` times every statement an engine runs. While a request is being
+served (see :mod:`app.api.server_timing`), the statements are also added to the request's
+:class:`RequestQueries`, kept in a context variable so it follows the request into
+Starlette's threadpool and SQLAlchemy's async greenlets.
+
+Statements are grouped by shape: the SQL with whitespace collapsed, literals replaced by
+``?`` and lists of parameters (``IN``, multi-row ``VALUES``) folded into one. A shape
+that runs more than ``SQL_REPEAT_THRESHOLD`` times in one request is usually a lookup in
+a loop (N+1) and is logged when the request ends. Every statement slower than
+``SQL_SLOW_QUERY_MS`` is logged with its shape, in or out of a request.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "10"))
+
+_PARAMETER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PARAMETER_LIST = re.compile(rf"\(\s*{_PARAMETER}(?:\s*,\s*{_PARAMETER})+\s*\)")
+_ROW_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(statement: str) -> str:
+    """
+    Reduces a statement to its shape.
+
+    Args:
+        statement (str): SQL as sent to the driver.
+
+    Returns:
+        str: The statement on one line, with literals as ``?`` and parameter lists as
+        ``(...)``, e.g. ``SELECT ... WHERE course.course_id IN (...)``.
+    """
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _LITERAL.sub("?", shape)
+    shape = _PARAMETER_LIST.sub("(...)", shape)
+    return _ROW_LIST.sub("(...)", shape)
+
+
+class RequestQueries:
+    """
+    Statements run while serving one request.
+
+    Args:
+        label (str): Request description for the logs, e.g. ``POST /schedule/``.
+
+    Attributes:
+        count (int): Statements executed.
+        seconds (float): Time spent executing them.
+        shapes (Counter): Executions per statement shape.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, shape: str, seconds: float) -> None:
+        """
+        Adds an executed statement.
+
+        Args:
+            shape (str): The statement's shape (see :func:`normalize`).
+            seconds (float): Its execution time.
+        """
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.shapes[shape] += 1
+
+    def repeated(self, threshold: int = SQL_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """
+        Returns the shapes that ran more than ``threshold`` times, most frequent first.
+
+        Args:
+            threshold (int): Executions allowed per shape.
+
+        Returns:
+            List[Tuple[str, int]]: Shape and execution count.
+        """
+        with self._lock:
+            return [(shape, runs) for shape, runs in self.shapes.most_common() if runs > threshold]
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def start_request(label: str) -> RequestQueries:
+    """
+    Starts collecting the statements of the request being served in this context.
+
+    Args:
+        label (str): Request description for the logs.
+
+    Returns:
+        RequestQueries: The request's statistics.
+    """
+    queries = RequestQueries(label)
+    _current.set(queries)
+    return queries
+
+
+def finish_request(queries: RequestQueries) -> None:
+    """
+    Logs the statement shapes the request repeated more than ``SQL_REPEAT_THRESHOLD``
+    times.
+
+    Args:
+        queries (RequestQueries): The request's statistics.
+    """
+    for shape, runs in queries.repeated():
+        logger.warning("%s ran the same statement %d times: %s", queries.label, runs, shape)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    queries = _current.get()
+    slow = seconds * 1000 >= SQL_SLOW_QUERY_MS
+    if queries is None and not slow:
+        return
+    shape = normalize(statement)
+    if queries is not None:
+        queries.record(shape, seconds)
+    if slow:
+        logger.warning("Slow query (%.1f ms)%s: %s", seconds * 1000,
+                       f" in {queries.label}" if queries is not None else "", shape)
+
+
+def _handle_error(context) -> None:
+    # ``after_cursor_execute`` is skipped when the statement fails. Must not raise: the
+    # error would replace the DBAPI one the repositories translate (e.g. IntegrityError).
+    if context.connection is not None:
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+def track_queries(engine: Engine) -> None:
+    """
+    Times the statements of an engine and adds them to the current request.
+
+    Args:
+        engine (Engine): The engine; for an ``AsyncEngine``, its ``sync_engine``.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -1,4 +1,4 @@
-from .database import SessionLocal
+from .database import get_async_sessionmaker, get_sessionmaker
 from fastapi import HTTPException, status  # <-- ¡Importa esto!
 
 
@@ -14,7 +14,7 @@ def get_db():
     Yields:
         Session: A SQLAlchemy database session instance.
     """
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     except Exception as e:
@@ -28,3 +28,33 @@ def get_db():
             )
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Provides an asynchronous SQLAlchemy session to async FastAPI endpoints.
+
+    Only available when the application runs with ``DB_MODE=async``. Mirrors
+    :func:`get_db`: the session is rolled back on errors and always closed.
+
+    Yields:
+        AsyncSession: An asynchronous SQLAlchemy session instance.
+    """
+    async_session_factory = get_async_sessionmaker()
+    if async_session_factory is None:
+        raise RuntimeError("The async engine is disabled. Set DB_MODE=async.")
+
+    db = async_session_factory()
+    try:
+        yield db
+    except Exception as e:
+        await db.rollback()
+        if isinstance(e, HTTPException):
+            raise e
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"An unexpected server error occurred: {e}"
+            )
+    finally:
+        await db.close()
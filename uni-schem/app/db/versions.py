@@ -0,0 +1,213 @@
+"""
+Per-table version counters, the basis of the ``ETag`` of the read routes.
+
+The ``table_versions`` table (migration 0003) holds one monotonically increasing counter
+per table. :func:`track_writes` makes every session of the application bump the counters
+of the tables it writes, in one statement just before the write commits, so a committed
+change is always reflected in the version whichever worker or replica made it, and the
+counter rows stay locked only for the commit itself.
+
+Readers go through :data:`versions`, which keeps the counters in memory. A counter is
+re-read from the database after the invalidation bus reports a write to its table, and
+at least every ``TABLE_VERSION_MAX_AGE`` seconds in case an event was missed.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+from sqlalchemy import BigInteger, Column, MetaData, String, Table, event, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from app.cache.invalidation import ALL, subscribe
+
+logger = logging.getLogger(__name__)
+
+TABLE_VERSION_MAX_AGE = float(os.getenv("TABLE_VERSION_MAX_AGE", "5"))
+
+table_versions = Table(
+    "table_versions",
+    MetaData(),
+    Column("table_name", String(64), primary_key=True),
+    Column("version", BigInteger, nullable=False),
+)
+
+
+def bump(session: Session, tables: Iterable[str]) -> None:
+    """
+    Increments the versions of the given tables in the session's transaction, locking
+    their rows in name order.
+
+    Args:
+        session (Session): The session making the write.
+        tables (Iterable[str]): Names of the written tables.
+    """
+    names = sorted(set(tables))
+    if names:
+        session.connection().execute(
+            update(table_versions)
+            .where(table_versions.c.table_name.in_(names))
+            .values(version=table_versions.c.version + 1))
+
+
+def _written(session: Session) -> set:
+    return session.info.setdefault("written_tables", set())
+
+
+def _record_flushed(session: Session, flush_context) -> None:
+    # ``new``, ``dirty`` and ``deleted`` still hold the flushed instances at this point.
+    _written(session).update(instance.__table__.name
+                             for instance in (*session.new, *session.dirty, *session.deleted))
+
+
+def _record_executed(state: ORMExecuteState) -> None:
+    # Bulk statements (``db.execute(insert(Model), rows)``, ``Query.update``) skip the flush.
+    if state.is_insert or state.is_update or state.is_delete:
+        _written(state.session).add(state.statement.table.name)
+
+
+def _bump_written(session: Session) -> None:
+    # The counters are updated once, as the last statement of the transaction, so their
+    # row locks are held only until the commit that follows. ``bump`` locks them in name
+    # order, so two transactions never wait for each other's counters crosswise.
+    session.flush()
+    bump(session, session.info.pop("written_tables", ()))
+
+
+def _forget_written(session: Session, previous_transaction) -> None:
+    # A savepoint rollback keeps the writes of the enclosing transaction.
+    if not previous_transaction.nested:
+        session.info.pop("written_tables", None)
+
+
+def track_writes(factory: sessionmaker) -> None:
+    """
+    Makes the sessions of a factory bump the versions of the tables they write, when the
+    transaction commits.
+
+    Args:
+        factory (sessionmaker): The session factory.
+    """
+    event.listen(factory, "after_flush", _record_flushed)
+    event.listen(factory, "do_orm_execute", _record_executed)
+    event.listen(factory, "before_commit", _bump_written)
+    event.listen(factory, "after_soft_rollback", _forget_written)
+
+
+class TableVersions:
+    """
+    Per-process view of the table versions.
+
+    Args:
+        max_age (float): Seconds a version is used before it is read again.
+    """
+
+    def __init__(self, max_age: float = TABLE_VERSION_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Tuple[float, Optional[int]]] = {}
+        self._generation = 0
+        subscribe(self.on_invalidation)
+
+    def on_invalidation(self, entity: str, entity_id: Optional[int]) -> None:
+        """
+        Invalidation bus handler: forgets the version of the written table.
+
+        Args:
+            entity (str): Table name of the changed row, or ``ALL``.
+            entity_id (Optional[int]): Primary key of the changed row.
+        """
+        with self._lock:
+            self._generation += 1
+            if entity == ALL:
+                self._versions.clear()
+            else:
+                self._versions.pop(entity, None)
+
+    def _lookup(self, tables: Sequence[str]) -> Tuple[float, dict, int, list]:
+        """
+        Returns the lookup time, the cached entries of the tables, the current generation
+        and the tables that must be read again.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = {table: self._versions.get(table) for table in tables}
+            generation = self._generation
+        stale = [table for table, entry in cached.items()
+                 if entry is None or now - entry[0] >= self.max_age]
+        return now, cached, generation, stale
+
+    def _store(self, now: float, cached: dict, generation: int, stale: list,
+               found: Dict[str, int]) -> None:
+        """
+        Adds the versions just read to ``cached`` and keeps them unless a write was
+        reported meanwhile, which they may not reflect.
+        """
+        with self._lock:
+            keep = generation == self._generation
+            for table in stale:
+                cached[table] = (now, found.get(table))
+                if keep:
+                    self._versions[table] = cached[table]
+
+    @staticmethod
+    def _select(tables: Sequence[str]):
+        return (select(table_versions.c.table_name, table_versions.c.version)
+                .where(table_versions.c.table_name.in_(tables)))
+
+    @staticmethod
+    def _values(cached: dict, tables: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        values = tuple(cached[table][1] for table in tables)
+        return None if None in values else values
+
+    def get(self, engine: Engine, tables: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        """
+        Returns the versions of the given tables, reading the missing or expired ones
+        from the database in a single query.
+
+        Args:
+            engine (Engine): Engine bound to the database.
+            tables (Sequence[str]): Table names.
+
+        Returns:
+            Optional[Tuple[int, ...]]: The versions in the order of ``tables``, or None if
+            one of them has no counter or the database could not be read.
+        """
+        now, cached, generation, stale = self._lookup(tables)
+        if stale:
+            try:
+                with engine.connect() as conn:
+                    found = dict(conn.execute(self._select(stale)).all())
+            except Exception:
+                logger.warning("Could not read the table versions", exc_info=True)
+                return None
+            self._store(now, cached, generation, stale, found)
+        return self._values(cached, tables)
+
+    async def get_async(self, engine: AsyncEngine,
+                        tables: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        """
+        Same as :meth:`get`, reading through the asynchronous engine on the event loop.
+
+        Args:
+            engine (AsyncEngine): Asynchronous engine bound to the database.
+            tables (Sequence[str]): Table names.
+
+        Returns:
+            Optional[Tuple[int, ...]]: The versions in the order of ``tables``, or None if
+            one of them has no counter or the database could not be read.
+        """
+        now, cached, generation, stale = self._lookup(tables)
+        if stale:
+            try:
+                async with engine.connect() as conn:
+                    found = dict((await conn.execute(self._select(stale))).all())
+            except Exception:
+                logger.warning("Could not read the table versions", exc_info=True)
+                return None
+            self._store(now, cached, generation, stale, found)
+        return self._values(cached, tables)
+
+
+versions = TableVersions()
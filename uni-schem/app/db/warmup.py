@@ -0,0 +1,88 @@
+"""
+Connection pool and statement cache warm-up, run by the application lifespan before a
+worker starts accepting requests.
+
+A cold worker pays for the TCP and MySQL handshakes of every pooled connection and for
+compiling each ORM statement the first time it runs, all on its first requests. Warming
+up opens ``DB_POOL_SIZE`` connections and executes the hot lookups once with an ID that
+matches no row, so their compiled forms are cached on the engine.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, List
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from app.db.pool import DB_POOL_SIZE
+from app.models.day import Day
+from app.repositories import (availability_repository, classroom_repository, course_repository,
+                              professor_repository, schedule_repository,
+                              student_course_repository, student_repository)
+
+logger = logging.getLogger(__name__)
+
+DB_WARM_UP = os.getenv("DB_WARM_UP", "true").lower() in ("1", "true", "yes")
+
+# Lookups behind the most frequent endpoints: get by ID, the first page of each list,
+# and the schedule conflict check. ID 0 never matches, so they return nothing.
+HOT_LOOKUPS: List[Callable[[Session], object]] = [
+    lambda db: availability_repository.get_availability_by_id(db, 0),
+    lambda db: classroom_repository.get_classroom_by_id(db, 0),
+    lambda db: course_repository.get_course_by_id(db, 0),
+    lambda db: professor_repository.get_professor_by_id(db, 0),
+    lambda db: schedule_repository.get_schedule_by_id(db, 0),
+    lambda db: student_repository.get_student_by_id(db, 0),
+    lambda db: student_course_repository.get_student_course_by_id(db, 0),
+    lambda db: availability_repository.get_all_availabilities(db, 0, 1),
+    lambda db: classroom_repository.get_all_classrooms(db, 0, 1),
+    lambda db: course_repository.get_all_courses(db, 0, 1),
+    lambda db: professor_repository.get_all_professors(db, 0, 1),
+    lambda db: schedule_repository.get_all_schedules(db, 0, 1),
+    lambda db: student_repository.get_all_students(db, 0, 1),
+    lambda db: student_course_repository.get_all_student_courses(db, 0, 1),
+    lambda db: schedule_repository.load_schedule_index(db, Day.MONDAY, [0], [0]),
+]
+
+
+def warm_up(engine: Engine) -> None:
+    """
+    Fills the synchronous pool to ``DB_POOL_SIZE`` connections and runs the hot lookups once.
+
+    Args:
+        engine (Engine): The synchronous engine.
+    """
+    started = time.perf_counter()
+    connections = [engine.connect() for _ in range(DB_POOL_SIZE)]
+    for connection in connections:
+        connection.close()
+
+    with Session(engine) as db:
+        for lookup in HOT_LOOKUPS:
+            lookup(db)
+
+    logger.info("Warmed up %d connections and %d statements in %.0f ms",
+                len(connections), len(HOT_LOOKUPS), (time.perf_counter() - started) * 1000)
+
+
+async def warm_up_async(engine: AsyncEngine) -> None:
+    """
+    Fills the asynchronous pool to ``DB_POOL_SIZE`` connections, opened concurrently, and
+    runs the hot lookups once, through the same repositories as the async read routes.
+
+    Args:
+        engine (AsyncEngine): The asynchronous engine.
+    """
+    started = time.perf_counter()
+    connections = await asyncio.gather(
+        *(engine.connect().start() for _ in range(DB_POOL_SIZE)))
+    for connection in connections:
+        await connection.close()
+
+    async with AsyncSession(engine) as db:
+        for lookup in HOT_LOOKUPS:
+            await db.run_sync(lookup)
+
+    logger.info("Warmed up %d async connections and %d statements in %.0f ms",
+                len(connections), len(HOT_LOOKUPS), (time.perf_counter() - started) * 1000)
@@ -1,8 +1,9 @@
 """
 Main application entry point for Uni-ScheM.
 
-This module sets up the FastAPI app instance, includes all route modules, 
-and initialIzes the database metadata using SQLAlchemy.
+This module sets up the FastAPI app instance with its lifespan hook and middlewares,
+and includes all route modules. How the database, caches and instrumentation they set
+up are operated is described in the README.
 
 Routes included:
     - Availability
@@ -12,19 +13,51 @@ Routes included:
     - Schedule
     - Student-Course relationships
     - Student
+    - Metrics
 
 App Metadata:
     - Title: Uni-ScheM
     - Description: University Schedule Manager
     - Contact: Sophie Muriel (https://github.com/sophie-muriel/uni-schem)
 """
-from app.api.v1 import (availability_routes, classroom_routes, course_routes,
-                        professor_routes, schedule_routes,
-                        student_course_routes, student_routes)
-from app.db.database import Base, engine
+from app.api.v1 import (async_routes, availability_routes, classroom_routes,
+                        course_routes, metrics_routes, professor_routes,
+                        schedule_routes, student_course_routes, student_routes)
+from contextlib import asynccontextmanager
+from app.api.conditional import ETagMiddleware
+from app.api.edge import EdgeCacheMiddleware
+from app.api.metrics import MetricsMiddleware
+from app.api.server_timing import ServerTimingMiddleware
+from app.api.responses import default_response_class
+from app.cache.edge import purger
+from app.cache.invalidation import bus
+from app.db.database import DB_MODE, dispose_engines, get_async_engine, get_engine
+from app.db.warmup import DB_WARM_UP, warm_up, warm_up_async
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates the database engines when the worker starts, optionally warming up their
+    pools, and starts receiving cache invalidations from the other workers; undoes both
+    when it stops, after giving the queued edge cache purges a few seconds to be sent.
+
+    Args:
+        app (FastAPI): The application instance.
+    """
+    engine = get_engine()
+    async_engine = get_async_engine()
+    if DB_WARM_UP:
+        await run_in_threadpool(warm_up, engine)
+        if async_engine is not None:
+            await warm_up_async(async_engine)
+    bus.start()
+    yield
+    await run_in_threadpool(bus.stop)
+    await run_in_threadpool(purger.flush, 5)
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -42,8 +75,21 @@ app = FastAPI(
         "defaultModelsExpandDepth": -1,
         "persistAuthorization": True,
     },
+    lifespan=lifespan,
+    default_response_class=default_response_class,
 )
 
+app.add_middleware(ETagMiddleware)
+app.add_middleware(EdgeCacheMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+# Added last, so it is outermost and times the other middlewares as well.
+app.add_middleware(MetricsMiddleware)
+
+if DB_MODE == "async":
+    # Registered first so the async read routes take precedence over the sync ones.
+    for prefix, router in async_routes.routers.items():
+        app.include_router(router, prefix=prefix)
+
 app.include_router(availability_routes.router,
                    prefix="/availability",  tags=["Availability"])
 app.include_router(classroom_routes.router,
@@ -58,3 +104,5 @@ app.include_router(student_course_routes.router,
                    prefix="/student-course", tags=["Student - Course"])
 app.include_router(student_routes.router,
                    prefix="/student",       tags=["Student"])
+app.include_router(metrics_routes.router,
+                   prefix="/metrics",       tags=["Metrics"])
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, ForeignKey, Time, Enum as SQLEnum
+from sqlalchemy import Column, Integer, ForeignKey, Index, Time, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.base import Base
 from app.models.day import Day
 
 
@@ -16,6 +16,9 @@ class Availability(Base):
         end_time (time): End time of the availability window.
     """
     __tablename__ = "availability"
+    __table_args__ = (
+        Index("ix_availability_professor_day_start", "professor_id", "day", "start_time"),
+    )
 
     availability_id = Column(Integer, primary_key=True, index=True)
     professor_id = Column(Integer, ForeignKey(
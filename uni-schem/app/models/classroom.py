@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.base import Base
 
 
 class Classroom(Base):
@@ -9,7 +9,7 @@ class Classroom(Base):
 
     Attributes:
         classroom_id (int): Unique identifier for the classroom.
-        name (str): Name or number of the classroom (max 50 characters).
+        name (str): Name or number of the classroom (max 50 characters, unique).
         capacity (int): Maximum number of students the classroom can hold.
         location (Optional[str]): Location or building info (up to 100 characters).
 
@@ -17,6 +17,10 @@ class Classroom(Base):
         schedules (List[Schedule]): List of schedule entries assigned to this classroom.
     """
     __tablename__ = "classroom"
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_classroom_name"),
+        Index("ix_classroom_capacity", "capacity"),
+    )
 
     classroom_id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), nullable=False)
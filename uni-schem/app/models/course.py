@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.base import Base
 
 
 class Course(Base):
@@ -10,7 +10,7 @@ class Course(Base):
     Attributes:
         course_id (int): Unique identifier for the course.
         name (str): Full name of the course.
-        code (str): Code used to identify the course.
+        code (str): Code used to identify the course (unique).
         semester (str): Semester when the course is offered.
         professor_id (int): The ID of the professor assigned to the course.
 
@@ -20,6 +20,11 @@ class Course(Base):
         enrollments (List[StudentCourse]): Student enrollments in this course.
     """
     __tablename__ = "course"
+    __table_args__ = (
+        UniqueConstraint("code", name="uq_course_code"),
+        Index("ix_course_professor_id", "professor_id"),
+        Index("ix_course_name", "name"),
+    )
 
     course_id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, Time, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, Time, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.base import Base
 from app.models.day import Day
 
 
@@ -21,6 +21,10 @@ class Schedule(Base):
         classroom (Classroom): The classroom assigned to this session.
     """
     __tablename__ = "schedule"
+    __table_args__ = (
+        Index("ix_schedule_classroom_day_start", "classroom_id", "day", "start_time"),
+        Index("ix_schedule_course_day", "course_id", "day"),
+    )
 
     schedule_id = Column(Integer, primary_key=True, index=True)
     course_id = Column(Integer, ForeignKey(
@@ -1,11 +1,12 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.base import Base
 
 
 class StudentCourse(Base):
     """
     Represents the relationship between a student and a course (enrollment).
+    A student can be enrolled in each course only once.
 
     Attributes:
         student_course_id (int): Unique ID for the enrollment.
@@ -17,6 +18,11 @@ class StudentCourse(Base):
         course  (Course): The course the student is enrolled in.
     """
     __tablename__ = "student_course"
+    # uq_student_course also serves the lookups by student_id (its leading column).
+    __table_args__ = (
+        UniqueConstraint("student_id", "course_id", name="uq_student_course"),
+        Index("ix_student_course_course_id", "course_id"),
+    )
 
     student_course_id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey(
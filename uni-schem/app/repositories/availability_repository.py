@@ -1,14 +1,19 @@
-from typing import List, Optional
+from typing import FrozenSet, Iterable, List, Optional
 from datetime import time
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.models.availability import Availability
-from app.models.professor import Professor
+from app.cache.invalidation import publish
+from app.repositories.pagination import keyset
+from app.repositories.expand import loader_options
 from fastapi import HTTPException, status
 
 
 def create_availability(db: Session, availability: Availability) -> Availability:
     """
-    Inserts a new availability entry into the database after validating no overlap.
+    Inserts a new availability entry into the database.
+    Assumes the professor existence and overlapping availability have been checked at the
+    service layer; the foreign key remains the final guard.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -18,29 +23,20 @@ def create_availability(db: Session, availability: Availability) -> Availability
         Availability: The newly created availability.
 
     Raises:
-        HTTPException: If the availability overlaps with an existing availability.
-    """
-    professor = db.query(Professor).filter(
-        Professor.professor_id == availability.professor_id).first()
-    if not professor:
-        raise HTTPException(status_code=404, detail="Professor not found")
-
-    existing_availability = db.query(Availability).filter(
-        Availability.professor_id == availability.professor_id,
-        Availability.day == availability.day,
-        Availability.start_time == availability.start_time,
-        Availability.end_time == availability.end_time
-    ).first()
-
-    if existing_availability:
+        HTTPException: If the insert fails, raises 500 Internal Server Error.
+    """
+    try:
+        db.add(availability)
+        db.commit()
+        db.refresh(availability)
+    except Exception as exc:
+        db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This professor already has availability at this time."
-        )
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while creating the availability."
+        ) from exc
 
-    db.add(availability)
-    db.commit()
-    db.refresh(availability)
+    publish("availability", availability.availability_id)
     return availability
 
 
@@ -58,17 +54,40 @@ def get_availability_by_id(db: Session, availability_id: int) -> Optional[Availa
     return db.query(Availability).filter(Availability.availability_id == availability_id).first()
 
 
-def get_all_availabilities(db: Session) -> List[Availability]:
+def get_all_availabilities(
+    db: Session, after: Optional[int] = None, limit: Optional[int] = None,
+    expand: FrozenSet[str] = frozenset()
+) -> List[Availability]:
     """
-    Retrieves all availability entries.
+    Retrieves all availability entries, ordered by ID.
 
     Args:
         db (Session): SQLAlchemy session.
+        after (Optional[int]): Return only rows with an ID greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
+        expand (FrozenSet[str]): Relationships to load in the same query; the others are
+            not loaded at all.
 
     Returns:
         List[Availability]: A list of all availability records.
     """
-    return db.query(Availability).all()
+    query = db.query(Availability).options(*loader_options(Availability, expand))
+    return keyset(query, Availability.availability_id, after, limit).all()
+
+
+def stream_availabilities(db: Session, batch_size: int) -> Iterable[Row]:
+    """
+    Streams all availability entries as plain column rows, ordered by ID, reading them through a
+    server-side cursor ``batch_size`` rows at a time instead of loading ORM objects.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        batch_size (int): Number of rows fetched from the cursor at a time.
+
+    Returns:
+        Iterable[Row]: The rows, with the same keys as the table columns.
+    """
+    return db.query(*Availability.__table__.columns).order_by(Availability.availability_id).yield_per(batch_size)
 
 
 def get_availability_by_professor_and_time(
@@ -114,7 +133,7 @@ def update_availability(
     db: Session, availability_id: int, updates: dict
 ) -> Optional[Availability]:
     """
-    Updates an availability entry.
+    Updates an availability entry. The new professor, if any, is validated by the caller.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -128,17 +147,12 @@ def update_availability(
     if not availability:
         return None
 
-    if 'professor_id' in updates:
-        professor = db.query(Professor).filter(
-            Professor.professor_id == updates['professor_id']).first()
-        if not professor:
-            raise HTTPException(status_code=404, detail="Professor not found")
-
     for key, value in updates.items():
         setattr(availability, key, value)
 
     db.commit()
     db.refresh(availability)
+    publish("availability", availability_id)
     return availability
 
 
@@ -162,4 +176,5 @@ def delete_availability(db: Session, availability_id: int) -> bool:
 
     db.delete(availability)
     db.commit()
+    publish("availability")
     return True
@@ -1,14 +1,23 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from app.models.classroom import Classroom
 from fastapi import HTTPException, status
 from app.models.schedule import Schedule
+from app.cache.edge import keys_for, purge
+from app.cache.invalidation import publish
+from app.repositories.pagination import keyset
+from app.db.errors import integrity_http_exception
+from app.cache.entity_cache import EntityCache
+
+classroom_cache = EntityCache(Classroom)
 
 
 def create_classroom(db: Session, classroom: Classroom) -> Classroom:
     """
     Inserts a new classroom into the database with transactional control to avoid auto-increment
-    issues and validates that the classroom name is unique.
+    issues. Assumes the capacity range has been validated at the service layer; name uniqueness
+    is enforced by the ``uq_classroom_name`` constraint.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -18,27 +27,20 @@ def create_classroom(db: Session, classroom: Classroom) -> Classroom:
         Classroom: The newly created classroom.
 
     Raises:
-        HTTPException: If a classroom with the same name already exists, raises 400 Bad Request.
+        HTTPException: If a classroom with the same name already exists, raises 400 Bad Request;
+        if the insert fails otherwise, raises 500 Internal Server Error.
     """
-    existing_classroom = db.query(Classroom).filter(
-        Classroom.name == classroom.name).first()
-    if existing_classroom:
-        raise HTTPException(
-            status_code=400,
-            detail="A classroom with this name already exists."
-        )
-
-    if classroom.capacity < 5 or classroom.capacity > 40:
-        raise HTTPException(
-            status_code=400,
-            detail="Classroom capacity must be between 5 and 40."
-        )
-
     try:
         db.add(classroom)
         db.commit()
         db.refresh(classroom)
+        publish("classroom", classroom.classroom_id)
+        purge(*keys_for("classroom"))
         return classroom
+    except IntegrityError as e:
+        db.rollback()
+        raise integrity_http_exception(
+            e, {"uq_classroom_name": "Classroom with this name already exists."}) from e
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -49,7 +51,7 @@ def create_classroom(db: Session, classroom: Classroom) -> Classroom:
 
 def get_classroom_by_id(db: Session, classroom_id: int) -> Optional[Classroom]:
     """
-    Retrieves a classroom by its ID.
+    Retrieves a classroom by its ID, through the entity cache.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -58,7 +60,9 @@ def get_classroom_by_id(db: Session, classroom_id: int) -> Optional[Classroom]:
     Returns:
         Optional[Classroom]: The classroom if found, else None.
     """
-    return db.query(Classroom).filter(Classroom.classroom_id == classroom_id).first()
+    return classroom_cache.get(
+        db, classroom_id,
+        lambda: db.query(Classroom).filter(Classroom.classroom_id == classroom_id).first())
 
 
 def get_classroom_by_capacity(db: Session, capacity: int) -> List[Classroom]:
@@ -75,17 +79,39 @@ def get_classroom_by_capacity(db: Session, capacity: int) -> List[Classroom]:
     return db.query(Classroom).filter(Classroom.capacity == capacity).all()
 
 
-def get_all_classrooms(db: Session) -> List[Classroom]:
+def get_existing_classroom_ids(db: Session, classroom_ids: Iterable[int]) -> Set[int]:
+    """
+    Returns which of the given IDs belong to existing classrooms, using a single IN query.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        classroom_ids (Iterable[int]): The IDs to check.
+
+    Returns:
+        Set[int]: The IDs that exist.
+    """
+    classroom_ids = set(classroom_ids)
+    if not classroom_ids:
+        return set()
+    return {row[0] for row in db.query(Classroom.classroom_id).filter(
+        Classroom.classroom_id.in_(classroom_ids))}
+
+
+def get_all_classrooms(
+    db: Session, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[Classroom]:
     """
-    Retrieves all classrooms.
+    Retrieves all classrooms, ordered by ID.
 
     Args:
         db (Session): SQLAlchemy session.
+        after (Optional[int]): Return only rows with an ID greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
 
     Returns:
         List[Classroom]: A list of all classrooms.
     """
-    return db.query(Classroom).all()
+    return keyset(db.query(Classroom), Classroom.classroom_id, after, limit).all()
 
 
 def update_classroom(db: Session, classroom_id: int, updates: dict) -> Optional[Classroom]:
@@ -108,6 +134,8 @@ def update_classroom(db: Session, classroom_id: int, updates: dict) -> Optional[
         setattr(classroom, key, value)
 
     db.commit()
+    publish("classroom", classroom_id)
+    purge(*keys_for("classroom", classroom_id))
     db.refresh(classroom)
     return classroom
 
@@ -123,6 +151,9 @@ def delete_classroom(db: Session, classroom_id: int) -> bool:
     Returns:
         bool: True if the classroom was successfully deleted, False otherwise.
     """
+    keys = [key for schedule_id, course_id in db.query(
+                Schedule.schedule_id, Schedule.course_id).filter(Schedule.classroom_id == classroom_id)
+            for key in keys_for("schedule", schedule_id, course=course_id, classroom=classroom_id)]
     db.query(Schedule).filter(Schedule.classroom_id == classroom_id).update(
         {"classroom_id": None}, synchronize_session=False)
 
@@ -132,4 +163,6 @@ def delete_classroom(db: Session, classroom_id: int) -> bool:
 
     db.delete(classroom)
     db.commit()
+    publish("classroom", classroom_id)
+    purge(*keys, *keys_for("classroom", classroom_id))
     return True
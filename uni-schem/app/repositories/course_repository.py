@@ -1,17 +1,25 @@
-from typing import List, Optional
+from typing import FrozenSet, Iterable, List, Optional, Set
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.course import Course
 from app.models.professor import Professor
 from fastapi import HTTPException, status
 from app.models.schedule import Schedule
+from app.repositories.pagination import keyset
+from app.repositories.expand import loader_options
+from app.db.errors import integrity_http_exception
+from app.cache.entity_cache import EntityCache
+from app.cache.edge import keys_for, purge
+from app.cache.invalidation import publish
+
+course_cache = EntityCache(Course)
 
 
 def create_course(db: Session, course: Course) -> Course:
     """
     Adds a new course to the database.
-    Assumes business validations (like unique code and professor existence)
-    have been performed at the service layer.
+    Assumes business validations (like professor existence) have been performed at the
+    service layer; the course code is checked by the ``uq_course_code`` constraint.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -28,13 +36,13 @@ def create_course(db: Session, course: Course) -> Course:
         db.add(course)
         db.commit()
         db.refresh(course)
+        publish("course", course.course_id)
+        purge(*keys_for("course", professor=course.professor_id))
         return course
     except IntegrityError as e:
         db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Bad requestt"
-        )
+        raise integrity_http_exception(
+            e, {"uq_course_code": "Course with this code already exists."}) from e
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -45,7 +53,7 @@ def create_course(db: Session, course: Course) -> Course:
 
 def get_course_by_id(db: Session, course_id: int) -> Optional[Course]:
     """
-    Retrieves a course by its ID.
+    Retrieves a course by its ID, through the entity cache.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -54,7 +62,8 @@ def get_course_by_id(db: Session, course_id: int) -> Optional[Course]:
     Returns:
         Optional[Course]: The course if found, else None.
     """
-    return db.query(Course).filter(Course.course_id == course_id).first()
+    return course_cache.get(
+        db, course_id, lambda: db.query(Course).filter(Course.course_id == course_id).first())
 
 
 def get_course_by_name(db: Session, name: str) -> Optional[Course]:
@@ -85,17 +94,42 @@ def get_courses_by_professor_id(db: Session, professor_id: int) -> List[Course]:
     return db.query(Course).filter(Course.professor_id == professor_id).all()
 
 
-def get_all_courses(db: Session) -> List[Course]:
+def get_existing_course_ids(db: Session, course_ids: Iterable[int]) -> Set[int]:
+    """
+    Returns which of the given IDs belong to existing courses, using a single IN query.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        course_ids (Iterable[int]): The IDs to check.
+
+    Returns:
+        Set[int]: The IDs that exist.
+    """
+    course_ids = set(course_ids)
+    if not course_ids:
+        return set()
+    return {row[0] for row in db.query(Course.course_id).filter(Course.course_id.in_(course_ids))}
+
+
+def get_all_courses(
+    db: Session, after: Optional[int] = None, limit: Optional[int] = None,
+    expand: FrozenSet[str] = frozenset()
+) -> List[Course]:
     """
-    Returns all courses in the database.
+    Returns all courses in the database, ordered by ID.
 
     Args:
         db (Session): SQLAlchemy session.
+        after (Optional[int]): Return only rows with an ID greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
+        expand (FrozenSet[str]): Relationships to load in the same query; the others are
+            not loaded at all.
 
     Returns:
         List[Course]: List of all courses.
     """
-    return db.query(Course).all()
+    query = db.query(Course).options(*loader_options(Course, expand))
+    return keyset(query, Course.course_id, after, limit).all()
 
 
 def update_course(db: Session, course_id: int, updates: dict) -> Optional[Course]:
@@ -118,12 +152,15 @@ def update_course(db: Session, course_id: int, updates: dict) -> Optional[Course
             detail="Course not found."
         )
 
+    previous = keys_for("course", course_id, professor=course.professor_id)
     for key, value in updates.items():
         setattr(course, key, value)
 
     try:
         db.commit()
+        publish("course", course_id)
         db.refresh(course)
+        purge(*previous, *keys_for("course", course_id, professor=course.professor_id))
         return course
     except IntegrityError as e:
         db.rollback()
@@ -154,6 +191,9 @@ def delete_course(db: Session, course_id: int) -> bool:
     if not course:
         return False
 
+    keys = [key for schedule_id, classroom_id in db.query(
+                Schedule.schedule_id, Schedule.classroom_id).filter(Schedule.course_id == course_id)
+            for key in keys_for("schedule", schedule_id, course=course_id, classroom=classroom_id)]
     db.query(Schedule).filter(Schedule.course_id == course_id).update(
         {"course_id": None}, synchronize_session=False)
     course = db.query(Course).filter(Course.course_id == course_id).first()
@@ -161,6 +201,9 @@ def delete_course(db: Session, course_id: int) -> bool:
     if not course:
         return False
 
+    keys += keys_for("course", course_id, professor=course.professor_id)
     db.delete(course)
     db.commit()
+    publish("course", course_id)
+    purge(*keys)
     return True
@@ -0,0 +1,76 @@
+from typing import Dict, FrozenSet, List, Optional, Type
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Load, joinedload, noload
+from app.db.base import Base
+from app.models.availability import Availability
+from app.models.course import Course
+from app.models.schedule import Schedule
+from app.models.student_course import StudentCourse
+
+# Many-to-one relationships that list endpoints can embed with ``?expand=``.
+EXPANSIONS: Dict[Type[Base], Dict[str, object]] = {
+    Availability: {"professor": Availability.professor},
+    Course: {"professor": Course.professor},
+    Schedule: {"course": Schedule.course, "classroom": Schedule.classroom},
+    StudentCourse: {"student": StudentCourse.student, "course": StudentCourse.course},
+}
+
+
+def parse_expand(model: Type[Base], expand: Optional[str]) -> FrozenSet[str]:
+    """
+    Parses a comma-separated ``expand`` query parameter.
+
+    Args:
+        model (Type[Base]): The listed model.
+        expand (Optional[str]): Relationship names, e.g. ``"course,classroom"``.
+
+    Returns:
+        FrozenSet[str]: The requested relationship names (empty if none).
+
+    Raises:
+        HTTPException: If a name is not an expandable relationship of the model (400).
+    """
+    if not expand:
+        return frozenset()
+    requested = frozenset(name.strip() for name in expand.split(",") if name.strip())
+    allowed = EXPANSIONS.get(model, {})
+    unknown = requested - allowed.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(f"Cannot expand {', '.join(sorted(unknown))}. "
+                    f"Allowed: {', '.join(allowed) or 'none'}.")
+        )
+    return requested
+
+
+def loader_options(model: Type[Base], expand: FrozenSet[str] = frozenset()) -> List[Load]:
+    """
+    Builds the loader options of a list query: the requested relationships are joined
+    into the same SELECT, and the others are never loaded, so serializing the rows issues
+    no further queries whatever the page size.
+
+    Args:
+        model (Type[Base]): The listed model.
+        expand (FrozenSet[str]): Relationship names returned by :func:`parse_expand`.
+
+    Returns:
+        List[Load]: Options for ``Query.options`` or ``Select.options``.
+    """
+    return [joinedload(relationship) if name in expand else noload(relationship)
+            for name, relationship in EXPANSIONS.get(model, {}).items()]
+
+
+def expanded_tables(model: Type[Base], expand: FrozenSet[str] = frozenset()) -> List[str]:
+    """
+    Lists the tables an expanded list response is also read from.
+
+    Args:
+        model (Type[Base]): The listed model.
+        expand (FrozenSet[str]): Relationship names returned by :func:`parse_expand`.
+
+    Returns:
+        List[str]: Table names of the requested relationships, in name order.
+    """
+    relationships = EXPANSIONS.get(model, {})
+    return [relationships[name].property.mapper.local_table.name for name in sorted(expand)]
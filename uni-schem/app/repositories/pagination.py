@@ -0,0 +1,45 @@
+from typing import List, Optional
+from sqlalchemy.orm import Query
+
+
+def keyset(query: Query, key, after: Optional[int] = None, limit: Optional[int] = None) -> Query:
+    """
+    Orders a query by its key column and restricts it to the rows after a cursor.
+
+    Unlike ``OFFSET``, filtering on ``key > after`` lets the database seek straight to
+    the cursor through the primary key index, so every page costs the same.
+
+    Args:
+        query (Query): The query to paginate.
+        key: The unique, indexed column to order by (usually the primary key).
+        after (Optional[int]): Return only rows whose key is greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
+
+    Returns:
+        Query: The ordered and filtered query.
+    """
+    query = query.order_by(key)
+    if after is not None:
+        query = query.filter(key > after)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def build_page(rows: List, limit: int, key: str) -> dict:
+    """
+    Builds a page from rows fetched with ``limit + 1``: the extra row only signals
+    that another page exists.
+
+    Args:
+        rows (List): Up to ``limit + 1`` rows in key order.
+        limit (int): The page size requested by the client.
+        key (str): Name of the key attribute used as cursor.
+
+    Returns:
+        dict: ``items`` (at most ``limit`` rows) and ``next_cursor`` (the key of the last
+        item, or None on the last page).
+    """
+    items = rows[:limit]
+    next_cursor = getattr(items[-1], key) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,12 +1,21 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from app.models.professor import Professor
+from app.repositories.pagination import keyset
+from app.db.errors import integrity_http_exception
+from app.cache.entity_cache import EntityCache
+from app.cache.edge import keys_for, purge
+from app.cache.invalidation import publish
 from fastapi import HTTPException, status
 
+professor_cache = EntityCache(Professor)
+
 
 def create_professor(db: Session, professor: Professor) -> Professor:
     """
-    Registers a new professor in the database, ensuring uniqueness of email and phone number.
+    Registers a new professor in the database in a single statement; the uniqueness of email,
+    phone number and DNI is enforced by the table's unique keys.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -17,35 +26,34 @@ def create_professor(db: Session, professor: Professor) -> Professor:
 
     Raises:
         HTTPException:
-            - If a professor with the same email already exists.
-            - If a professor with the same phone number already exists.
+            - If a professor with the same email, phone number or DNI already exists (400).
+            - If the insert fails otherwise (500).
     """
-    existing_email = db.query(Professor).filter(
-        Professor.email == professor.email).first()
-    if existing_email:
+    try:
+        db.add(professor)
+        db.commit()
+        db.refresh(professor)
+        publish("professor", professor.professor_id)
+        purge(*keys_for("professor"))
+        return professor
+    except IntegrityError as e:
+        db.rollback()
+        raise integrity_http_exception(e, {
+            "email": "A professor with this email already exists.",
+            "phone": "A professor with this phone number already exists.",
+            "dni": "A professor with this DNI already exists.",
+        }) from e
+    except Exception as e:
+        db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A professor with this email already exists."
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while creating the professor: {str(e)}"
         )
 
-    if professor.phone:
-        existing_phone = db.query(Professor).filter(
-            Professor.phone == professor.phone).first()
-        if existing_phone:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A professor with this phone number already exists."
-            )
-
-    db.add(professor)
-    db.commit()
-    db.refresh(professor)
-    return professor
-
 
 def get_professor_by_id(db: Session, professor_id: int) -> Optional[Professor]:
     """
-    Retrieves a professor by their unique ID.
+    Retrieves a professor by their unique ID, through the entity cache.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -54,20 +62,43 @@ def get_professor_by_id(db: Session, professor_id: int) -> Optional[Professor]:
     Returns:
         Optional[Professor]: The professor if found, else None.
     """
-    return db.query(Professor).filter(Professor.professor_id == professor_id).first()
+    return professor_cache.get(
+        db, professor_id,
+        lambda: db.query(Professor).filter(Professor.professor_id == professor_id).first())
+
+
+def get_professors_by_ids(db: Session, professor_ids: List[int]) -> List[Professor]:
+    """
+    Retrieves several professors by their IDs in a single query.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        professor_ids (List[int]): The IDs of the professors to retrieve.
+
+    Returns:
+        List[Professor]: The professors found, ordered by ID.
+    """
+    if not professor_ids:
+        return []
+    return db.query(Professor).filter(
+        Professor.professor_id.in_(professor_ids)).order_by(Professor.professor_id).all()
 
 
-def get_all_professors(db: Session) -> List[Professor]:
+def get_all_professors(
+    db: Session, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[Professor]:
     """
-    Retrieves all professors from the database.
+    Retrieves all professors from the database, ordered by ID.
 
     Args:
         db (Session): SQLAlchemy session object.
+        after (Optional[int]): Return only rows with an ID greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
 
     Returns:
         List[Professor]: A list of all professors.
     """
-    return db.query(Professor).all()
+    return keyset(db.query(Professor), Professor.professor_id, after, limit).all()
 
 
 def update_professor(
@@ -123,13 +154,15 @@ def update_professor(
         setattr(professor, key, value)
 
     db.commit()
+    publish("professor", professor_id)
+    purge(*keys_for("professor", professor_id))
     db.refresh(professor)
     return professor
 
 
 def delete_professor(db: Session, professor_id: int) -> bool:
     """
-    Deletes a professor by their ID.
+    Deletes a professor by their ID, along with their courses and availability.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -142,6 +175,20 @@ def delete_professor(db: Session, professor_id: int) -> bool:
     if not professor:
         return False
 
+    cascaded = ([("course", course.course_id) for course in professor.courses]
+                + [("availability", availability.availability_id)
+                   for availability in professor.availabilities])
+    # Deleting the courses detaches their sessions, which the flush loads anyway.
+    keys = keys_for("professor", professor_id)
+    for course in professor.courses:
+        keys += keys_for("course", course.course_id, professor=professor_id)
+        keys += [key for schedule in course.schedules
+                 for key in keys_for("schedule", schedule.schedule_id,
+                                     course=course.course_id, classroom=schedule.classroom_id)]
     db.delete(professor)
     db.commit()
+    publish("professor", professor_id)
+    for entity, entity_id in cascaded:
+        publish(entity, entity_id)
+    purge(*keys)
     return True
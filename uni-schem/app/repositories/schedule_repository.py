@@ -1,15 +1,26 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import FrozenSet, Iterable, List, Optional
+from sqlalchemy import insert, or_, text
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload
 from app.models.schedule import Schedule
 from app.models.course import Course
-from app.models.classroom import Classroom
+from app.models.day import Day
+from app.scheduling.interval_index import ScheduleIndex
+from app.repositories.pagination import keyset
+from app.repositories.expand import loader_options
+from app.cache.edge import keys_for, purge
+from app.cache.invalidation import publish
 from fastapi import HTTPException, status
 
+# Rows per multi-row INSERT statement, which keeps each one well below max_allowed_packet.
+INSERT_CHUNK_SIZE = 1000
+
 
 def create_schedule(db: Session, schedule: Schedule) -> Schedule:
     """
-    Inserts a new schedule entry into the database after validating course and classroom existence,
-    and checking for scheduling conflicts.
+    Inserts a new schedule entry into the database.
+    Assumes the course and classroom existence and the scheduling conflicts have been
+    checked at the service layer; the foreign keys remain the final guard.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -19,56 +30,116 @@ def create_schedule(db: Session, schedule: Schedule) -> Schedule:
         Schedule: The newly created schedule.
 
     Raises:
-        HTTPException: If the course or classroom does not exist,
-                       or if a conflict exists in the schedule for the same course or classroom.
+        HTTPException: If the insert fails, raises 500 Internal Server Error.
     """
-    course = db.query(Course).filter(
-        Course.course_id == schedule.course_id).first()
-    if not course:
+    try:
+        db.add(schedule)
+        db.commit()
+        db.refresh(schedule)
+    except Exception as exc:
+        db.rollback()
         raise HTTPException(
-            status_code=404,
-            detail="Course not found"
-        )
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while creating the schedule."
+        ) from exc
 
-    classroom = db.query(Classroom).filter(
-        Classroom.classroom_id == schedule.classroom_id).first()
-    if not classroom:
-        raise HTTPException(
-            status_code=404,
-            detail="Classroom not found"
-        )
+    publish("schedule", schedule.schedule_id)
+    purge(*keys_for("schedule", course=schedule.course_id, classroom=schedule.classroom_id))
+    return schedule
 
-    existing_schedule_for_course = db.query(Schedule).filter(
-        Schedule.course_id == schedule.course_id,
-        Schedule.day == schedule.day,
-        Schedule.start_time == schedule.start_time,
-        Schedule.end_time == schedule.end_time
-    ).first()
 
-    if existing_schedule_for_course:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Course is already scheduled at the same time."
-        )
+def _insert_consecutive(db: Session, rows: List[dict]) -> List[int]:
+    """
+    Inserts rows with multi-row ``INSERT`` statements of ``INSERT_CHUNK_SIZE`` rows and
+    derives their IDs from each statement's first generated ID, for MySQL, which has no
+    ``RETURNING``. InnoDB reserves the IDs of a multi-row insert of known length as one
+    block (any ``innodb_autoinc_lock_mode``), spaced by ``auto_increment_increment``.
 
-    existing_schedule_in_classroom = db.query(Schedule).filter(
-        Schedule.classroom_id == schedule.classroom_id,
-        Schedule.day == schedule.day,
-        Schedule.start_time == schedule.start_time,
-        Schedule.end_time == schedule.end_time
-    ).first()
+    Args:
+        db (Session): SQLAlchemy session object.
+        rows (List[dict]): Column values of the rows.
 
-    if existing_schedule_in_classroom:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Classroom is already booked at this time."
-        )
+    Returns:
+        List[int]: The generated IDs, in the same order as ``rows``.
+    """
+    step = db.execute(text("SELECT @@auto_increment_increment")).scalar_one()
+    schedule_ids = []
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        first = db.execute(insert(Schedule).values(chunk)).lastrowid
+        schedule_ids += range(first, first + step * len(chunk), step)
+    return schedule_ids
 
-    db.add(schedule)
-    db.flush()
+
+def create_schedules(db: Session, schedules: List[Schedule]) -> List[int]:
+    """
+    Inserts several schedule entries in one transaction, with their generated IDs read
+    back from ``RETURNING`` where the database supports it and from the auto-increment
+    block of each multi-row insert otherwise (MySQL). Assumes the sessions have already
+    been checked for conflicts by the caller, so no two of them share course, classroom,
+    day and times.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        schedules (List[Schedule]): The schedule instances to insert.
+
+    Returns:
+        List[int]: The generated schedule IDs, in the same order as the input.
+    """
+    if not schedules:
+        return []
+
+    columns = ("course_id", "classroom_id", "day", "start_time", "end_time")
+    rows = [{column: getattr(schedule, column) for column in columns}
+            for schedule in schedules]
+    if db.get_bind().dialect.insert_returning:
+        # RETURNING only yields this statement's rows, in no guaranteed order (asking for
+        # one makes SQLite insert row by row), so they are matched back by their values.
+        returned = db.execute(
+            insert(Schedule).returning(
+                Schedule.schedule_id, *(getattr(Schedule, column) for column in columns)),
+            rows)
+        created = {tuple(key): schedule_id for schedule_id, *key in returned}
+        schedule_ids = [created[tuple(row.values())] for row in rows]
+    else:
+        schedule_ids = _insert_consecutive(db, rows)
     db.commit()
-    db.refresh(schedule)
-    return schedule
+
+    publish("schedule")
+    purge(*(key for row in rows for key in keys_for(
+        "schedule", course=row["course_id"], classroom=row["classroom_id"])))
+    return schedule_ids
+
+
+def get_sessions_with_professor(db: Session) -> List[tuple]:
+    """
+    Retrieves every scheduled session together with the professor teaching it.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+
+    Returns:
+        List[tuple]: (course_id, professor_id, classroom_id, day, start_time, end_time) rows.
+    """
+    return db.query(
+        Schedule.course_id, Course.professor_id, Schedule.classroom_id,
+        Schedule.day, Schedule.start_time, Schedule.end_time
+    ).outerjoin(Course, Course.course_id == Schedule.course_id).all()
+
+
+def get_scheduled_course_ids(db: Session) -> set:
+    """
+    Retrieves the IDs of the courses that have at least one schedule entry.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+
+    Returns:
+        set: The scheduled course IDs.
+    """
+    rows = db.query(Schedule.course_id).filter(
+        Schedule.course_id.isnot(None)).distinct()
+    return {course_id for (course_id,) in rows}
 
 
 def get_schedule_by_id(db: Session, schedule_id: int) -> Optional[Schedule]:
@@ -85,17 +156,92 @@ def get_schedule_by_id(db: Session, schedule_id: int) -> Optional[Schedule]:
     return db.query(Schedule).filter(Schedule.schedule_id == schedule_id).first()
 
 
-def get_all_schedules(db: Session) -> List[Schedule]:
+def get_all_schedules(
+    db: Session, after: Optional[int] = None, limit: Optional[int] = None,
+    expand: FrozenSet[str] = frozenset()
+) -> List[Schedule]:
     """
-    Retrieves all schedules from the database.
+    Retrieves all schedules from the database, ordered by ID.
 
     Args:
         db (Session): SQLAlchemy session object.
+        after (Optional[int]): Return only rows with an ID greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
+        expand (FrozenSet[str]): Relationships to load in the same query; the others are
+            not loaded at all.
 
     Returns:
         List[Schedule]: A list of all schedules.
     """
-    return db.query(Schedule).all()
+    query = db.query(Schedule).options(*loader_options(Schedule, expand))
+    return keyset(query, Schedule.schedule_id, after, limit).all()
+
+
+def stream_schedules(db: Session, batch_size: int) -> Iterable[Row]:
+    """
+    Streams all schedule entries as plain column rows, ordered by ID, reading them through a
+    server-side cursor ``batch_size`` rows at a time instead of loading ORM objects.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        batch_size (int): Number of rows fetched from the cursor at a time.
+
+    Returns:
+        Iterable[Row]: The rows, with the same keys as the table columns.
+    """
+    return db.query(*Schedule.__table__.columns).order_by(Schedule.schedule_id).yield_per(batch_size)
+
+
+def load_schedule_index(
+    db: Session,
+    day: Optional[Day],
+    classroom_ids: Iterable[int],
+    course_ids: Iterable[int],
+    exclude_id: Optional[int] = None,
+) -> ScheduleIndex:
+    """
+    Loads the existing sessions of the given classrooms and courses into an
+    in-memory interval index with a single query.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        day (Optional[Day]): Restricts the load to one day of the week, or None for all days.
+        classroom_ids (Iterable[int]): IDs of the classrooms whose sessions are needed.
+        course_ids (Iterable[int]): IDs of the courses whose sessions are needed.
+        exclude_id (Optional[int]): Session left out of the index, e.g. the one being
+            updated, so that it does not conflict with its own new times.
+
+    Returns:
+        ScheduleIndex: Index answering classroom and course overlap queries.
+    """
+    index = ScheduleIndex()
+    classroom_ids = {cid for cid in classroom_ids if cid is not None}
+    course_ids = {cid for cid in course_ids if cid is not None}
+    if not classroom_ids and not course_ids:
+        return index
+
+    owners = []
+    if classroom_ids:
+        owners.append(Schedule.classroom_id.in_(classroom_ids))
+    if course_ids:
+        owners.append(Schedule.course_id.in_(course_ids))
+
+    query = db.query(
+        Schedule.course_id, Schedule.classroom_id, Schedule.day,
+        Schedule.start_time, Schedule.end_time
+    ).filter(or_(*owners))
+    if day is not None:
+        query = query.filter(Schedule.day == day)
+    if exclude_id is not None:
+        query = query.filter(Schedule.schedule_id != exclude_id)
+
+    for course_id, classroom_id, row_day, start_time, end_time in query:
+        index.add(
+            course_id if course_id in course_ids else None,
+            classroom_id if classroom_id in classroom_ids else None,
+            row_day, start_time, end_time,
+        )
+    return index
 
 
 def get_schedules_by_course_id(db: Session, course_id: int) -> List[Schedule]:
@@ -138,21 +284,29 @@ def update_schedule(db: Session, schedule_id: int, updates: dict) -> Optional[Sc
     Returns:
         Optional[Schedule]: The updated schedule, or None if not found.
     """
-    schedule = get_schedule_by_id(db, schedule_id)
+    # Usually already loaded by the service's conflict check; no second query then.
+    schedule = db.get(Schedule, schedule_id)
     if not schedule:
         return None
 
+    previous = keys_for("schedule", schedule_id,
+                        course=schedule.course_id, classroom=schedule.classroom_id)
     for key, value in updates.items():
         setattr(schedule, key, value)
 
     db.commit()
     db.refresh(schedule)
+    publish("schedule", schedule_id)
+    purge(*previous, *keys_for("schedule", schedule_id,
+                               course=schedule.course_id, classroom=schedule.classroom_id))
     return schedule
 
 
 def delete_schedule(db: Session, schedule_id: int) -> bool:
     """
-    Deletes a schedule from the system by its ID.
+    Deletes a schedule from the system by its ID, along with its course. The course, and
+    the enrollments and sessions its deletion cascades to, are loaded up front instead of
+    one lazy load at a time.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -161,15 +315,29 @@ def delete_schedule(db: Session, schedule_id: int) -> bool:
     Returns:
         bool: True if the schedule was successfully deleted, False otherwise.
     """
-    schedule = get_schedule_by_id(db, schedule_id)
+    course = joinedload(Schedule.course)
+    schedule = (
+        db.query(Schedule)
+        .options(course.selectinload(Course.enrollments), course.selectinload(Course.schedules))
+        .filter(Schedule.schedule_id == schedule_id)
+        .first()
+    )
     if not schedule:
         return False
 
+    course_id = schedule.course_id
+    # The other sessions of the course are detached from it by the course's deletion.
+    keys = [key for session in (schedule.course.schedules if schedule.course else [schedule])
+            for key in keys_for("schedule", session.schedule_id,
+                                course=session.course_id, classroom=session.classroom_id)]
     if schedule.course:
+        keys += keys_for("course", course_id, professor=schedule.course.professor_id)
         db.delete(schedule.course)
-    if schedule.classroom:
-        schedule.classroom_id = None
 
     db.delete(schedule)
     db.commit()
+    publish("schedule", schedule_id)
+    if course_id is not None:
+        publish("course", course_id)
+    purge(*keys)
     return True
@@ -1,14 +1,24 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 from app.models.student_course import StudentCourse
 from fastapi import HTTPException, status
-from app.models.course import Course
-from app.models.student import Student
+from app.repositories.pagination import keyset
+from app.repositories.expand import loader_options
+from app.db.errors import integrity_http_exception
+from app.cache.invalidation import publish
+
+
+ENROLLMENT_MESSAGES = {"uq_student_course": "Student is already enrolled in this course."}
 
 
 def create_student_course(db: Session, relation: StudentCourse) -> StudentCourse:
     """
-    Adds a new student-course enrollment to the database after validating no duplicates.
+    Adds a new student-course enrollment to the database.
+    Assumes the student and course existence have been checked at the service layer; duplicate
+    enrollments are rejected by the ``uq_student_course`` constraint.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -18,34 +28,18 @@ def create_student_course(db: Session, relation: StudentCourse) -> StudentCourse
         StudentCourse: The newly created enrollment.
 
     Raises:
-        HTTPException: If the student is already enrolled in the course.
+        HTTPException: If the student is already enrolled in the course (400), or if the
+        insert fails otherwise (500).
     """
-    student = db.query(Student).filter(
-        Student.student_id == relation.student_id).first()
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-
-    course = db.query(Course).filter(
-        Course.course_id == relation.course_id).first()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-
-    existing_relation = db.query(StudentCourse).filter(
-        StudentCourse.student_id == relation.student_id,
-        StudentCourse.course_id == relation.course_id
-    ).first()
-
-    if existing_relation:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Student is already enrolled in this course."
-        )
-
     try:
         db.add(relation)
         db.commit()
         db.refresh(relation)
+        publish("student_course", relation.student_course_id)
         return relation
+    except IntegrityError as exc:
+        db.rollback()
+        raise integrity_http_exception(exc, ENROLLMENT_MESSAGES) from exc
     except Exception as exc:
         db.rollback()
         raise HTTPException(
@@ -54,6 +48,30 @@ def create_student_course(db: Session, relation: StudentCourse) -> StudentCourse
         ) from exc
 
 
+def create_student_courses(db: Session, pairs: List[Tuple[int, int]]) -> Dict[Tuple[int, int], int]:
+    """
+    Inserts several enrollments with a single executemany in one transaction. Assumes the
+    caller has already validated the IDs and removed duplicates.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        pairs (List[Tuple[int, int]]): The (student_id, course_id) pairs to enroll.
+
+    Returns:
+        Dict[Tuple[int, int], int]: The generated enrollment ID for each pair.
+    """
+    if not pairs:
+        return {}
+    db.execute(
+        insert(StudentCourse),
+        [{"student_id": student_id, "course_id": course_id} for student_id, course_id in pairs]
+    )
+    created = get_existing_enrollments(db, pairs)
+    db.commit()
+    publish("student_course")
+    return created
+
+
 def get_student_course_by_id(db: Session, relation_id: int) -> Optional[StudentCourse]:
     """
     Retrieves an enrollment by its ID.
@@ -68,17 +86,42 @@ def get_student_course_by_id(db: Session, relation_id: int) -> Optional[StudentC
     return db.query(StudentCourse).filter(StudentCourse.student_course_id == relation_id).first()
 
 
-def get_all_student_courses(db: Session) -> List[StudentCourse]:
+def get_all_student_courses(
+    db: Session, after: Optional[int] = None, limit: Optional[int] = None,
+    expand: FrozenSet[str] = frozenset()
+) -> List[StudentCourse]:
     """
-    Retrieves all student-course enrollments.
+    Retrieves all student-course enrollments, ordered by ID.
 
     Args:
         db (Session): SQLAlchemy session object.
+        after (Optional[int]): Return only rows with an ID greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
+        expand (FrozenSet[str]): Relationships to load in the same query; the others are
+            not loaded at all.
 
     Returns:
         List[StudentCourse]: List of all enrollments.
     """
-    return db.query(StudentCourse).all()
+    query = db.query(StudentCourse).options(*loader_options(StudentCourse, expand))
+    return keyset(query, StudentCourse.student_course_id, after, limit).all()
+
+
+def stream_student_courses(db: Session, batch_size: int) -> Iterable[Row]:
+    """
+    Streams all student-course enrollments as plain column rows, ordered by ID, reading
+    them through a server-side cursor ``batch_size`` rows at a time instead of loading
+    ORM objects.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        batch_size (int): Number of rows fetched from the cursor at a time.
+
+    Returns:
+        Iterable[Row]: The rows, with the same keys as the table columns.
+    """
+    return db.query(*StudentCourse.__table__.columns).order_by(
+        StudentCourse.student_course_id).yield_per(batch_size)
 
 
 def get_students_by_course_id(db: Session, course_id: int) -> List[StudentCourse]:
@@ -113,6 +156,38 @@ def get_student_course_by_student_and_course(db: Session, student_id: int, cours
     ).first()
 
 
+def get_existing_enrollments(
+    db: Session, pairs: Iterable[Tuple[int, int]]
+) -> Dict[Tuple[int, int], int]:
+    """
+    Finds which of the given (student_id, course_id) pairs are already enrolled, with a
+    single query over the students and courses involved.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        pairs (Iterable[Tuple[int, int]]): The pairs to look up.
+
+    Returns:
+        Dict[Tuple[int, int], int]: The enrollment ID of each pair that exists.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    student_ids = {student_id for student_id, _ in pairs}
+    course_ids = {course_id for _, course_id in pairs}
+    rows = db.query(
+        StudentCourse.student_id, StudentCourse.course_id, StudentCourse.student_course_id
+    ).filter(
+        StudentCourse.student_id.in_(student_ids),
+        StudentCourse.course_id.in_(course_ids)
+    )
+    return {
+        (student_id, course_id): relation_id
+        for student_id, course_id, relation_id in rows
+        if (student_id, course_id) in pairs
+    }
+
+
 def get_courses_by_student_id(db: Session, student_id: int) -> List[StudentCourse]:
     """
     Retrieves all courses a specific student is enrolled in by their student ID.
@@ -127,6 +202,52 @@ def get_courses_by_student_id(db: Session, student_id: int) -> List[StudentCours
     return db.query(StudentCourse).filter(StudentCourse.student_id == student_id).all()
 
 
+def get_enrollment_counts(db: Session, course_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Counts the students enrolled in each of the given courses.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        course_ids (Iterable[int]): The IDs of the courses.
+
+    Returns:
+        Dict[int, int]: Number of enrolled students per course ID (courses without
+        enrollments are omitted).
+    """
+    rows = db.query(StudentCourse.course_id, func.count(StudentCourse.student_id)).filter(
+        StudentCourse.course_id.in_(list(course_ids))
+    ).group_by(StudentCourse.course_id)
+    return dict(rows)
+
+
+def get_course_pairs_sharing_students(
+    db: Session, course_ids: Optional[Iterable[int]] = None
+) -> List[Tuple[int, int]]:
+    """
+    Retrieves the pairs of courses that have at least one student in common.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        course_ids (Optional[Iterable[int]]): If given, only pairs involving at least one
+            of these courses are returned.
+
+    Returns:
+        List[Tuple[int, int]]: Distinct (course_id, course_id) pairs, smaller ID first.
+    """
+    first = aliased(StudentCourse)
+    second = aliased(StudentCourse)
+    query = db.query(first.course_id, second.course_id).join(
+        second,
+        and_(first.student_id == second.student_id,
+             first.course_id < second.course_id)
+    )
+    if course_ids is not None:
+        course_ids = list(course_ids)
+        query = query.filter(
+            or_(first.course_id.in_(course_ids), second.course_id.in_(course_ids)))
+    return [tuple(row) for row in query.distinct()]
+
+
 def delete_student_course(db: Session, relation_id: int) -> bool:
     """
     Deletes a student-course enrollment by its ID and ensures cascading deletion of related records.
@@ -144,4 +265,5 @@ def delete_student_course(db: Session, relation_id: int) -> bool:
 
     db.delete(relation)
     db.commit()
+    publish("student_course", relation_id)
     return True
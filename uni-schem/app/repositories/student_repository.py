@@ -1,13 +1,21 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.student import Student
+from app.repositories.pagination import keyset
+from app.db.errors import integrity_http_exception
+from app.cache.entity_cache import EntityCache
+from app.cache.invalidation import publish
 from fastapi import HTTPException, status
 
+student_cache = EntityCache(Student)
+
 
 def create_student(db: Session, student: Student) -> Student:
     """
-    Registers a new student in the database, validating the uniqueness of DNI and email.
+    Registers a new student in the database in a single statement; the uniqueness of DNI
+    and email is enforced by the table's unique keys.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -17,35 +25,25 @@ def create_student(db: Session, student: Student) -> Student:
         Student: The newly created student object.
 
     Raises:
-        HTTPException:
-            - If a student with the same DNI already exists.
-            - If a student with the same email already exists.
+        HTTPException: If a student with the same DNI or email already exists (400).
     """
-    existing_student = db.query(Student).filter(
-        Student.dni == student.dni).first()
-    if existing_student:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A student with this DNI already exists."
-        )
-
-    existing_student_by_email = db.query(Student).filter(
-        Student.email == student.email).first()
-    if existing_student_by_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A student with this email already exists."
-        )
-
-    db.add(student)
-    db.commit()
-    db.refresh(student)
-    return student
+    try:
+        db.add(student)
+        db.commit()
+        db.refresh(student)
+        publish("student", student.student_id)
+        return student
+    except IntegrityError as e:
+        db.rollback()
+        raise integrity_http_exception(e, {
+            "dni": "Student with this DNI already exists.",
+            "email": "Student with this email already exists.",
+        }) from e
 
 
 def get_student_by_id(db: Session, student_id: int) -> Optional[Student]:
     """
-    Retrieves a student by their ID.
+    Retrieves a student by their ID, through the entity cache.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -54,7 +52,8 @@ def get_student_by_id(db: Session, student_id: int) -> Optional[Student]:
     Returns:
         Optional[Student]: The student if found, else None.
     """
-    return db.query(Student).filter(Student.student_id == student_id).first()
+    return student_cache.get(
+        db, student_id, lambda: db.query(Student).filter(Student.student_id == student_id).first())
 
 
 def get_student_by_dni(db: Session, dni: str) -> Optional[Student]:
@@ -71,17 +70,53 @@ def get_student_by_dni(db: Session, dni: str) -> Optional[Student]:
     return db.query(Student).filter(Student.dni == dni).first()
 
 
-def get_all_students(db: Session) -> List[Student]:
+def get_existing_student_ids(db: Session, student_ids: Iterable[int]) -> Set[int]:
     """
-    Retrieves all students.
+    Returns which of the given IDs belong to existing students, using a single IN query.
 
     Args:
         db (Session): SQLAlchemy session object.
+        student_ids (Iterable[int]): The IDs to check.
+
+    Returns:
+        Set[int]: The IDs that exist.
+    """
+    student_ids = set(student_ids)
+    if not student_ids:
+        return set()
+    return {row[0] for row in db.query(Student.student_id).filter(Student.student_id.in_(student_ids))}
+
+
+def get_all_students(
+    db: Session, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[Student]:
+    """
+    Retrieves all students, ordered by ID.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        after (Optional[int]): Return only rows with an ID greater than this value.
+        limit (Optional[int]): Maximum number of rows to return (None for all).
 
     Returns:
         List[Student]: List of all students in the database.
     """
-    return db.query(Student).all()
+    return keyset(db.query(Student), Student.student_id, after, limit).all()
+
+
+def stream_students(db: Session, batch_size: int) -> Iterable[Row]:
+    """
+    Streams all students as plain column rows, ordered by ID, reading them through a
+    server-side cursor ``batch_size`` rows at a time instead of loading ORM objects.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        batch_size (int): Number of rows fetched from the cursor at a time.
+
+    Returns:
+        Iterable[Row]: The rows, with the same keys as the table columns.
+    """
+    return db.query(*Student.__table__.columns).order_by(Student.student_id).yield_per(batch_size)
 
 
 def update_student(
@@ -136,6 +171,7 @@ def update_student(
 
     try:
         db.commit()
+        publish("student", student_id)
         db.refresh(student)
         return student
     except IntegrityError as e:
@@ -161,6 +197,10 @@ def delete_student(db: Session, student_id: int) -> bool:
     if not student:
         return False
 
+    enrollment_ids = [enrollment.student_course_id for enrollment in student.enrollments]
     db.delete(student)
     db.commit()
+    publish("student", student_id)
+    for enrollment_id in enrollment_ids:
+        publish("student_course", enrollment_id)
     return True
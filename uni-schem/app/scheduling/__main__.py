@@ -0,0 +1,64 @@
+"""
+Command-line entry point for batch timetabling.
+
+Runs the timetable solver outside the web workers, so large faculties can be solved on a
+dedicated host with many cores and a wall-clock budget:
+
+    python -m app.scheduling --restarts 32 --workers 32 --time-budget 3600
+"""
+import argparse
+import json
+
+from app.db.database import get_sessionmaker
+from app.schemas.schedule import ScheduleSolveRequest
+from app.services import schedule_service
+
+
+def main() -> None:
+    """
+    Parses the command-line options, solves the timetable and prints a JSON summary.
+    """
+    parser = argparse.ArgumentParser(description="Generate a conflict-free timetable.")
+    parser.add_argument("--restarts", type=int, default=1,
+                        help="independent randomized restarts (best result is kept)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: SOLVER_WORKERS or CPU count)")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="wall-clock budget in seconds")
+    parser.add_argument("--max-iterations", type=int, default=20000,
+                        help="local-search moves per restart")
+    parser.add_argument("--sessions-per-course", type=int, default=2)
+    parser.add_argument("--session-minutes", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the result without storing it")
+    args = parser.parse_args()
+
+    request = ScheduleSolveRequest(
+        restarts=args.restarts,
+        workers=args.workers,
+        time_budget_seconds=args.time_budget,
+        max_iterations=args.max_iterations,
+        sessions_per_course=args.sessions_per_course,
+        session_minutes=args.session_minutes,
+        seed=args.seed,
+        dry_run=args.dry_run,
+    )
+
+    db = get_sessionmaker()()
+    try:
+        result = schedule_service.solve_schedules(db, request)
+    finally:
+        db.close()
+
+    print(json.dumps({
+        "placed": len(result.schedules),
+        "unplaced": [course.model_dump() for course in result.unplaced],
+        "penalty": result.penalty,
+        "restarts": result.restarts,
+        "stored": result.stored,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import time
+from typing import Dict, Hashable, List
+
+
+def to_minutes(value: time) -> int:
+    """
+    Converts a time of day into minutes elapsed since midnight.
+
+    Args:
+        value (time): The time of day.
+
+    Returns:
+        int: Minutes since midnight.
+    """
+    return value.hour * 60 + value.minute
+
+
+class IntervalIndex:
+    """
+    Indexes half-open time intervals ``[start, end)`` per key (for example
+    ``(classroom_id, Day)``) using two sorted arrays: one of start times and one of
+    end times.
+
+    An interval ``[s, e)`` overlaps a stored interval ``[a, b)`` when ``a < e`` and
+    ``b > s``. Every stored interval with ``b <= s`` also has ``a < e``, so the number
+    of overlapping intervals is ``#(a < e) - #(b <= s)``: two binary searches, i.e.
+    O(log n) per query, and correct even when the stored intervals overlap each other.
+    """
+
+    def __init__(self):
+        self._starts: Dict[Hashable, List[int]] = defaultdict(list)
+        self._ends: Dict[Hashable, List[int]] = defaultdict(list)
+
+    def add(self, key: Hashable, start: int, end: int) -> None:
+        """
+        Adds the interval ``[start, end)`` under the given key.
+
+        Args:
+            key (Hashable): Owner of the interval, e.g. ``(classroom_id, day)``.
+            start (int): Start of the interval in minutes.
+            end (int): End of the interval in minutes.
+        """
+        insort(self._starts[key], start)
+        insort(self._ends[key], end)
+
+    def remove(self, key: Hashable, start: int, end: int) -> None:
+        """
+        Removes one occurrence of the interval ``[start, end)`` under the given key.
+
+        Args:
+            key (Hashable): Owner of the interval.
+            start (int): Start of the interval in minutes.
+            end (int): End of the interval in minutes.
+
+        Raises:
+            ValueError: If the interval is not indexed under the key.
+        """
+        starts, ends = self._starts.get(key), self._ends.get(key)
+        if not starts or not ends:
+            raise ValueError("Interval not found in index.")
+        i, j = bisect_left(starts, start), bisect_left(ends, end)
+        if i == len(starts) or starts[i] != start or j == len(ends) or ends[j] != end:
+            raise ValueError("Interval not found in index.")
+        del starts[i]
+        del ends[j]
+
+    def count_overlaps(self, key: Hashable, start: int, end: int) -> int:
+        """
+        Counts the stored intervals under the key that overlap ``[start, end)``.
+
+        Args:
+            key (Hashable): Owner of the intervals.
+            start (int): Start of the queried interval in minutes.
+            end (int): End of the queried interval in minutes.
+
+        Returns:
+            int: Number of overlapping intervals.
+        """
+        starts = self._starts.get(key)
+        if not starts:
+            return 0
+        return bisect_left(starts, end) - bisect_right(self._ends[key], start)
+
+    def overlaps(self, key: Hashable, start: int, end: int) -> bool:
+        """
+        Checks whether any stored interval under the key overlaps ``[start, end)``.
+
+        Args:
+            key (Hashable): Owner of the intervals.
+            start (int): Start of the queried interval in minutes.
+            end (int): End of the queried interval in minutes.
+
+        Returns:
+            bool: True if at least one stored interval overlaps.
+        """
+        return self.count_overlaps(key, start, end) > 0
+
+
+class ScheduleIndex:
+    """
+    Pair of interval indexes over schedule sessions: one keyed by
+    ``(classroom_id, day)`` and one keyed by ``(course_id, day)``.
+    """
+
+    def __init__(self):
+        self.classrooms = IntervalIndex()
+        self.courses = IntervalIndex()
+
+    def add(self, course_id: int, classroom_id: int, day, start_time: time, end_time: time) -> None:
+        """
+        Indexes a session under its classroom and its course.
+
+        Args:
+            course_id (int): ID of the scheduled course (may be None).
+            classroom_id (int): ID of the assigned classroom (may be None).
+            day (Day): Day of the week.
+            start_time (time): Start time of the session.
+            end_time (time): End time of the session.
+        """
+        start, end = to_minutes(start_time), to_minutes(end_time)
+        if classroom_id is not None:
+            self.classrooms.add((classroom_id, day), start, end)
+        if course_id is not None:
+            self.courses.add((course_id, day), start, end)
+
+    def classroom_conflict(self, classroom_id: int, day, start_time: time, end_time: time) -> bool:
+        """
+        Checks whether the classroom is already booked during the given window.
+
+        Args:
+            classroom_id (int): ID of the classroom.
+            day (Day): Day of the week.
+            start_time (time): Start of the window.
+            end_time (time): End of the window.
+
+        Returns:
+            bool: True if an existing session overlaps the window.
+        """
+        return self.classrooms.overlaps(
+            (classroom_id, day), to_minutes(start_time), to_minutes(end_time))
+
+    def course_conflict(self, course_id: int, day, start_time: time, end_time: time) -> bool:
+        """
+        Checks whether the course is already scheduled during the given window.
+
+        Args:
+            course_id (int): ID of the course.
+            day (Day): Day of the week.
+            start_time (time): Start of the window.
+            end_time (time): End of the window.
+
+        Returns:
+            bool: True if an existing session overlaps the window.
+        """
+        return self.courses.overlaps(
+            (course_id, day), to_minutes(start_time), to_minutes(end_time))
+
@@ -0,0 +1,361 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+import time
+from collections import defaultdict
+from datetime import time as time_of_day
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.cache.invalidation import ALL, subscribe
+from app.models.availability import Availability
+from app.models.classroom import Classroom
+from app.models.course import Course
+from app.models.day import Day
+from app.models.schedule import Schedule
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = SLOTS_PER_DAY * len(Day)
+
+OCCUPANCY_MAX_AGE = float(os.getenv("OCCUPANCY_MAX_AGE", "60"))
+
+INCREMENTAL_ENTITIES = ("schedule", "availability")
+INDEXED_ENTITIES = INCREMENTAL_ENTITIES + ("classroom", "course")
+
+
+def slot_mask(day: Day, start_time: time_of_day, end_time: time_of_day) -> int:
+    """
+    Builds the weekly bitmap of the 5-minute slots covered by a time window.
+
+    Bit ``(day.value - 1) * SLOTS_PER_DAY + slot`` is set for every slot that overlaps
+    the window, so a window that does not start or end on a slot boundary covers the
+    partially used slots as well.
+
+    Args:
+        day (Day): Day of the week.
+        start_time (time): Start of the window.
+        end_time (time): End of the window.
+
+    Returns:
+        int: The bitmap as a Python integer (0 for an empty window).
+    """
+    first = (start_time.hour * 60 + start_time.minute) // SLOT_MINUTES
+    end_minutes = end_time.hour * 60 + end_time.minute + (end_time.second > 0)
+    last = -(-end_minutes // SLOT_MINUTES)
+    if last <= first:
+        return 0
+    offset = (day.value - 1) * SLOTS_PER_DAY
+    return ((1 << (last - first)) - 1) << (offset + first)
+
+
+class OccupancyIndex:
+    """
+    Per-process weekly occupancy bitmaps for classrooms and professors.
+
+    Every classroom and professor gets a ``Day`` x 5-minute bitmap (1,728 bits per week)
+    built from the ``schedule`` and ``availability`` tables, so overlap, free-slot and
+    "who is free at X" questions become bitwise operations instead of SQL queries.
+
+    Repository writes reach :meth:`mark_dirty` through the invalidation bus, from this
+    process or any other; the next :meth:`refresh` re-reads only the changed schedule and
+    availability rows. Changes to classrooms or courses, a bus reconnect, and index entries
+    older than ``OCCUPANCY_MAX_AGE`` seconds (a fallback for missed events) trigger a full
+    rebuild.
+    """
+
+    def __init__(self, max_age: float = OCCUPANCY_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._dirty: Dict[str, Set[int]] = defaultdict(set)
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Clears every bitmap and lookup table.
+        """
+        self._sessions: Dict[int, Tuple[Optional[int], Optional[int], int]] = {}
+        self._availability: Dict[int, Tuple[Optional[int], int]] = {}
+        self._course_professor: Dict[int, int] = {}
+        self._courses_by_professor: Dict[int, Set[int]] = defaultdict(set)
+        self._classrooms: Dict[int, dict] = {}
+        self._classroom_json: Dict[int, bytes] = {}
+        self._by_capacity: List[Tuple[int, int]] = []
+        self._capacities: List[int] = []
+        self._by_classroom: Dict[int, Set[int]] = defaultdict(set)
+        self._by_course: Dict[int, Set[int]] = defaultdict(set)
+        self._availability_by_professor: Dict[int, Set[int]] = defaultdict(set)
+        self._classroom_busy: Dict[int, int] = {}
+        self._professor_busy: Dict[int, int] = {}
+        self._professor_available: Dict[int, int] = {}
+
+    def mark_dirty(self, entity: str, entity_id: Optional[int] = None) -> None:
+        """
+        Records that a row changed, so the next refresh picks it up.
+
+        Args:
+            entity (str): Table name of the changed row (e.g. ``"schedule"``).
+            entity_id (Optional[int]): Primary key of the changed row.
+        """
+        with self._lock:
+            if entity in INCREMENTAL_ENTITIES and entity_id is not None:
+                self._dirty[entity].add(entity_id)
+            else:
+                self._loaded_at = None
+
+    def on_invalidation(self, entity: str, entity_id: Optional[int]) -> None:
+        """
+        Invalidation bus handler: marks the indexed tables dirty and ignores the others.
+
+        Args:
+            entity (str): Table name of the changed row, or ``ALL``.
+            entity_id (Optional[int]): Primary key of the changed row.
+        """
+        if entity == ALL or entity in INDEXED_ENTITIES:
+            self.mark_dirty(entity, entity_id)
+
+    def refresh(self, db: Session) -> None:
+        """
+        Brings the index up to date: a full rebuild on first use, after a structural
+        change or once the entries are older than ``max_age``; otherwise only the dirty
+        schedule and availability rows are re-read.
+
+        Args:
+            db (Session): SQLAlchemy session used to read the changed rows.
+        """
+        with self._lock:
+            if (self._loaded_at is None
+                    or time.monotonic() - self._loaded_at > self.max_age):
+                self._rebuild(db)
+                return
+            schedule_ids = self._dirty.pop("schedule", None)
+            availability_ids = self._dirty.pop("availability", None)
+            if schedule_ids:
+                self._reload_sessions(db, schedule_ids)
+            if availability_ids:
+                self._reload_availability(db, availability_ids)
+
+    def _rebuild(self, db: Session) -> None:
+        """
+        Rebuilds every bitmap from the database.
+        """
+        self._dirty.clear()
+        self._reset()
+
+        for classroom_id, name, capacity, location in db.query(
+                Classroom.classroom_id, Classroom.name, Classroom.capacity, Classroom.location):
+            self._classrooms[classroom_id] = {
+                "classroom_id": classroom_id,
+                "name": name,
+                "capacity": capacity,
+                "location": location,
+            }
+        self._classroom_json = {
+            classroom_id: json.dumps(room).encode() for classroom_id, room in self._classrooms.items()}
+        self._by_capacity = sorted(
+            (room["capacity"], classroom_id) for classroom_id, room in self._classrooms.items())
+        self._capacities = [capacity for capacity, _ in self._by_capacity]
+        for course_id, professor_id in db.query(Course.course_id, Course.professor_id):
+            self._set_course_professor(course_id, professor_id)
+
+        for schedule_id, classroom_id, course_id, day, start_time, end_time in db.query(
+                Schedule.schedule_id, Schedule.classroom_id, Schedule.course_id,
+                Schedule.day, Schedule.start_time, Schedule.end_time):
+            self._add_session(schedule_id, classroom_id, course_id,
+                              slot_mask(day, start_time, end_time))
+
+        for availability_id, professor_id, day, start_time, end_time in db.query(
+                Availability.availability_id, Availability.professor_id,
+                Availability.day, Availability.start_time, Availability.end_time):
+            self._add_availability(availability_id, professor_id,
+                                   slot_mask(day, start_time, end_time))
+
+        for classroom_id in self._by_classroom:
+            self._rebuild_classroom(classroom_id)
+        for professor_id in self._courses_by_professor:
+            self._rebuild_professor_busy(professor_id)
+        for professor_id in self._availability_by_professor:
+            self._rebuild_professor_available(professor_id)
+        self._loaded_at = time.monotonic()
+
+    def _reload_sessions(self, db: Session, schedule_ids: Set[int]) -> None:
+        """
+        Re-reads the given schedule rows and updates the affected bitmaps.
+        """
+        classrooms, professors = set(), set()
+        for schedule_id in schedule_ids:
+            removed = self._remove_session(schedule_id)
+            if removed:
+                classrooms.add(removed[0])
+                professors.add(self._course_professor.get(removed[1]))
+
+        for schedule_id, classroom_id, course_id, professor_id, day, start_time, end_time in (
+                db.query(Schedule.schedule_id, Schedule.classroom_id, Schedule.course_id,
+                         Course.professor_id, Schedule.day, Schedule.start_time,
+                         Schedule.end_time)
+                .outerjoin(Course, Course.course_id == Schedule.course_id)
+                .filter(Schedule.schedule_id.in_(schedule_ids))):
+            if course_id is not None:
+                professors.add(self._set_course_professor(course_id, professor_id))
+            self._add_session(schedule_id, classroom_id, course_id,
+                              slot_mask(day, start_time, end_time))
+            classrooms.add(classroom_id)
+            professors.add(professor_id)
+
+        for classroom_id in classrooms - {None}:
+            self._rebuild_classroom(classroom_id)
+        for professor_id in professors - {None}:
+            self._rebuild_professor_busy(professor_id)
+
+    def _reload_availability(self, db: Session, availability_ids: Set[int]) -> None:
+        """
+        Re-reads the given availability rows and updates the affected bitmaps.
+        """
+        professors = set()
+        for availability_id in availability_ids:
+            removed = self._availability.pop(availability_id, None)
+            if removed:
+                self._availability_by_professor[removed[0]].discard(availability_id)
+                professors.add(removed[0])
+
+        for availability_id, professor_id, day, start_time, end_time in db.query(
+                Availability.availability_id, Availability.professor_id,
+                Availability.day, Availability.start_time, Availability.end_time
+        ).filter(Availability.availability_id.in_(availability_ids)):
+            self._add_availability(availability_id, professor_id,
+                                   slot_mask(day, start_time, end_time))
+            professors.add(professor_id)
+
+        for professor_id in professors - {None}:
+            self._rebuild_professor_available(professor_id)
+
+    def _set_course_professor(self, course_id: int, professor_id: Optional[int]) -> Optional[int]:
+        """
+        Records the professor teaching a course and returns the previous one.
+        """
+        previous = self._course_professor.get(course_id)
+        if previous is not None:
+            self._courses_by_professor[previous].discard(course_id)
+        self._course_professor[course_id] = professor_id
+        if professor_id is not None:
+            self._courses_by_professor[professor_id].add(course_id)
+        return previous
+
+    def _add_session(self, schedule_id: int, classroom_id: Optional[int],
+                     course_id: Optional[int], mask: int) -> None:
+        self._sessions[schedule_id] = (classroom_id, course_id, mask)
+        if classroom_id is not None:
+            self._by_classroom[classroom_id].add(schedule_id)
+        if course_id is not None:
+            self._by_course[course_id].add(schedule_id)
+
+    def _remove_session(self, schedule_id: int) -> Optional[Tuple]:
+        session = self._sessions.pop(schedule_id, None)
+        if session:
+            classroom_id, course_id, _ = session
+            self._by_classroom[classroom_id].discard(schedule_id)
+            self._by_course[course_id].discard(schedule_id)
+        return session
+
+    def _add_availability(self, availability_id: int, professor_id: Optional[int],
+                          mask: int) -> None:
+        self._availability[availability_id] = (professor_id, mask)
+        if professor_id is not None:
+            self._availability_by_professor[professor_id].add(availability_id)
+
+    def _rebuild_classroom(self, classroom_id: int) -> None:
+        mask = 0
+        for schedule_id in self._by_classroom.get(classroom_id, ()):
+            mask |= self._sessions[schedule_id][2]
+        self._classroom_busy[classroom_id] = mask
+
+    def _rebuild_professor_busy(self, professor_id: int) -> None:
+        mask = 0
+        for course_id in self._courses_by_professor.get(professor_id, ()):
+            for schedule_id in self._by_course.get(course_id, ()):
+                mask |= self._sessions[schedule_id][2]
+        self._professor_busy[professor_id] = mask
+
+    def _rebuild_professor_available(self, professor_id: int) -> None:
+        mask = 0
+        for availability_id in self._availability_by_professor.get(professor_id, ()):
+            mask |= self._availability[availability_id][1]
+        self._professor_available[professor_id] = mask
+
+    def classroom_busy(self, classroom_id: int) -> int:
+        """
+        Returns the weekly bitmap of the slots in which the classroom is booked.
+
+        Args:
+            classroom_id (int): ID of the classroom.
+
+        Returns:
+            int: The occupancy bitmap (0 if the classroom has no sessions).
+        """
+        with self._lock:
+            return self._classroom_busy.get(classroom_id, 0)
+
+    def free_classroom_ids(self, mask: int, min_capacity: int = 0) -> List[int]:
+        """
+        Lists the classrooms that hold at least ``min_capacity`` students and have no
+        session overlapping the given slots, smallest classroom first.
+
+        Classrooms are kept sorted by capacity, so the capacity filter is a binary search
+        and only the remaining classrooms are checked against the slot bitmap.
+
+        Args:
+            mask (int): Bitmap of the slots to check (see :func:`slot_mask`).
+            min_capacity (int): Minimum capacity required.
+
+        Returns:
+            List[int]: IDs of the free classrooms.
+        """
+        with self._lock:
+            busy = self._classroom_busy
+            start = bisect_left(self._capacities, min_capacity)
+            return [
+                classroom_id
+                for _, classroom_id in self._by_capacity[start:]
+                if not busy.get(classroom_id, 0) & mask
+            ]
+
+    def classrooms_json(self, classroom_ids: Iterable[int]) -> bytes:
+        """
+        Serializes classrooms as a JSON array from their pre-encoded rows, so large
+        result sets skip per-row model validation and encoding.
+
+        Args:
+            classroom_ids (Iterable[int]): IDs of indexed classrooms.
+
+        Returns:
+            bytes: JSON array of ``classroom_id``, ``name``, ``capacity`` and ``location``.
+        """
+        with self._lock:
+            encoded = self._classroom_json
+            return b"[" + b",".join(encoded[cid] for cid in classroom_ids if cid in encoded) + b"]"
+
+    def free_professor_ids(self, mask: int) -> List[int]:
+        """
+        Lists the professors whose availability covers every given slot and who are not
+        teaching during any of them.
+
+        Args:
+            mask (int): Bitmap of the slots to check (see :func:`slot_mask`).
+
+        Returns:
+            List[int]: IDs of the free professors.
+        """
+        with self._lock:
+            busy = self._professor_busy
+            return [
+                professor_id
+                for professor_id, available in self._professor_available.items()
+                if available & mask == mask and not busy.get(professor_id, 0) & mask
+            ]
+
+
+occupancy = OccupancyIndex()
+subscribe(occupancy.on_invalidation)
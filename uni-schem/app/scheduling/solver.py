@@ -0,0 +1,554 @@
+import multiprocessing
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from app.models.day import Day
+
+HARD_WEIGHT = 1000
+SAME_DAY_PENALTY = 1
+
+
+@dataclass(frozen=True)
+class CourseDemand:
+    """
+    A course that needs sessions placed in the timetable.
+
+    Attributes:
+        course_id (int): ID of the course.
+        professor_id (int): ID of the professor teaching the course.
+        enrollment (int): Number of students enrolled (minimum classroom capacity).
+        sessions (int): Number of weekly sessions to place.
+    """
+    course_id: int
+    professor_id: int
+    enrollment: int
+    sessions: int
+
+
+@dataclass(frozen=True)
+class Room:
+    """
+    A classroom that sessions can be placed in.
+
+    Attributes:
+        classroom_id (int): ID of the classroom.
+        capacity (int): Maximum number of students the classroom can hold.
+    """
+    classroom_id: int
+    capacity: int
+
+
+@dataclass(frozen=True)
+class FixedSession:
+    """
+    An already scheduled session the solver must work around.
+
+    Attributes:
+        course_id (Optional[int]): ID of the scheduled course.
+        professor_id (Optional[int]): ID of the professor teaching the course.
+        classroom_id (Optional[int]): ID of the booked classroom.
+        day (Day): Day of the week.
+        start (int): Start of the session in minutes since midnight.
+        end (int): End of the session in minutes since midnight.
+    """
+    course_id: Optional[int]
+    professor_id: Optional[int]
+    classroom_id: Optional[int]
+    day: Day
+    start: int
+    end: int
+
+
+@dataclass
+class TimetableProblem:
+    """
+    Everything the solver needs, detached from the database.
+
+    Attributes:
+        courses (List[CourseDemand]): Courses to place.
+        rooms (List[Room]): Available classrooms.
+        availability (Dict[int, List[Tuple[Day, int, int]]]): Availability windows
+            (day, start, end in minutes) per professor.
+        conflicts (Dict[int, FrozenSet[int]]): For each course, the courses that share
+            at least one student with it.
+        fixed (List[FixedSession]): Existing sessions to respect.
+        days (List[Day]): Days the solver may use.
+        day_start (int): Earliest session start in minutes since midnight.
+        day_end (int): Latest session end in minutes since midnight.
+        slot_minutes (int): Granularity of session start times.
+        session_minutes (int): Length of each session.
+    """
+    courses: List[CourseDemand]
+    rooms: List[Room]
+    availability: Dict[int, List[Tuple[Day, int, int]]]
+    conflicts: Dict[int, FrozenSet[int]]
+    fixed: List[FixedSession] = field(default_factory=list)
+    days: List[Day] = field(default_factory=lambda: list(Day))
+    day_start: int = 7 * 60
+    day_end: int = 21 * 60
+    slot_minutes: int = 30
+    session_minutes: int = 120
+
+
+@dataclass(frozen=True)
+class Placement:
+    """
+    A session placed by the solver.
+
+    Attributes:
+        course_id (int): ID of the course.
+        classroom_id (int): ID of the assigned classroom.
+        day (Day): Day of the week.
+        start (int): Start of the session in minutes since midnight.
+        end (int): End of the session in minutes since midnight.
+    """
+    course_id: int
+    classroom_id: int
+    day: Day
+    start: int
+    end: int
+
+
+@dataclass
+class Solution:
+    """
+    Result of a solver run.
+
+    Attributes:
+        placements (List[Placement]): Conflict-free placed sessions.
+        unplaced (Dict[int, int]): Number of sessions that could not be placed, per course.
+        penalty (int): Soft-constraint penalty of the placements (lower is better).
+        iterations (int): Local-search iterations performed.
+        restarts (int): Number of independent restarts the solution was chosen from.
+    """
+    placements: List[Placement]
+    unplaced: Dict[int, int]
+    penalty: int
+    iterations: int
+    restarts: int = 1
+
+    @property
+    def score(self) -> Tuple[int, int]:
+        """
+        Ranking key for solutions: fewer unplaced sessions first, then lower penalty.
+
+        Returns:
+            Tuple[int, int]: The (unplaced sessions, penalty) pair.
+        """
+        return sum(self.unplaced.values()), self.penalty
+
+
+class _Search:
+    """
+    Mutable search state: per-day slot occupancy counters plus the current value of every
+    session variable. Times are expressed in grid slots of ``slot_minutes`` and days by
+    their position in ``problem.days``.
+
+    ``clash_use`` counts, for every course, the sessions of *other* courses sharing
+    students with it, so evaluating a candidate time costs O(slots) regardless of how
+    many courses it clashes with.
+    """
+
+    def __init__(self, problem: TimetableProblem, rng: random.Random):
+        self.problem = problem
+        self.rng = rng
+        self.slot = problem.slot_minutes
+        self.length = -(-problem.session_minutes // self.slot)
+        self.days = list(problem.days)
+        self.day_index = {day: position for position, day in enumerate(self.days)}
+        self.courses = {course.course_id: course for course in problem.courses}
+        self.rooms_by_capacity = sorted(problem.rooms, key=lambda room: room.capacity)
+
+        slots_per_day = -(-24 * 60 // self.slot)
+        def week():
+            return [[0] * slots_per_day for _ in self.days]
+        self.room_use: Dict[int, List[List[int]]] = defaultdict(week)
+        self.professor_use: Dict[int, List[List[int]]] = defaultdict(week)
+        self.course_use: Dict[int, List[List[int]]] = defaultdict(week)
+        self.clash_use: Dict[int, List[List[int]]] = defaultdict(week)
+        self.day_use: Dict[int, List[int]] = defaultdict(lambda: [0] * len(self.days))
+        self._block_fixed()
+
+        self.variables: List[int] = []
+        self.domains: List[List[Tuple[int, int]]] = []
+        self.rooms: Dict[int, List[Room]] = {}
+        self._propagate()
+        self.values: List[Optional[Tuple[int, int, int]]] = [None] * len(self.variables)
+
+    @staticmethod
+    def _add(counters: List[int], first: int, last: int, delta: int) -> None:
+        """
+        Adds ``delta`` to ``counters[first:last]``.
+        """
+        for slot in range(first, last):
+            counters[slot] += delta
+
+    def _block_fixed(self) -> None:
+        """
+        Marks the slots covered by existing sessions as used.
+        """
+        for session in self.problem.fixed:
+            day = self.day_index.get(session.day)
+            if day is None:
+                continue
+            first = session.start // self.slot
+            last = -(-session.end // self.slot)
+            if session.classroom_id is not None:
+                self._add(self.room_use[session.classroom_id][day], first, last, 1)
+            if session.professor_id is not None:
+                self._add(self.professor_use[session.professor_id][day], first, last, 1)
+            if session.course_id is not None:
+                self._add(self.course_use[session.course_id][day], first, last, 1)
+                for other in self.problem.conflicts.get(session.course_id, ()):
+                    self._add(self.clash_use[other][day], first, last, 1)
+
+    def _propagate(self) -> None:
+        """
+        Builds the domain of every session from the unary constraints: professor
+        availability, teaching hours and classroom capacity. Sessions whose domain is
+        empty are left out and reported as unplaced.
+        """
+        first = -(-self.problem.day_start // self.slot)
+        last = self.problem.day_end // self.slot - self.length
+
+        for course in self.problem.courses:
+            rooms = [room for room in self.rooms_by_capacity
+                     if room.capacity >= course.enrollment]
+            domain = set()
+            for day, start, end in self.problem.availability.get(course.professor_id, []):
+                if day not in self.day_index:
+                    continue
+                lo = max(first, -(-start // self.slot))
+                hi = min(last, end // self.slot - self.length)
+                domain.update((self.day_index[day], slot) for slot in range(lo, hi + 1))
+            if not rooms or not domain:
+                continue
+            domain = sorted(domain)
+            self.rooms[course.course_id] = rooms
+            for _ in range(course.sessions):
+                self.variables.append(course.course_id)
+                self.domains.append(domain)
+
+    def _apply(self, index: int, delta: int) -> None:
+        """
+        Adds (``delta=1``) or removes (``delta=-1``) a session's current value from
+        the occupancy counters.
+        """
+        day, start, classroom_id = self.values[index]
+        course = self.courses[self.variables[index]]
+        end = start + self.length
+        self._add(self.room_use[classroom_id][day], start, end, delta)
+        self._add(self.professor_use[course.professor_id][day], start, end, delta)
+        self._add(self.course_use[course.course_id][day], start, end, delta)
+        for other in self.problem.conflicts.get(course.course_id, ()):
+            self._add(self.clash_use[other][day], start, end, delta)
+        self.day_use[course.course_id][day] += delta
+
+    def _time_cost(self, course: CourseDemand, day: int, start: int) -> int:
+        """
+        Number of professor, course and student clashes over the given slots,
+        ignoring the room.
+        """
+        end = start + self.length
+        return (sum(self.professor_use[course.professor_id][day][start:end])
+                + sum(self.course_use[course.course_id][day][start:end])
+                + sum(self.clash_use[course.course_id][day][start:end]))
+
+    def _room_cost(self, classroom_id: int, day: int, start: int) -> int:
+        """
+        Number of sessions already using the classroom during the given slots.
+        """
+        return sum(self.room_use[classroom_id][day][start:start + self.length])
+
+    def _best_value(self, index: int, noise: float = 0.0) -> Tuple[int, int, int]:
+        """
+        Finds the cheapest (day, start, classroom) value for an unplaced session,
+        breaking ties at random. Candidate times are visited from the cheapest time cost
+        up, so classrooms are only searched while a time can still beat the best value
+        found; the smallest free classroom that fits is preferred. With probability
+        ``noise`` a random time is taken instead, which lets the local search escape
+        plateaus.
+        """
+        course = self.courses[self.variables[index]]
+        rooms = self.rooms[course.course_id]
+        domain = self.domains[index]
+        if self.rng.random() < noise:
+            domain = [self.rng.choice(domain)]
+
+        day_use = self.day_use[course.course_id]
+        costed = sorted(
+            (self._time_cost(course, day, start) * HARD_WEIGHT
+             + day_use[day] * SAME_DAY_PENALTY, self.rng.random(), day, start)
+            for day, start in domain
+        )
+
+        best_cost, best = None, []
+        for cost, _, day, start in costed:
+            if best_cost is not None and cost > best_cost:
+                break
+            room_cost, room_id = None, None
+            for room in rooms:
+                used = self._room_cost(room.classroom_id, day, start)
+                if room_cost is None or used < room_cost:
+                    room_cost, room_id = used, room.classroom_id
+                if used == 0:
+                    break
+            cost += room_cost * HARD_WEIGHT
+            if best_cost is None or cost < best_cost:
+                best_cost, best = cost, [(day, start, room_id)]
+            elif cost == best_cost:
+                best.append((day, start, room_id))
+        return self.rng.choice(best)
+
+    def _move(self, index: int, noise: float = 0.0) -> None:
+        """
+        Moves a session to its cheapest value (placing it if it has none yet).
+        """
+        if self.values[index] is not None:
+            self._apply(index, -1)
+        self.values[index] = self._best_value(index, noise)
+        self._apply(index, 1)
+
+    def construct(self) -> None:
+        """
+        Greedy construction: sessions with the smallest domains go first (MRV), ties
+        broken by the number of courses they clash with, each taking its cheapest value
+        given the sessions placed before it.
+        """
+        conflicts = self.problem.conflicts
+        order = sorted(range(len(self.variables)), key=lambda i: (
+            len(self.domains[i]),
+            -len(conflicts.get(self.variables[i], ())),
+            self.rng.random(),
+        ))
+        for index in order:
+            self._move(index)
+
+    def conflicts_of(self, index: int) -> int:
+        """
+        Number of hard-constraint violations a placed session is involved in. The
+        session's own contribution (one use per slot of its room, professor and course)
+        is subtracted from the counters.
+        """
+        day, start, classroom_id = self.values[index]
+        course = self.courses[self.variables[index]]
+        cost = self._time_cost(course, day, start)
+        cost += self._room_cost(classroom_id, day, start)
+        return cost - 3 * self.length
+
+    def conflicted(self) -> List[int]:
+        """
+        Indexes of the sessions currently involved in a hard-constraint violation.
+        """
+        return [i for i in range(len(self.variables)) if self.conflicts_of(i)]
+
+    def repair(
+        self, max_iterations: int, deadline: Optional[float] = None, noise: float = 0.1
+    ) -> int:
+        """
+        Min-conflicts local search: repeatedly moves a random conflicted session to its
+        cheapest value until no violations remain or the budget is exhausted. The list of
+        conflicted sessions is refreshed periodically rather than after every move.
+
+        Args:
+            max_iterations (int): Maximum number of moves.
+            deadline (Optional[float]): ``time.time()`` value at which to stop.
+            noise (float): Probability of a random-walk move.
+
+        Returns:
+            int: Number of iterations performed.
+        """
+        iterations = 0
+        rescan_every = max(50, len(self.variables) // 4)
+        conflicted = self.conflicted()
+        since_rescan = 0
+        while conflicted and iterations < max_iterations:
+            if deadline is not None and iterations % 20 == 0 and time.time() >= deadline:
+                break
+            position = self.rng.randrange(len(conflicted))
+            index = conflicted[position]
+            if not self.conflicts_of(index):
+                conflicted[position] = conflicted[-1]
+                conflicted.pop()
+            else:
+                self._move(index, noise)
+                iterations += 1
+            since_rescan += 1
+            if not conflicted or since_rescan >= rescan_every:
+                conflicted = self.conflicted()
+                since_rescan = 0
+        return iterations
+
+    def extract(self, iterations: int) -> Solution:
+        """
+        Drops the sessions still in conflict (worst first) so the returned placements
+        are conflict-free, then builds the solution.
+        """
+        placed = set(range(len(self.variables)))
+        conflicted = set(self.conflicted())
+        while conflicted:
+            worst = max(conflicted, key=self.conflicts_of)
+            self._apply(worst, -1)
+            placed.discard(worst)
+            conflicted = {i for i in conflicted if i != worst and self.conflicts_of(i)}
+
+        unplaced: Dict[int, int] = defaultdict(int)
+        placed_per_course: Dict[int, int] = defaultdict(int)
+        placements = []
+        for index in sorted(placed):
+            course_id = self.variables[index]
+            day, start, classroom_id = self.values[index]
+            placed_per_course[course_id] += 1
+            placements.append(Placement(
+                course_id=course_id,
+                classroom_id=classroom_id,
+                day=self.days[day],
+                start=start * self.slot,
+                end=start * self.slot + self.problem.session_minutes,
+            ))
+        for course in self.problem.courses:
+            missing = course.sessions - placed_per_course[course.course_id]
+            if missing:
+                unplaced[course.course_id] = missing
+
+        penalty = sum(max(count - 1, 0)
+                      for per_day in self.day_use.values() for count in per_day)
+        return Solution(placements, dict(unplaced), penalty, iterations)
+
+
+def solve(
+    problem: TimetableProblem,
+    max_iterations: int = 20000,
+    seed: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Solution:
+    """
+    Builds a conflict-free timetable for the problem's courses.
+
+    Constraint propagation narrows every session to the times its professor is available
+    and the classrooms large enough for its enrollment; a most-constrained-first greedy
+    pass produces an initial timetable, and min-conflicts local search repairs classroom,
+    professor and student clashes. Sessions that remain in conflict are reported as
+    unplaced rather than returned.
+
+    Args:
+        problem (TimetableProblem): The courses, rooms and constraints.
+        max_iterations (int): Maximum number of local-search moves.
+        seed (Optional[int]): Seed for the random tie-breaking, for reproducible runs.
+        deadline (Optional[float]): ``time.time()`` value at which to stop searching.
+
+    Returns:
+        Solution: The placed sessions and the courses left (partially) unplaced.
+    """
+    search = _Search(problem, random.Random(seed))
+    search.construct()
+    iterations = search.repair(max_iterations, deadline)
+    return search.extract(iterations)
+
+
+def worker_limit() -> int:
+    """
+    Returns the worker processes a solve started through the API may use:
+    ``SOLVER_WORKERS``, or the number of CPUs when unset, and never more than the CPUs.
+
+    Returns:
+        int: The maximum number of worker processes.
+    """
+    cpus = os.cpu_count() or 1
+    return max(1, min(int(os.getenv("SOLVER_WORKERS", "0")) or cpus, cpus))
+
+
+def solve_multistart(
+    problem: TimetableProblem,
+    restarts: int = 1,
+    workers: Optional[int] = None,
+    max_iterations: int = 20000,
+    seed: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> Solution:
+    """
+    Runs independent randomized restarts of :func:`solve` and keeps the best-scoring
+    solution (fewest unplaced sessions, then lowest penalty).
+
+    Restarts run across a ``ProcessPoolExecutor`` when more than one worker is used.
+    With a time budget, every restart stops its local search at a shared wall-clock
+    deadline and restarts that have not started by then are cancelled, so the call
+    returns shortly after the budget expires.
+
+    Args:
+        problem (TimetableProblem): The courses, rooms and constraints.
+        restarts (int): Number of independent restarts.
+        workers (Optional[int]): Worker processes, capped at ``restarts``. Defaults to
+            :func:`worker_limit`.
+        max_iterations (int): Maximum number of local-search moves per restart.
+        seed (Optional[int]): Base seed; restart ``i`` uses ``seed + i``.
+        time_budget (Optional[float]): Wall-clock budget in seconds for the whole solve.
+
+    Returns:
+        Solution: The best solution found.
+    """
+    deadline = time.time() + time_budget if time_budget is not None else None
+    base_seed = seed if seed is not None else random.randrange(2 ** 32)
+    if workers is None:
+        workers = worker_limit()
+    workers = max(1, min(workers, restarts))
+
+    if workers == 1:
+        best = None
+        completed = 0
+        for offset in range(restarts):
+            if completed and deadline is not None and time.time() >= deadline:
+                break
+            solution = solve(problem, max_iterations, base_seed + offset, deadline)
+            completed += 1
+            if best is None or solution.score < best.score:
+                best = solution
+        best.restarts = completed
+        return best
+
+    best = None
+    completed = 0
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        pending = {
+            executor.submit(solve, problem, max_iterations, base_seed + offset, deadline)
+            for offset in range(restarts)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                solution = future.result()
+                completed += 1
+                if best is None or solution.score < best.score:
+                    best = solution
+            if deadline is not None and time.time() >= deadline:
+                pending = {future for future in pending if not future.cancel()}
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    best.restarts = completed
+    return best
+
+
+def course_conflicts(pairs: Sequence[Tuple[int, int]]) -> Dict[int, FrozenSet[int]]:
+    """
+    Builds the course conflict map from pairs of courses that share a student.
+
+    Args:
+        pairs (Sequence[Tuple[int, int]]): Course ID pairs with at least one common student.
+
+    Returns:
+        Dict[int, FrozenSet[int]]: The courses each course must not overlap with.
+    """
+    conflicts: Dict[int, set] = defaultdict(set)
+    for first, second in pairs:
+        if first != second:
+            conflicts[first].add(second)
+            conflicts[second].add(first)
+    return {course_id: frozenset(others) for course_id, others in conflicts.items()}
@@ -0,0 +1,312 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.cache.invalidation import ALL, subscribe
+from app.models.classroom import Classroom
+from app.models.course import Course
+from app.models.professor import Professor
+from app.models.schedule import Schedule
+from app.models.student_course import StudentCourse
+
+TIMETABLE_MAX_AGE = float(os.getenv("TIMETABLE_MAX_AGE", "300"))
+TIMETABLE_MAX_VIEWS = int(os.getenv("TIMETABLE_MAX_VIEWS", "20000"))
+
+# Tables the projection is built from, in the order pending changes are applied.
+SOURCE_ENTITIES = ("professor", "classroom", "course", "schedule", "student_course")
+
+
+class TimetableProjection:
+    """
+    Per-process projection of the weekly timetable of every student, professor and
+    classroom.
+
+    The schedule, course, classroom, professor and enrollment rows are kept in memory,
+    keyed by the IDs the three views join on, and each view is rendered to JSON on first
+    request and memoized (the ``TIMETABLE_MAX_VIEWS`` most recently used). Writes reach
+    the projection through the invalidation bus: the next :meth:`refresh` re-reads only
+    the changed rows and drops the views they appear in. A bus reconnect, or entries
+    older than ``TIMETABLE_MAX_AGE`` seconds (a fallback for missed events), trigger a
+    full rebuild.
+    """
+
+    def __init__(self, max_age: float = TIMETABLE_MAX_AGE, max_views: int = TIMETABLE_MAX_VIEWS):
+        self.max_age = max_age
+        self.max_views = max_views
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._dirty: Dict[str, Set[int]] = defaultdict(set)
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Clears every row and rendered view.
+        """
+        self._sessions: Dict[int, tuple] = {}
+        self._courses: Dict[int, Tuple[str, str, Optional[int]]] = {}
+        self._classrooms: Dict[int, Tuple[str, Optional[str]]] = {}
+        self._professors: Dict[int, str] = {}
+        self._enrollments: Dict[int, Tuple[int, int]] = {}
+        self._by_course: Dict[int, Set[int]] = defaultdict(set)
+        self._by_classroom: Dict[int, Set[int]] = defaultdict(set)
+        self._courses_by_professor: Dict[int, Set[int]] = defaultdict(set)
+        self._courses_by_student: Dict[int, Set[int]] = defaultdict(set)
+        self._enrollments_by_course: Dict[int, Set[int]] = defaultdict(set)
+        self._views: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+
+    def on_invalidation(self, entity: str, entity_id: Optional[int]) -> None:
+        """
+        Invalidation bus handler: records the changed rows of the source tables.
+
+        Args:
+            entity (str): Table name of the changed row, or ``ALL``.
+            entity_id (Optional[int]): Primary key of the changed row.
+        """
+        if entity != ALL and entity not in SOURCE_ENTITIES:
+            return
+        with self._lock:
+            if entity == ALL or entity_id is None:
+                self._loaded_at = None
+            else:
+                self._dirty[entity].add(entity_id)
+
+    def refresh(self, db: Session) -> None:
+        """
+        Brings the projection up to date: a full rebuild on first use, after a bus
+        reconnect or once it is older than ``max_age``; otherwise only the changed rows
+        are re-read.
+
+        Args:
+            db (Session): SQLAlchemy session used to read the changed rows.
+        """
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age:
+                self._rebuild(db)
+                return
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, defaultdict(set)
+            if dirty.get("professor"):
+                self._reload_professors(db, dirty["professor"])
+            if dirty.get("classroom"):
+                self._reload_classrooms(db, dirty["classroom"])
+            if dirty.get("course"):
+                self._reload_courses(db, dirty["course"])
+            if dirty.get("schedule"):
+                self._reload_sessions(db, dirty["schedule"])
+            if dirty.get("student_course"):
+                self._reload_enrollments(db, dirty["student_course"])
+
+    def _rebuild(self, db: Session) -> None:
+        """
+        Rebuilds the projection from the database.
+        """
+        self._dirty.clear()
+        self._reset()
+        self._professors = dict(db.query(Professor.professor_id, Professor.name))
+        self._classrooms = {
+            classroom_id: (name, location) for classroom_id, name, location in db.query(
+                Classroom.classroom_id, Classroom.name, Classroom.location)}
+        for course_id, name, code, professor_id in db.query(
+                Course.course_id, Course.name, Course.code, Course.professor_id):
+            self._add_course(course_id, name, code, professor_id)
+        for row in db.query(Schedule.schedule_id, Schedule.course_id, Schedule.classroom_id,
+                            Schedule.day, Schedule.start_time, Schedule.end_time):
+            self._add_session(*row)
+        for relation_id, student_id, course_id in db.query(
+                StudentCourse.student_course_id, StudentCourse.student_id,
+                StudentCourse.course_id):
+            self._add_enrollment(relation_id, student_id, course_id)
+        self._loaded_at = time.monotonic()
+
+    def _reload_professors(self, db: Session, professor_ids: Set[int]) -> None:
+        for professor_id in professor_ids:
+            self._professors.pop(professor_id, None)
+            self._drop_professor(professor_id)
+        self._professors.update(db.query(Professor.professor_id, Professor.name).filter(
+            Professor.professor_id.in_(professor_ids)))
+
+    def _reload_classrooms(self, db: Session, classroom_ids: Set[int]) -> None:
+        schedule_ids = set()
+        for classroom_id in classroom_ids:
+            self._classrooms.pop(classroom_id, None)
+            schedule_ids |= self._by_classroom.get(classroom_id, set())
+        for classroom_id, name, location in db.query(
+                Classroom.classroom_id, Classroom.name, Classroom.location
+        ).filter(Classroom.classroom_id.in_(classroom_ids)):
+            self._classrooms[classroom_id] = (name, location)
+        # Deleting a classroom clears the classroom of its sessions.
+        self._reload_sessions(db, schedule_ids)
+
+    def _reload_courses(self, db: Session, course_ids: Set[int]) -> None:
+        schedule_ids, relation_ids = set(), set()
+        for course_id in course_ids:
+            self._remove_course(course_id)
+            schedule_ids |= self._by_course.get(course_id, set())
+            relation_ids |= self._enrollments_by_course.get(course_id, set())
+        for course_id, name, code, professor_id in db.query(
+                Course.course_id, Course.name, Course.code, Course.professor_id
+        ).filter(Course.course_id.in_(course_ids)):
+            self._add_course(course_id, name, code, professor_id)
+        # Deleting a course clears the course of its sessions and deletes its enrollments.
+        self._reload_sessions(db, schedule_ids)
+        self._reload_enrollments(db, relation_ids)
+
+    def _reload_sessions(self, db: Session, schedule_ids: Set[int]) -> None:
+        if not schedule_ids:
+            return
+        for schedule_id in schedule_ids:
+            self._remove_session(schedule_id)
+        for row in db.query(
+                Schedule.schedule_id, Schedule.course_id, Schedule.classroom_id,
+                Schedule.day, Schedule.start_time, Schedule.end_time
+        ).filter(Schedule.schedule_id.in_(schedule_ids)):
+            self._add_session(*row)
+
+    def _reload_enrollments(self, db: Session, relation_ids: Set[int]) -> None:
+        if not relation_ids:
+            return
+        for relation_id in relation_ids:
+            self._remove_enrollment(relation_id)
+        for relation_id, student_id, course_id in db.query(
+                StudentCourse.student_course_id, StudentCourse.student_id,
+                StudentCourse.course_id
+        ).filter(StudentCourse.student_course_id.in_(relation_ids)):
+            self._add_enrollment(relation_id, student_id, course_id)
+
+    def _add_course(self, course_id: int, name: str, code: str,
+                    professor_id: Optional[int]) -> None:
+        self._courses[course_id] = (name, code, professor_id)
+        if professor_id is not None:
+            self._courses_by_professor[professor_id].add(course_id)
+        self._drop_course(course_id)
+
+    def _remove_course(self, course_id: int) -> None:
+        self._drop_course(course_id)
+        course = self._courses.pop(course_id, None)
+        if course and course[2] is not None:
+            self._courses_by_professor[course[2]].discard(course_id)
+
+    def _add_session(self, schedule_id: int, course_id: Optional[int],
+                     classroom_id: Optional[int], day, start_time, end_time) -> None:
+        self._sessions[schedule_id] = (course_id, classroom_id, day, start_time, end_time)
+        if course_id is not None:
+            self._by_course[course_id].add(schedule_id)
+        if classroom_id is not None:
+            self._by_classroom[classroom_id].add(schedule_id)
+        self._drop_session(course_id, classroom_id)
+
+    def _remove_session(self, schedule_id: int) -> None:
+        session = self._sessions.pop(schedule_id, None)
+        if session:
+            course_id, classroom_id = session[:2]
+            self._by_course.get(course_id, set()).discard(schedule_id)
+            self._by_classroom.get(classroom_id, set()).discard(schedule_id)
+            self._drop_session(course_id, classroom_id)
+
+    def _add_enrollment(self, relation_id: int, student_id: int, course_id: int) -> None:
+        self._enrollments[relation_id] = (student_id, course_id)
+        self._courses_by_student[student_id].add(course_id)
+        self._enrollments_by_course[course_id].add(relation_id)
+        self._views.pop(("student", student_id), None)
+
+    def _remove_enrollment(self, relation_id: int) -> None:
+        enrollment = self._enrollments.pop(relation_id, None)
+        if enrollment:
+            student_id, course_id = enrollment
+            self._courses_by_student[student_id].discard(course_id)
+            self._enrollments_by_course[course_id].discard(relation_id)
+            self._views.pop(("student", student_id), None)
+
+    def _drop_session(self, course_id: Optional[int], classroom_id: Optional[int]) -> None:
+        """
+        Drops the rendered views a session appears in.
+        """
+        if course_id is not None:
+            self._drop_course(course_id)
+        if classroom_id is not None:
+            self._views.pop(("classroom", classroom_id), None)
+
+    def _drop_course(self, course_id: int) -> None:
+        """
+        Drops the rendered views of a course's students, professor and classrooms.
+        """
+        for relation_id in self._enrollments_by_course.get(course_id, ()):
+            self._views.pop(("student", self._enrollments[relation_id][0]), None)
+        course = self._courses.get(course_id)
+        if course and course[2] is not None:
+            self._views.pop(("professor", course[2]), None)
+        for schedule_id in self._by_course.get(course_id, ()):
+            self._views.pop(("classroom", self._sessions[schedule_id][1]), None)
+
+    def _drop_professor(self, professor_id: int) -> None:
+        """
+        Drops every rendered view that shows the professor's name.
+        """
+        for course_id in self._courses_by_professor.get(professor_id, ()):
+            self._drop_course(course_id)
+
+    def _entry(self, schedule_id: int) -> dict:
+        course_id, classroom_id, day, start_time, end_time = self._sessions[schedule_id]
+        course_name, course_code, professor_id = self._courses.get(course_id, (None, None, None))
+        classroom_name, location = self._classrooms.get(classroom_id, (None, None))
+        return {
+            "schedule_id": schedule_id,
+            "day": day.value,
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "course_id": course_id,
+            "course_name": course_name,
+            "course_code": course_code,
+            "classroom_id": classroom_id,
+            "classroom_name": classroom_name,
+            "location": location,
+            "professor_id": professor_id,
+            "professor_name": self._professors.get(professor_id),
+        }
+
+    def _schedule_ids(self, owner: str, owner_id: int) -> Set[int]:
+        if owner == "classroom":
+            return self._by_classroom.get(owner_id, set())
+        if owner == "professor":
+            course_ids = self._courses_by_professor.get(owner_id, ())
+        else:
+            course_ids = self._courses_by_student.get(owner_id, ())
+        return set().union(*(self._by_course.get(course_id, ()) for course_id in course_ids))
+
+    def render(self, owner: str, owner_id: int) -> bytes:
+        """
+        Returns the weekly timetable of a student, professor or classroom as a JSON array,
+        ordered by day and start time. Call :meth:`refresh` first.
+
+        Args:
+            owner (str): ``"student"``, ``"professor"`` or ``"classroom"``.
+            owner_id (int): ID of the student, professor or classroom.
+
+        Returns:
+            bytes: JSON array of sessions with their course, classroom and professor.
+        """
+        key = (owner, owner_id)
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                return view
+            sessions = sorted(
+                self._schedule_ids(owner, owner_id),
+                key=lambda schedule_id: (self._sessions[schedule_id][2].value,
+                                         *self._sessions[schedule_id][3:], schedule_id))
+            view = json.dumps([self._entry(schedule_id) for schedule_id in sessions]).encode()
+            self._views[key] = view
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+            return view
+
+
+timetables = TimetableProjection()
+subscribe(timetables.on_invalidation)
@@ -1,6 +1,9 @@
+from typing import ClassVar, Optional, Tuple
 from datetime import time
 from pydantic import BaseModel
 from app.models.day import Day
+from app.schemas.expand import ExpandableOut
+from app.schemas.professor import ProfessorOut
 
 
 class AvailabilityBase(BaseModel):
@@ -55,3 +58,14 @@ class AvailabilityOut(AvailabilityBase):
 
     class Config:
         orm_mode = True
+
+
+class AvailabilityExpandedOut(AvailabilityOut, ExpandableOut):
+    """
+    Schema for availability list items, with the professor embedded on request.
+
+    Adds:
+        professor (Optional[ProfessorOut]): The professor the availability belongs to, with ``expand=professor``.
+    """
+    expandable: ClassVar[Tuple[str, ...]] = ("professor",)
+    professor: Optional[ProfessorOut] = None
@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import ClassVar, Optional, Tuple
 from pydantic import BaseModel, constr
+from app.schemas.expand import ExpandableOut
+from app.schemas.professor import ProfessorOut
 
 
 class CourseBase(BaseModel):
@@ -54,3 +56,14 @@ class CourseOut(CourseBase):
 
     class Config:
         orm_mode = True
+
+
+class CourseExpandedOut(CourseOut, ExpandableOut):
+    """
+    Schema for course list items, with the professor embedded on request.
+
+    Adds:
+        professor (Optional[ProfessorOut]): The professor teaching the course, with ``expand=professor``.
+    """
+    expandable: ClassVar[Tuple[str, ...]] = ("professor",)
+    professor: Optional[ProfessorOut] = None
@@ -0,0 +1,22 @@
+from typing import Any, ClassVar, Tuple
+from pydantic import BaseModel, SerializerFunctionWrapHandler, model_serializer
+
+
+class ExpandableOut(BaseModel):
+    """
+    Base of the list item schemas whose related rows are embedded only on request
+    (``?expand=``). Relationships that were not requested are left unloaded and read as
+    None; they are omitted from the response instead of being returned as null.
+
+    Attributes:
+        expandable (ClassVar[Tuple[str, ...]]): Names of the nested relationship fields.
+    """
+    expandable: ClassVar[Tuple[str, ...]] = ()
+
+    @model_serializer(mode="wrap")
+    def _omit_unexpanded(self, handler: SerializerFunctionWrapHandler) -> Any:
+        data = handler(self)
+        for name in self.expandable:
+            if data.get(name) is None:
+                data.pop(name, None)
+        return data
@@ -0,0 +1,20 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    Schema for one page of a keyset-paginated list.
+
+    Attributes:
+        items (List[T]): The rows of this page, ordered by ID.
+        next_cursor (Optional[int]): Value to pass as ``after`` to fetch the next page,
+            or None if this is the last page.
+    """
+    items: List[T]
+    next_cursor: Optional[int] = None
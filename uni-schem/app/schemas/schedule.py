@@ -1,6 +1,12 @@
 from datetime import time
-from pydantic import BaseModel
+from typing import ClassVar, List, Optional, Tuple
+from pydantic import BaseModel, confloat, conint, conlist
 from app.models.day import Day
+from app.schemas.expand import ExpandableOut
+from app.schemas.course import CourseOut
+from app.schemas.classroom import ClassroomOut
+
+BULK_SCHEDULE_LIMIT = 10000
 
 
 class ScheduleBase(BaseModel):
@@ -59,3 +65,136 @@ class ScheduleOut(ScheduleBase):
 
     class Config:
         orm_mode = True
+
+
+class ScheduleExpandedOut(ScheduleOut, ExpandableOut):
+    """
+    Schema for schedule list items, with the course and classroom embedded on request.
+
+    Adds:
+        course (Optional[CourseOut]): The scheduled course, with ``expand=course``.
+        classroom (Optional[ClassroomOut]): The assigned classroom, with ``expand=classroom``.
+    """
+    expandable: ClassVar[Tuple[str, ...]] = ("course", "classroom")
+    course: Optional[CourseOut] = None
+    classroom: Optional[ClassroomOut] = None
+
+
+class ScheduleBulkCreate(BaseModel):
+    """
+    Schema for importing many schedule entries at once.
+
+    Attributes:
+        schedules (List[ScheduleCreate]): The sessions to register (1-10000 per request).
+    """
+    schedules: conlist(ScheduleCreate, min_length=1, max_length=BULK_SCHEDULE_LIMIT)
+
+
+class ScheduleBulkResult(ScheduleBase):
+    """
+    Outcome of one row of a bulk schedule import.
+
+    Attributes:
+        index (int): Position of the row in the request.
+        status_code (int): 201 if created, 404 if the course or classroom does not exist,
+            400 if the times are invalid or the session overlaps another one.
+        schedule_id (Optional[int]): ID of the created schedule.
+        detail (Optional[str]): Error message for rejected rows.
+    """
+    index: int
+    status_code: int
+    schedule_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class ScheduleBulkOut(BaseModel):
+    """
+    Schema for returning the result of a bulk schedule import.
+
+    Attributes:
+        created (int): Number of sessions inserted.
+        rejected (int): Number of rows rejected.
+        results (List[ScheduleBulkResult]): Per-row outcome, in request order.
+    """
+    created: int
+    rejected: int
+    results: List[ScheduleBulkResult]
+
+
+class ScheduleSolveRequest(BaseModel):
+    """
+    Parameters for the automatic timetable solver.
+
+    Attributes:
+        course_ids (Optional[List[int]]): Courses to place. Defaults to every course that
+            has no schedule yet; courses that are already scheduled are left untouched.
+        sessions_per_course (int): Number of weekly sessions to place per course (1-6).
+        session_minutes (int): Length of each session in minutes (30-360).
+        slot_minutes (int): Granularity of session start times in minutes (5-120).
+        day_start (time): Earliest time a session may start.
+        day_end (time): Latest time a session may end.
+        days (List[Day]): Days of the week the solver may use.
+        max_iterations (int): Maximum number of local-search moves per restart.
+        restarts (int): Independent randomized restarts; the best timetable is kept (1-256).
+        workers (Optional[int]): Worker processes for the restarts. Defaults to, and is
+            capped at, the ``SOLVER_WORKERS`` setting (or the number of CPUs) and never
+            exceeds the number of CPUs.
+        time_budget_seconds (Optional[float]): Wall-clock budget for the whole solve.
+        seed (Optional[int]): Random seed, for reproducible timetables.
+        dry_run (bool): If true, the timetable is returned without being stored.
+    """
+    course_ids: Optional[List[int]] = None
+    sessions_per_course: conint(ge=1, le=6) = 2
+    session_minutes: conint(ge=30, le=360) = 120
+    slot_minutes: conint(ge=5, le=120) = 30
+    day_start: time = time(7, 0)
+    day_end: time = time(21, 0)
+    days: List[Day] = list(Day)
+    max_iterations: conint(ge=0) = 20000
+    restarts: conint(ge=1, le=256) = 1
+    workers: Optional[conint(ge=1)] = None
+    time_budget_seconds: Optional[confloat(gt=0)] = None
+    seed: Optional[int] = None
+    dry_run: bool = False
+
+
+class SolvedSchedule(ScheduleBase):
+    """
+    A session produced by the timetable solver.
+
+    Adds:
+        schedule_id (Optional[int]): ID of the stored schedule, or None on a dry run.
+    """
+    schedule_id: Optional[int] = None
+
+
+class UnplacedCourse(BaseModel):
+    """
+    A course the solver could not fully place.
+
+    Attributes:
+        course_id (int): ID of the course.
+        missing_sessions (int): Number of sessions left unplaced.
+    """
+    course_id: int
+    missing_sessions: int
+
+
+class ScheduleSolveOut(BaseModel):
+    """
+    Result of the automatic timetable solver.
+
+    Attributes:
+        schedules (List[SolvedSchedule]): The conflict-free sessions placed.
+        unplaced (List[UnplacedCourse]): Courses with sessions that could not be placed.
+        penalty (int): Soft-constraint penalty (sessions of a course sharing a day).
+        iterations (int): Local-search iterations performed by the best restart.
+        restarts (int): Number of restarts completed.
+        stored (bool): Whether the sessions were stored.
+    """
+    schedules: List[SolvedSchedule]
+    unplaced: List[UnplacedCourse]
+    penalty: int
+    iterations: int
+    restarts: int
+    stored: bool
@@ -0,0 +1,129 @@
+"""
+Direct serialization of ORM rows into the JSON of the ``*Out`` response schemas.
+
+FastAPI validates every returned row into its ``response_model`` (``from_attributes``),
+dumps the models back into dicts and encodes them with ``json.dumps``. For rows read
+from the database that work is redundant: the values were validated on write and the
+``*Out`` validators only check them. :class:`RowSerializer` reads the schema's fields
+straight off the rows and encodes them with orjson, producing the same document:
+the same keys in the same order, ``Day`` as its value, times as ``HH:MM:SS``, and the
+unexpanded relationships of :class:`~app.schemas.expand.ExpandableOut` left out.
+"""
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, get_args
+import orjson
+from pydantic import BaseModel
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """
+    Returns the model class of a nested schema field (``X`` or ``Optional[X]``), or None
+    for a plain value field.
+    """
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+class RowSerializer:
+    """
+    Turns ORM rows into the dicts and JSON bytes of one response schema, without
+    building the pydantic models.
+
+    Args:
+        schema (Type[BaseModel]): The response schema; its fields must be attributes of
+            the rows, and nested schema fields relationships.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        expandable = set(getattr(schema, "expandable", ()))
+        self._names: Tuple[str, ...] = tuple(schema.model_fields)
+        self._nested: List[Tuple[str, "RowSerializer", bool]] = []
+        for name, field in schema.model_fields.items():
+            nested = _nested_schema(field.annotation)
+            if nested is not None:
+                self._nested.append((name, serializer_for(nested), name in expandable))
+        self._flat = not self._nested
+        getter = attrgetter(*self._names)
+        # attrgetter returns a bare value, not a 1-tuple, for a single name.
+        self._get: Callable[[Any], tuple] = (
+            getter if len(self._names) > 1 else lambda row: (getter(row),))
+
+    def dump(self, row: Any) -> Dict[str, Any]:
+        """
+        Returns the response dict of one row.
+
+        Args:
+            row (Any): The ORM instance.
+
+        Returns:
+            Dict[str, Any]: Field names mapped to the row's values.
+        """
+        data = dict(zip(self._names, self._get(row)))
+        if self._flat:
+            return data
+        for name, serializer, expandable in self._nested:
+            related = data[name]
+            if related is not None:
+                data[name] = serializer.dump(related)
+            elif expandable:
+                del data[name]
+        return data
+
+    def dump_many(self, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        Returns the response dicts of several rows.
+
+        Args:
+            rows (Iterable[Any]): The ORM instances.
+
+        Returns:
+            List[Dict[str, Any]]: One dict per row, in order.
+        """
+        if self._flat:
+            names, get = self._names, self._get
+            return [dict(zip(names, get(row))) for row in rows]
+        return [self.dump(row) for row in rows]
+
+    def encode_list(self, rows: Iterable[Any]) -> bytes:
+        """
+        Encodes rows as a JSON array, as returned with ``response_model=List[schema]``.
+
+        Args:
+            rows (Iterable[Any]): The ORM instances.
+
+        Returns:
+            bytes: The JSON document.
+        """
+        return orjson.dumps(self.dump_many(rows))
+
+    def encode_page(self, page: Dict[str, Any]) -> bytes:
+        """
+        Encodes a page built by :func:`~app.repositories.pagination.build_page`, as
+        returned with ``response_model=Page[schema]``.
+
+        Args:
+            page (Dict[str, Any]): ``items`` (ORM instances) and ``next_cursor``.
+
+        Returns:
+            bytes: The JSON document.
+        """
+        return orjson.dumps({"items": self.dump_many(page["items"]),
+                             "next_cursor": page["next_cursor"]})
+
+
+@lru_cache(maxsize=None)
+def serializer_for(schema: Type[BaseModel]) -> RowSerializer:
+    """
+    Returns the serializer of a response schema, built once per schema.
+
+    Args:
+        schema (Type[BaseModel]): The response schema.
+
+    Returns:
+        RowSerializer: The shared serializer.
+    """
+    return RowSerializer(schema)
@@ -1,5 +1,10 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import ClassVar, List, Optional, Tuple
+from pydantic import BaseModel, conlist
+from app.schemas.expand import ExpandableOut
+from app.schemas.student import StudentOut
+from app.schemas.course import CourseOut
+
+BULK_ENROLLMENT_LIMIT = 50000
 
 
 class StudentCourseBase(BaseModel):
@@ -46,3 +51,59 @@ class StudentCourseOut(StudentCourseBase):
 
     class Config:
         orm_mode = True
+
+
+class StudentCourseExpandedOut(StudentCourseOut, ExpandableOut):
+    """
+    Schema for enrollment list items, with the student and course embedded on request.
+
+    Adds:
+        student (Optional[StudentOut]): The enrolled student, with ``expand=student``.
+        course (Optional[CourseOut]): The course, with ``expand=course``.
+    """
+    expandable: ClassVar[Tuple[str, ...]] = ("student", "course")
+    student: Optional[StudentOut] = None
+    course: Optional[CourseOut] = None
+
+
+class StudentCourseBulkCreate(BaseModel):
+    """
+    Schema for enrolling many students at once.
+
+    Attributes:
+        enrollments (List[StudentCourseCreate]): The enrollments to register
+            (1-50000 per request).
+    """
+    enrollments: conlist(StudentCourseCreate, min_length=1,
+                         max_length=BULK_ENROLLMENT_LIMIT)
+
+
+class StudentCourseBulkResult(StudentCourseBase):
+    """
+    Outcome of one row of a bulk enrollment.
+
+    Attributes:
+        index (int): Position of the row in the request.
+        status_code (int): 201 if created, 404 if the student or course does not exist,
+            400 if the enrollment already exists or is repeated in the request.
+        student_course_id (Optional[int]): ID of the created enrollment.
+        detail (Optional[str]): Error message for rejected rows.
+    """
+    index: int
+    status_code: int
+    student_course_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class StudentCourseBulkOut(BaseModel):
+    """
+    Schema for returning the result of a bulk enrollment.
+
+    Attributes:
+        created (int): Number of enrollments inserted.
+        rejected (int): Number of rows rejected.
+        results (List[StudentCourseBulkResult]): Per-row outcome, in request order.
+    """
+    created: int
+    rejected: int
+    results: List[StudentCourseBulkResult]
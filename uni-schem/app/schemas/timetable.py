@@ -0,0 +1,36 @@
+from datetime import time
+from typing import Optional
+from pydantic import BaseModel
+from app.models.day import Day
+
+
+class TimetableEntry(BaseModel):
+    """
+    One weekly session in a student, professor or classroom timetable.
+
+    Attributes:
+        schedule_id (int): ID of the schedule entry.
+        day (Day): Day of the week of the session.
+        start_time (time): Start time of the session.
+        end_time (time): End time of the session.
+        course_id (Optional[int]): ID of the course taught, if any.
+        course_name (Optional[str]): Name of the course.
+        course_code (Optional[str]): Code of the course.
+        classroom_id (Optional[int]): ID of the classroom, if assigned.
+        classroom_name (Optional[str]): Name of the classroom.
+        location (Optional[str]): Building or location of the classroom.
+        professor_id (Optional[int]): ID of the professor teaching the course.
+        professor_name (Optional[str]): Name of the professor.
+    """
+    schedule_id: int
+    day: Day
+    start_time: time
+    end_time: time
+    course_id: Optional[int] = None
+    course_name: Optional[str] = None
+    course_code: Optional[str] = None
+    classroom_id: Optional[int] = None
+    classroom_name: Optional[str] = None
+    location: Optional[str] = None
+    professor_id: Optional[int] = None
+    professor_name: Optional[str] = None
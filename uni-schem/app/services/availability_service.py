@@ -1,10 +1,14 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.availability import Availability
 from app.schemas.availability import AvailabilityCreate, AvailabilityUpdate
 from app.repositories import availability_repository, professor_repository
 from app.models.professor import Professor
+from app.repositories.pagination import build_page
+from app.repositories.expand import parse_expand
+from app.schemas.page import DEFAULT_PAGE_SIZE
+from app.services import export_service
 
 
 def register_availability(db: Session, data: AvailabilityCreate) -> Availability:
@@ -73,17 +77,39 @@ def get_availabilities_by_professor_id(db: Session, professor_id: int) -> List[A
     return availability_repository.get_availabilities_by_professor_id(db, professor_id)
 
 
-def list_availabilities(db: Session) -> List[Availability]:
+def list_availabilities(
+    db: Session, after: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+    expand: Optional[str] = None
+) -> dict:
     """
-    Retrieves all availability entries in the system.
+    Retrieves all availability entries in the system, one page at a time.
 
     Args:
         db (Session): Database session.
+        after (Optional[int]): Cursor returned by the previous page (None for the first page).
+        limit (int): Maximum number of rows in the page.
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (e.g. ``"professor"``).
 
     Returns:
-        List[Availability]: List containing all availability records.
+        dict: The page ``items`` and the ``next_cursor`` (None on the last page).
+
+    Raises:
+        HTTPException: If a relationship cannot be expanded (400).
+    """
+    rows = availability_repository.get_all_availabilities(
+        db, after, limit + 1, parse_expand(Availability, expand))
+    return build_page(rows, limit, "availability_id")
+
+
+def export_availabilities() -> Iterator[bytes]:
+    """
+    Exports all availability entries as newline-delimited JSON.
+
+    Returns:
+        Iterator[bytes]: NDJSON chunks, one object per row, ordered by ID.
     """
-    return availability_repository.get_all_availabilities(db)
+    return export_service.stream_ndjson(availability_repository.stream_availabilities)
 
 
 def modify_availability(
@@ -1,14 +1,20 @@
+from datetime import time
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.classroom import Classroom
+from app.models.day import Day
 from app.schemas.classroom import ClassroomCreate, ClassroomUpdate
 from app.repositories import classroom_repository
+from app.scheduling.occupancy import occupancy, slot_mask
+from app.repositories.pagination import build_page
+from app.schemas.page import DEFAULT_PAGE_SIZE
 from fastapi import HTTPException, status
 
 
 def register_classroom(db: Session, data: ClassroomCreate) -> Classroom:
     """
-    Registers a new classroom after validating the name is unique and capacity is valid.
+    Registers a new classroom after validating the capacity; name uniqueness is enforced
+    by the database.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -16,14 +22,10 @@ def register_classroom(db: Session, data: ClassroomCreate) -> Classroom:
 
     Returns:
         Classroom: The created classroom.
-    """
-    existing_classroom_by_name = db.query(Classroom).filter(
-        Classroom.name == data.name).first()
-    if existing_classroom_by_name:
-        raise HTTPException(
-            status_code=400, detail="A classroom with this name already exists."
-        )
 
+    Raises:
+        HTTPException: If the capacity is out of range or the name is taken (400).
+    """
     if data.capacity < 5 or data.capacity > 40:
         raise HTTPException(
             status_code=400, detail="Classroom capacity must be between 5 and 40."
@@ -37,6 +39,8 @@ def register_classroom(db: Session, data: ClassroomCreate) -> Classroom:
 
     try:
         return classroom_repository.create_classroom(db, new_classroom)
+    except HTTPException as e:
+        raise e
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -59,17 +63,22 @@ def get_classroom(db: Session, classroom_id: int) -> Optional[Classroom]:
     return classroom_repository.get_classroom_by_id(db, classroom_id)
 
 
-def list_classrooms(db: Session) -> List[Classroom]:
+def list_classrooms(
+    db: Session, after: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> dict:
     """
-    Retrieves a list of all classrooms in the system.
+    Retrieves a list of all classrooms in the system, one page at a time.
 
     Args:
         db (Session): Database session.
+        after (Optional[int]): Cursor returned by the previous page (None for the first page).
+        limit (int): Maximum number of rows in the page.
 
     Returns:
-        List[Classroom]: A list of all classroom records.
+        dict: The page ``items`` and the ``next_cursor`` (None on the last page).
     """
-    return classroom_repository.get_all_classrooms(db)
+    rows = classroom_repository.get_all_classrooms(db, after, limit + 1)
+    return build_page(rows, limit, "classroom_id")
 
 
 def get_classrooms_by_capacity(db: Session, capacity: int) -> List[Classroom]:
@@ -86,6 +95,42 @@ def get_classrooms_by_capacity(db: Session, capacity: int) -> List[Classroom]:
     return classroom_repository.get_classroom_by_capacity(db, capacity)
 
 
+def find_free_classrooms(
+    db: Session, day: Day, start_time: time, end_time: time, min_capacity: int = 0
+) -> bytes:
+    """
+    Finds the classrooms with enough capacity and no session overlapping a time window.
+
+    Served from the in-memory occupancy index instead of scanning the schedule table;
+    only rows changed since the last call are read from the database. The result is
+    returned already encoded, since serializing thousands of rooms per request would
+    dominate the response time.
+
+    Args:
+        db (Session): Database session.
+        day (Day): Day of the week.
+        start_time (time): Start of the window.
+        end_time (time): End of the window.
+        min_capacity (int): Minimum number of students the classroom must hold.
+
+    Returns:
+        bytes: JSON array of the free classrooms, smallest capacity first.
+
+    Raises:
+        HTTPException: If the start time is not before the end time (400).
+    """
+    if start_time >= end_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Start time must be before end time."
+        )
+
+    occupancy.refresh(db)
+    classroom_ids = occupancy.free_classroom_ids(
+        slot_mask(day, start_time, end_time), min_capacity)
+    return occupancy.classrooms_json(classroom_ids)
+
+
 def modify_classroom(db: Session, classroom_id: int, updates: ClassroomUpdate) -> Classroom:
     """
     Updates the details of an existing classroom, ensuring name uniqueness
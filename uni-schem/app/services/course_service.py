@@ -5,12 +5,15 @@ from app.schemas.course import CourseCreate, CourseUpdate
 from app.repositories import course_repository
 from fastapi import HTTPException, status
 from app.repositories import professor_repository
+from app.repositories.pagination import build_page
+from app.repositories.expand import parse_expand
+from app.schemas.page import DEFAULT_PAGE_SIZE
 
 
 def register_course(db: Session, data: CourseCreate) -> Course:
     """
-    Registers a new course, ensuring the course code is unique.
-    Course names can be repeated.
+    Registers a new course after validating the professor exists and the course
+    name is unique. Code uniqueness is enforced by the database.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -20,18 +23,19 @@ def register_course(db: Session, data: CourseCreate) -> Course:
         Course: The newly created course.
 
     Raises:
-        HTTPException: If a course with the same code already exists (400),
-        or for unexpected internal errors (500).
+        HTTPException: If the professor does not exist (404), if a course with the same
+        name or code already exists (400), or for unexpected internal errors (500).
     """
-    if data.code:
-        existing_course_by_code = db.query(Course).filter(
-            Course.code == data.code
-        ).first()
-        if existing_course_by_code:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"A course with code '{data.code}' already exists."
-            )
+    professor = professor_repository.get_professor_by_id(db, data.professor_id)
+    if not professor:
+        raise HTTPException(status_code=404, detail="Professor not found")
+
+    existing_course_by_name = course_repository.get_course_by_name(db, data.name)
+    if existing_course_by_name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Course with this name already exists."
+        )
 
     new_course = Course(
         name=data.name,
@@ -80,17 +84,29 @@ def get_course_by_name(db: Session, name: str) -> Optional[Course]:
     return course_repository.get_course_by_name(db, name)
 
 
-def list_courses(db: Session) -> List[Course]:
+def list_courses(
+    db: Session, after: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+    expand: Optional[str] = None
+) -> dict:
     """
-    Retrieves all courses in the system.
+    Retrieves all courses in the system, one page at a time.
 
     Args:
         db (Session): SQLAlchemy session.
+        after (Optional[int]): Cursor returned by the previous page (None for the first page).
+        limit (int): Maximum number of rows in the page.
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (e.g. ``"professor"``).
 
     Returns:
-        List[Course]: A list of all courses.
+        dict: The page ``items`` and the ``next_cursor`` (None on the last page).
+
+    Raises:
+        HTTPException: If a relationship cannot be expanded (400).
     """
-    return course_repository.get_all_courses(db)
+    rows = course_repository.get_all_courses(
+        db, after, limit + 1, parse_expand(Course, expand))
+    return build_page(rows, limit, "course_id")
 
 
 def get_courses_by_professor_id(db: Session, professor_id: int) -> List[Course]:
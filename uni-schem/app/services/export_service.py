@@ -0,0 +1,61 @@
+import json
+import os
+from datetime import date, time
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from app.db.database import get_sessionmaker
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+
+def _encode(value: Any) -> Any:
+    """
+    Converts the column types JSON does not know about (``Day`` and times) into the same
+    representation the API responses use.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: A JSON-serializable value.
+
+    Raises:
+        TypeError: If the value has an unsupported type.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stream_ndjson(fetch: Callable[[Session, int], Iterable[Row]]) -> Iterator[bytes]:
+    """
+    Streams rows as newline-delimited JSON, one object per row.
+
+    The rows come from a server-side cursor read ``EXPORT_BATCH_SIZE`` rows at a time and
+    are encoded straight from the column tuples, so memory stays bounded by one batch
+    whatever the table size. The generator opens its own session because request-scoped
+    sessions are closed before a streaming response body is sent.
+
+    Args:
+        fetch (Callable[[Session, int], Iterable[Row]]): Repository function returning
+            the rows for a session and a batch size.
+
+    Yields:
+        bytes: Chunks of up to ``EXPORT_BATCH_SIZE`` NDJSON lines.
+    """
+    db = get_sessionmaker()()
+    try:
+        lines = []
+        for row in fetch(db, EXPORT_BATCH_SIZE):
+            lines.append(json.dumps(row._asdict(), default=_encode))
+            if len(lines) >= EXPORT_BATCH_SIZE:
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+    finally:
+        db.close()
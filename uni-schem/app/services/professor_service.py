@@ -1,16 +1,22 @@
+from datetime import time
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.models.day import Day
 from app.models.professor import Professor
 from app.schemas.professor import ProfessorCreate, ProfessorUpdate
 from app.repositories import professor_repository
+from app.repositories.pagination import build_page
+from app.scheduling.occupancy import occupancy, slot_mask
+from app.schemas.page import DEFAULT_PAGE_SIZE
 
 
 def register_professor(db: Session, data: ProfessorCreate) -> Professor:
     """
-    Registers a new professor in the system, validating uniqueness of email,
-    phone number, and DNI. Rolls back the transaction if an error occurs.
+    Registers a new professor in the system. Uniqueness of email, phone number and DNI
+    is enforced by the database, so the insert is a single statement and concurrent
+    duplicate requests cannot both succeed.
 
     Args:
         db (Session): The database session.
@@ -26,32 +32,6 @@ def register_professor(db: Session, data: ProfessorCreate) -> Professor:
             - If a professor with the same DNI already exists.
             - If a database error occurs during the creation process.
     """
-    existing_professor_email = db.query(Professor).filter(
-        Professor.email == data.email).first()
-    if existing_professor_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A professor with this email already exists."
-        )
-
-    if data.phone:
-        existing_professor_phone = db.query(Professor).filter(
-            Professor.phone == data.phone).first()
-        if existing_professor_phone:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A professor with this phone number already exists."
-            )
-
-    if data.dni:
-        existing_professor_dni = db.query(Professor).filter(
-            Professor.dni == data.dni).first()
-        if existing_professor_dni:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A professor with this DNI already exists."
-            )
-
     new_professor = Professor(
         name=data.name,
         email=data.email,
@@ -59,18 +39,7 @@ def register_professor(db: Session, data: ProfessorCreate) -> Professor:
         dni=data.dni
     )
 
-    try:
-        db.add(new_professor)
-        db.commit()
-        db.refresh(new_professor)
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred while creating the professor: {str(e)}"
-        )
-
-    return new_professor
+    return professor_repository.create_professor(db, new_professor)
 
 
 def get_professor(db: Session, professor_id: int) -> Optional[Professor]:
@@ -87,17 +56,53 @@ def get_professor(db: Session, professor_id: int) -> Optional[Professor]:
     return professor_repository.get_professor_by_id(db, professor_id)
 
 
-def list_professors(db: Session) -> List[Professor]:
+def list_professors(
+    db: Session, after: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> dict:
     """
-    Retrieves all professors registered in the system.
+    Retrieves all professors registered in the system, one page at a time.
 
     Args:
         db (Session): SQLAlchemy session.
+        after (Optional[int]): Cursor returned by the previous page (None for the first page).
+        limit (int): Maximum number of rows in the page.
 
     Returns:
-        List[Professor]: A list of all professor records.
+        dict: The page ``items`` and the ``next_cursor`` (None on the last page).
     """
-    return professor_repository.get_all_professors(db)
+    rows = professor_repository.get_all_professors(db, after, limit + 1)
+    return build_page(rows, limit, "professor_id")
+
+
+def find_free_professors(db: Session, day: Day, start_time: time, end_time: time) -> List[Professor]:
+    """
+    Finds the professors whose availability covers a time window and who teach no
+    session overlapping it.
+
+    Answered from the in-memory occupancy index; only the professor rows of the result
+    are read from the database.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        day (Day): Day of the week.
+        start_time (time): Start of the window.
+        end_time (time): End of the window.
+
+    Returns:
+        List[Professor]: The free professors, ordered by ID.
+
+    Raises:
+        HTTPException: If the start time is not before the end time (400).
+    """
+    if start_time >= end_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Start time must be before end time."
+        )
+
+    occupancy.refresh(db)
+    professor_ids = occupancy.free_professor_ids(slot_mask(day, start_time, end_time))
+    return professor_repository.get_professors_by_ids(db, professor_ids)
 
 
 def get_professor_by_dni(db: Session, dni: str) -> Optional[Professor]:
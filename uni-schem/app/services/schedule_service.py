@@ -1,10 +1,20 @@
-from typing import List, Optional
+from datetime import time
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.schedule import Schedule
-from app.schemas.schedule import ScheduleCreate, ScheduleUpdate
+from app.schemas.schedule import (ScheduleBulkCreate, ScheduleCreate, ScheduleUpdate,
+                                  ScheduleSolveRequest, ScheduleSolveOut, SolvedSchedule,
+                                  UnplacedCourse)
 from app.repositories import schedule_repository
-from app.repositories import course_repository, classroom_repository
+from app.repositories import (course_repository, classroom_repository,
+                              availability_repository, student_course_repository)
+from app.scheduling import solver
+from app.scheduling.interval_index import to_minutes
+from app.repositories.pagination import build_page
+from app.repositories.expand import parse_expand
+from app.schemas.page import DEFAULT_PAGE_SIZE
+from app.services import export_service
 
 
 def register_schedule(db: Session, data: ScheduleCreate) -> Schedule:
@@ -36,27 +46,22 @@ def register_schedule(db: Session, data: ScheduleCreate) -> Schedule:
             detail="Classroom not found"
         )
 
-    existing_schedule_for_course = db.query(Schedule).filter(
-        Schedule.course_id == data.course_id,
-        Schedule.day == data.day,
-        Schedule.start_time == data.start_time,
-        Schedule.end_time == data.end_time
-    ).first()
+    if data.start_time >= data.end_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Start time must be before end time."
+        )
 
-    if existing_schedule_for_course:
+    index = schedule_repository.load_schedule_index(
+        db, data.day, [data.classroom_id], [data.course_id])
+
+    if index.course_conflict(data.course_id, data.day, data.start_time, data.end_time):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Course is already scheduled at the same time."
         )
 
-    existing_schedule_in_classroom = db.query(Schedule).filter(
-        Schedule.classroom_id == data.classroom_id,
-        Schedule.day == data.day,
-        Schedule.start_time == data.start_time,
-        Schedule.end_time == data.end_time
-    ).first()
-
-    if existing_schedule_in_classroom:
+    if index.classroom_conflict(data.classroom_id, data.day, data.start_time, data.end_time):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Classroom is already booked at this time."
@@ -72,6 +77,78 @@ def register_schedule(db: Session, data: ScheduleCreate) -> Schedule:
     return schedule_repository.create_schedule(db, new_schedule)
 
 
+def register_schedules(db: Session, data: ScheduleBulkCreate) -> dict:
+    """
+    Imports many sessions at once. Courses and classrooms are validated with one IN query
+    each, and the existing sessions of every referenced course and classroom are loaded
+    once into an in-memory interval index. Rows are then checked in request order against
+    that index, which also receives every accepted row, so overlaps with the database and
+    within the batch are both detected (the earlier row wins). The accepted rows are
+    inserted in a single transaction; rejected rows are reported instead of aborting it.
+
+    Args:
+        db (Session): SQLAlchemy session for interacting with the database.
+        data (ScheduleBulkCreate): The sessions to import.
+
+    Returns:
+        dict: Number of ``created`` and ``rejected`` rows, and per-row ``results``.
+    """
+    rows = data.schedules
+    courses = course_repository.get_existing_course_ids(
+        db, {row.course_id for row in rows})
+    classrooms = classroom_repository.get_existing_classroom_ids(
+        db, {row.classroom_id for row in rows})
+    index = schedule_repository.load_schedule_index(db, None, classrooms, courses)
+
+    results, accepted = [], []
+    for position, row in enumerate(rows):
+        result = {"index": position, **row.model_dump()}
+        if row.course_id not in courses:
+            result.update(status_code=404, detail="Course not found")
+        elif row.classroom_id not in classrooms:
+            result.update(status_code=404, detail="Classroom not found")
+        elif row.start_time >= row.end_time:
+            result.update(status_code=400, detail="Start time must be before end time.")
+        elif index.course_conflict(row.course_id, row.day, row.start_time, row.end_time):
+            result.update(status_code=400,
+                          detail="Course is already scheduled at the same time.")
+        elif index.classroom_conflict(row.classroom_id, row.day, row.start_time, row.end_time):
+            result.update(status_code=400,
+                          detail="Classroom is already booked at this time.")
+        else:
+            result.update(status_code=201)
+            index.add(row.course_id, row.classroom_id, row.day, row.start_time, row.end_time)
+            accepted.append(result)
+        results.append(result)
+
+    try:
+        schedule_ids = schedule_repository.create_schedules(db, [
+            Schedule(
+                course_id=result["course_id"],
+                classroom_id=result["classroom_id"],
+                day=result["day"],
+                start_time=result["start_time"],
+                end_time=result["end_time"],
+            )
+            for result in accepted
+        ])
+    except Exception as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while importing the schedules."
+        ) from exc
+
+    for result, schedule_id in zip(accepted, schedule_ids):
+        result["schedule_id"] = schedule_id
+
+    return {
+        "created": len(accepted),
+        "rejected": len(results) - len(accepted),
+        "results": results,
+    }
+
+
 def get_schedule(db: Session, schedule_id: int) -> Optional[Schedule]:
     """
     Retrieves a schedule by its unique ID.
@@ -86,24 +163,48 @@ def get_schedule(db: Session, schedule_id: int) -> Optional[Schedule]:
     return schedule_repository.get_schedule_by_id(db, schedule_id)
 
 
-def list_schedules(db: Session) -> List[Schedule]:
+def list_schedules(
+    db: Session, after: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+    expand: Optional[str] = None
+) -> dict:
     """
-    Retrieves all schedules stored in the system.
+    Retrieves all schedules stored in the system, one page at a time.
 
     Args:
         db (Session): SQLAlchemy session.
+        after (Optional[int]): Cursor returned by the previous page (None for the first page).
+        limit (int): Maximum number of rows in the page.
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (e.g. ``"course,classroom"``).
 
     Returns:
-        List[Schedule]: A list of all schedules.
+        dict: The page ``items`` and the ``next_cursor`` (None on the last page).
+
+    Raises:
+        HTTPException: If a relationship cannot be expanded (400).
     """
-    return schedule_repository.get_all_schedules(db)
+    rows = schedule_repository.get_all_schedules(
+        db, after, limit + 1, parse_expand(Schedule, expand))
+    return build_page(rows, limit, "schedule_id")
+
+
+def export_schedules() -> Iterator[bytes]:
+    """
+    Exports all schedule entries as newline-delimited JSON.
+
+    Returns:
+        Iterator[bytes]: NDJSON chunks, one object per row, ordered by ID.
+    """
+    return export_service.stream_ndjson(schedule_repository.stream_schedules)
 
 
 def modify_schedule(
     db: Session, schedule_id: int, updates: ScheduleUpdate
 ) -> Optional[Schedule]:
     """
-    Updates an existing schedule's details.
+    Updates an existing schedule's details, validating the resulting session the way
+    :func:`register_schedule` validates a new one; the session itself is left out of the
+    conflict check.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -112,10 +213,52 @@ def modify_schedule(
 
     Returns:
         Optional[Schedule]: The updated schedule if found and modified, else None.
+
+    Raises:
+        HTTPException: If the new course or classroom does not exist, or if the updated
+        session is invalid or overlaps another one.
     """
-    return schedule_repository.update_schedule(
-        db, schedule_id, updates.dict(exclude_unset=True)
-    )
+    schedule = schedule_repository.get_schedule_by_id(db, schedule_id)
+    if not schedule:
+        return None
+
+    changes = updates.model_dump(exclude_unset=True)
+    course_id = changes.get("course_id", schedule.course_id)
+    classroom_id = changes.get("classroom_id", schedule.classroom_id)
+    day = changes.get("day", schedule.day)
+    start_time = changes.get("start_time", schedule.start_time)
+    end_time = changes.get("end_time", schedule.end_time)
+
+    if course_id != schedule.course_id and not course_repository.get_course_by_id(db, course_id):
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    if (classroom_id is not None and classroom_id != schedule.classroom_id
+            and not classroom_repository.get_classroom_by_id(db, classroom_id)):
+        raise HTTPException(status_code=404, detail="Classroom not found")
+
+    if start_time >= end_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Start time must be before end time."
+        )
+
+    index = schedule_repository.load_schedule_index(
+        db, day, [classroom_id], [course_id], exclude_id=schedule_id)
+
+    if index.course_conflict(course_id, day, start_time, end_time):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Course is already scheduled at the same time."
+        )
+
+    if (classroom_id is not None
+            and index.classroom_conflict(classroom_id, day, start_time, end_time)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Classroom is already booked at this time."
+        )
+
+    return schedule_repository.update_schedule(db, schedule_id, changes)
 
 
 def remove_schedule(db: Session, schedule_id: int) -> bool:
@@ -158,3 +301,152 @@ def get_schedules_by_classroom_id(db: Session, classroom_id: int) -> List[Schedu
         List[Schedule]: A list of schedules for the specified classroom.
     """
     return schedule_repository.get_schedules_by_classroom_id(db, classroom_id)
+
+
+def _to_time(minutes: int) -> time:
+    """
+    Converts minutes since midnight into a time of day.
+
+    Args:
+        minutes (int): Minutes since midnight.
+
+    Returns:
+        time: The corresponding time of day.
+    """
+    return time(minutes // 60, minutes % 60)
+
+
+def build_timetable_problem(db: Session, request: ScheduleSolveRequest) -> solver.TimetableProblem:
+    """
+    Loads courses, classrooms, professor availability, enrollments and existing schedules
+    into a solver problem. Courses that already have schedule entries are not placed
+    again; their sessions are treated as fixed.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        request (ScheduleSolveRequest): Solver parameters.
+
+    Returns:
+        solver.TimetableProblem: The problem to solve.
+
+    Raises:
+        HTTPException: If the time window is invalid (400) or a requested course does
+        not exist (404).
+    """
+    if request.day_start >= request.day_end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="day_start must be before day_end."
+        )
+
+    courses = course_repository.get_all_courses(db)
+    if request.course_ids is not None:
+        requested = set(request.course_ids)
+        courses = [course for course in courses if course.course_id in requested]
+        missing = requested - {course.course_id for course in courses}
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Courses not found: {sorted(missing)}"
+            )
+
+    scheduled = schedule_repository.get_scheduled_course_ids(db)
+    courses = [course for course in courses if course.course_id not in scheduled]
+    course_ids = [course.course_id for course in courses]
+    enrollment = student_course_repository.get_enrollment_counts(db, course_ids)
+
+    availability = {}
+    for window in availability_repository.get_all_availabilities(db):
+        availability.setdefault(window.professor_id, []).append(
+            (window.day, to_minutes(window.start_time), to_minutes(window.end_time)))
+
+    fixed = [
+        solver.FixedSession(course_id, professor_id, classroom_id, day,
+                            to_minutes(start_time), to_minutes(end_time))
+        for course_id, professor_id, classroom_id, day, start_time, end_time
+        in schedule_repository.get_sessions_with_professor(db)
+    ]
+
+    return solver.TimetableProblem(
+        courses=[
+            solver.CourseDemand(
+                course_id=course.course_id,
+                professor_id=course.professor_id,
+                enrollment=enrollment.get(course.course_id, 0),
+                sessions=request.sessions_per_course,
+            )
+            for course in courses
+        ],
+        rooms=[
+            solver.Room(classroom.classroom_id, classroom.capacity)
+            for classroom in classroom_repository.get_all_classrooms(db)
+        ],
+        availability=availability,
+        conflicts=solver.course_conflicts(
+            student_course_repository.get_course_pairs_sharing_students(db, course_ids)),
+        fixed=fixed,
+        days=request.days,
+        day_start=to_minutes(request.day_start),
+        day_end=to_minutes(request.day_end),
+        slot_minutes=request.slot_minutes,
+        session_minutes=request.session_minutes,
+    )
+
+
+def solve_schedules(db: Session, request: ScheduleSolveRequest) -> ScheduleSolveOut:
+    """
+    Generates a conflict-free timetable for the unscheduled courses and stores it,
+    unless the request is a dry run.
+
+    The solver respects professor availability, classroom capacity against the number
+    of enrolled students, and clashes between courses that share students, as well as
+    the sessions that are already scheduled.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        request (ScheduleSolveRequest): Solver parameters.
+
+    Returns:
+        ScheduleSolveOut: The placed sessions and the courses that could not be fully placed.
+    """
+    problem = build_timetable_problem(db, request)
+    # Clients may ask for fewer workers than configured, never for more.
+    limit = solver.worker_limit()
+    solution = solver.solve_multistart(
+        problem,
+        restarts=request.restarts,
+        workers=min(request.workers or limit, limit),
+        max_iterations=request.max_iterations,
+        seed=request.seed,
+        time_budget=request.time_budget_seconds,
+    )
+
+    schedules = [
+        SolvedSchedule(
+            course_id=placement.course_id,
+            classroom_id=placement.classroom_id,
+            day=placement.day,
+            start_time=_to_time(placement.start),
+            end_time=_to_time(placement.end),
+        )
+        for placement in solution.placements
+    ]
+
+    if not request.dry_run and schedules:
+        schedule_ids = schedule_repository.create_schedules(db, [
+            Schedule(**item.model_dump(exclude={"schedule_id"})) for item in schedules
+        ])
+        for item, schedule_id in zip(schedules, schedule_ids):
+            item.schedule_id = schedule_id
+
+    return ScheduleSolveOut(
+        schedules=schedules,
+        unplaced=[
+            UnplacedCourse(course_id=course_id, missing_sessions=missing)
+            for course_id, missing in sorted(solution.unplaced.items())
+        ],
+        penalty=solution.penalty,
+        iterations=solution.iterations,
+        restarts=solution.restarts,
+        stored=not request.dry_run and bool(schedules),
+    )
@@ -1,15 +1,21 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.models.student_course import StudentCourse
-from app.schemas.student_course import StudentCourseCreate
+from app.schemas.student_course import StudentCourseBulkCreate, StudentCourseCreate
 from app.repositories import student_course_repository, student_repository, course_repository
+from app.repositories.pagination import build_page
+from app.repositories.expand import parse_expand
+from app.schemas.page import DEFAULT_PAGE_SIZE
+from app.services import export_service
+from app.db.errors import integrity_http_exception
 
 
 def register_student_course(db: Session, data: StudentCourseCreate) -> StudentCourse:
     """
-    Registers a new student-course enrollment after validating the student and course existence,
-    and checking for duplicate enrollments.
+    Registers a new student-course enrollment after validating the student and course existence.
+    Duplicate enrollments are rejected by the database's unique constraint.
 
     Args:
         db (Session): SQLAlchemy session object.
@@ -26,15 +32,6 @@ def register_student_course(db: Session, data: StudentCourseCreate) -> StudentCo
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
 
-    existing_relation = student_course_repository.get_student_course_by_student_and_course(
-        db, data.student_id, data.course_id
-    )
-    if existing_relation:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Student is already enrolled in this course."
-        )
-
     new_relation = StudentCourse(
         student_id=data.student_id,
         course_id=data.course_id
@@ -43,6 +40,71 @@ def register_student_course(db: Session, data: StudentCourseCreate) -> StudentCo
     return student_course_repository.create_student_course(db, new_relation)
 
 
+def register_student_courses(db: Session, data: StudentCourseBulkCreate) -> dict:
+    """
+    Registers many enrollments at once with set-based validation: one IN query per
+    referenced table, one query for the existing enrollments and a single executemany
+    insert, all in one transaction. Invalid rows are reported instead of aborting the batch.
+
+    Args:
+        db (Session): SQLAlchemy session object.
+        data (StudentCourseBulkCreate): The enrollments to register.
+
+    Returns:
+        dict: Number of ``created`` and ``rejected`` rows, and per-row ``results``.
+    """
+    pairs = [(row.student_id, row.course_id) for row in data.enrollments]
+    students = student_repository.get_existing_student_ids(
+        db, {student_id for student_id, _ in pairs})
+    courses = course_repository.get_existing_course_ids(
+        db, {course_id for _, course_id in pairs})
+    existing = student_course_repository.get_existing_enrollments(
+        db, [(s, c) for s, c in pairs if s in students and c in courses])
+
+    results, seen, to_insert = [], set(), []
+    for index, (student_id, course_id) in enumerate(pairs):
+        result = {"index": index, "student_id": student_id, "course_id": course_id}
+        if student_id not in students:
+            result.update(status_code=404, detail="Student not found")
+        elif course_id not in courses:
+            result.update(status_code=404, detail="Course not found")
+        elif (student_id, course_id) in existing:
+            result.update(status_code=400,
+                          detail="Student is already enrolled in this course.")
+        elif (student_id, course_id) in seen:
+            result.update(status_code=400,
+                          detail="Enrollment is repeated in this request.")
+        else:
+            result.update(status_code=201)
+            seen.add((student_id, course_id))
+            to_insert.append((student_id, course_id))
+        results.append(result)
+
+    try:
+        created = student_course_repository.create_student_courses(db, to_insert)
+    except IntegrityError as exc:
+        db.rollback()
+        raise integrity_http_exception(
+            exc, student_course_repository.ENROLLMENT_MESSAGES) from exc
+    except Exception as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while registering the enrollments."
+        ) from exc
+
+    for result in results:
+        if result["status_code"] == 201:
+            result["student_course_id"] = created.get(
+                (result["student_id"], result["course_id"]))
+
+    return {
+        "created": len(to_insert),
+        "rejected": len(results) - len(to_insert),
+        "results": results,
+    }
+
+
 def get_student_course(db: Session, relation_id: int) -> Optional[StudentCourse]:
     """
     Retrieves a student-course enrollment by its unique ID.
@@ -57,17 +119,39 @@ def get_student_course(db: Session, relation_id: int) -> Optional[StudentCourse]
     return student_course_repository.get_student_course_by_id(db, relation_id)
 
 
-def list_student_courses(db: Session) -> List[StudentCourse]:
+def list_student_courses(
+    db: Session, after: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+    expand: Optional[str] = None
+) -> dict:
     """
-    Retrieves all existing student-course enrollments.
+    Retrieves all existing student-course enrollments, one page at a time.
 
     Args:
         db (Session): SQLAlchemy session object.
+        after (Optional[int]): Cursor returned by the previous page (None for the first page).
+        limit (int): Maximum number of rows in the page.
+        expand (Optional[str]): Comma-separated relationships to embed in each row
+            (e.g. ``"student,course"``).
+
+    Returns:
+        dict: The page ``items`` and the ``next_cursor`` (None on the last page).
+
+    Raises:
+        HTTPException: If a relationship cannot be expanded (400).
+    """
+    rows = student_course_repository.get_all_student_courses(
+        db, after, limit + 1, parse_expand(StudentCourse, expand))
+    return build_page(rows, limit, "student_course_id")
+
+
+def export_student_courses() -> Iterator[bytes]:
+    """
+    Exports all student-course enrollments as newline-delimited JSON.
 
     Returns:
-        List[StudentCourse]: A list of all student-course relationships stored in the database.
+        Iterator[bytes]: NDJSON chunks, one object per row, ordered by ID.
     """
-    return student_course_repository.get_all_student_courses(db)
+    return export_service.stream_ndjson(student_course_repository.stream_student_courses)
 
 
 def get_students_by_course_id(db: Session, course_id: int) -> List[StudentCourse]:
@@ -1,14 +1,18 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
 from app.models.student import Student
 from app.schemas.student import StudentCreate, StudentUpdate
 from app.repositories import student_repository
+from app.repositories.pagination import build_page
+from app.schemas.page import DEFAULT_PAGE_SIZE
+from app.services import export_service
 from fastapi import HTTPException, status
 
 
 def register_student(db: Session, data: StudentCreate) -> Student:
     """
-    Registers a new student in the system.
+    Registers a new student in the system. DNI and email uniqueness is enforced by the
+    database rather than checked beforehand.
 
     Args:
         db (Session): SQLAlchemy session.
@@ -20,20 +24,6 @@ def register_student(db: Session, data: StudentCreate) -> Student:
     Raises:
         HTTPException: If a student with the same DNI or email already exists.
     """
-    existing_student_by_dni = db.query(Student).filter(
-        Student.dni == data.dni).first()
-    if existing_student_by_dni:
-        raise HTTPException(
-            status_code=400, detail="Student with this DNI already exists."
-        )
-
-    existing_student_by_email = db.query(Student).filter(
-        Student.email == data.email).first()
-    if existing_student_by_email:
-        raise HTTPException(
-            status_code=400, detail="Student with this email already exists."
-        )
-
     new_student = Student(
         name=data.name,
         email=data.email,
@@ -71,17 +61,32 @@ def get_student_by_dni(db: Session, dni: str) -> Optional[Student]:
     return student_repository.get_student_by_dni(db, dni)
 
 
-def list_students(db: Session) -> List[Student]:
+def list_students(
+    db: Session, after: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> dict:
     """
-    Retrieves all students stored in the database.
+    Retrieves all students stored in the database, one page at a time.
 
     Args:
         db (Session): SQLAlchemy session.
+        after (Optional[int]): Cursor returned by the previous page (None for the first page).
+        limit (int): Maximum number of rows in the page.
+
+    Returns:
+        dict: The page ``items`` and the ``next_cursor`` (None on the last page).
+    """
+    rows = student_repository.get_all_students(db, after, limit + 1)
+    return build_page(rows, limit, "student_id")
+
+
+def export_students() -> Iterator[bytes]:
+    """
+    Exports all students as newline-delimited JSON.
 
     Returns:
-        List[Student]: A list of all student records.
+        Iterator[bytes]: NDJSON chunks, one object per row, ordered by ID.
     """
-    return student_repository.get_all_students(db)
+    return export_service.stream_ndjson(student_repository.stream_students)
 
 
 def modify_student(
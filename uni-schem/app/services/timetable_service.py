@@ -0,0 +1,63 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.repositories import classroom_repository, professor_repository, student_repository
+from app.scheduling.timetable import timetables
+
+
+def get_student_timetable(db: Session, student_id: int) -> Optional[bytes]:
+    """
+    Retrieves the weekly timetable of a student: the sessions of every course they are
+    enrolled in.
+
+    Served from the in-memory timetable projection, which only re-reads the rows written
+    since the last call, so the portal does not have to chain the enrollment and schedule
+    lookups on every login.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        student_id (int): ID of the student.
+
+    Returns:
+        Optional[bytes]: JSON array of sessions ordered by day and start time, or None if
+        the student does not exist.
+    """
+    if not student_repository.get_student_by_id(db, student_id):
+        return None
+    timetables.refresh(db)
+    return timetables.render("student", student_id)
+
+
+def get_professor_timetable(db: Session, professor_id: int) -> Optional[bytes]:
+    """
+    Retrieves the weekly timetable of a professor: the sessions of every course they teach.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        professor_id (int): ID of the professor.
+
+    Returns:
+        Optional[bytes]: JSON array of sessions ordered by day and start time, or None if
+        the professor does not exist.
+    """
+    if not professor_repository.get_professor_by_id(db, professor_id):
+        return None
+    timetables.refresh(db)
+    return timetables.render("professor", professor_id)
+
+
+def get_classroom_timetable(db: Session, classroom_id: int) -> Optional[bytes]:
+    """
+    Retrieves the weekly timetable of a classroom: every session booked in it.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        classroom_id (int): ID of the classroom.
+
+    Returns:
+        Optional[bytes]: JSON array of sessions ordered by day and start time, or None if
+        the classroom does not exist.
+    """
+    if not classroom_repository.get_classroom_by_id(db, classroom_id):
+        return None
+    timetables.refresh(db)
+    return timetables.render("classroom", classroom_id)
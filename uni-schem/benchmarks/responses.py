@@ -0,0 +1,181 @@
+"""
+Benchmark for the fast JSON response path (``FAST_JSON``).
+
+For each router it builds in-memory rows and times the two ways a list or lookup route
+turns them into a response body:
+    - current: FastAPI's own ``serialize_response`` (validation into the response model
+      from the row attributes, then a JSON-mode dump) and ``JSONResponse.render``;
+    - fast: :class:`~app.schemas.serializer.RowSerializer` (attributes read straight off
+      the rows, encoded with orjson).
+Pages are measured plain and, for the routers with ``?expand=``, with every relationship
+expanded; lookups (``List[...Out]``) with ``--list-rows`` rows. Both bodies are decoded and
+compared first, so the run aborts if the fast path would change a response.
+
+No database is needed: the rows are transient ORM instances.
+
+Usage (from the ``uni-schem`` directory):
+    python -m benchmarks.responses [--rows 1000] [--list-rows 50000] [--runs 20]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import time as clock
+from typing import Any, Callable, Dict, List, Tuple, Type
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import BaseModel
+from app.models.availability import Availability
+from app.models.classroom import Classroom
+from app.models.course import Course
+from app.models.day import Day
+from app.models.professor import Professor
+from app.models.schedule import Schedule
+from app.models.student import Student
+from app.models.student_course import StudentCourse
+from app.schemas.availability import AvailabilityExpandedOut, AvailabilityOut
+from app.schemas.classroom import ClassroomOut
+from app.schemas.course import CourseExpandedOut, CourseOut
+from app.schemas.page import Page
+from app.schemas.professor import ProfessorOut
+from app.schemas.schedule import ScheduleExpandedOut, ScheduleOut
+from app.schemas.serializer import serializer_for
+from app.schemas.student import StudentOut
+from app.schemas.student_course import StudentCourseExpandedOut, StudentCourseOut
+
+DAYS = list(Day)
+
+
+def _letters(i: int) -> str:
+    """Spells ``i`` in letters, since person names may not contain digits."""
+    word = ""
+    while True:
+        i, digit = divmod(i, 26)
+        word += chr(ord("a") + digit)
+        if not i:
+            return word.capitalize()
+
+
+def professor(i: int) -> Professor:
+    return Professor(professor_id=i, name=f"Professor {_letters(i)}",
+                     email=f"professor{i}@uni.edu", phone=f"{3000000000 + i}",
+                     dni=f"{10000000 + i}")
+
+
+def classroom(i: int) -> Classroom:
+    return Classroom(classroom_id=i, name=f"Room {i}", capacity=5 + i % 36,
+                     location=f"Block {i % 20}")
+
+
+def course(i: int, expanded: bool = False) -> Course:
+    row = Course(course_id=i, name=f"Course {i}", code=f"C{i:06d}",
+                 semester=str(1 + i % 10), professor_id=i)
+    if expanded:
+        row.professor = professor(i)
+    return row
+
+
+def student(i: int) -> Student:
+    return Student(student_id=i, name=f"Student {_letters(i)}", email=f"student{i}@uni.edu",
+                   phone=f"{3100000000 + i}", dni=f"{50000000 + i}")
+
+
+def schedule(i: int, expanded: bool = False) -> Schedule:
+    hour = 7 + i % 13
+    row = Schedule(schedule_id=i, course_id=i, classroom_id=i, day=DAYS[i % len(DAYS)],
+                   start_time=clock(hour), end_time=clock(hour + 2))
+    if expanded:
+        row.course, row.classroom = course(i), classroom(i)
+    return row
+
+
+def availability(i: int, expanded: bool = False) -> Availability:
+    hour = 7 + i % 13
+    row = Availability(availability_id=i, professor_id=i, day=DAYS[i % len(DAYS)],
+                       start_time=clock(hour), end_time=clock(hour + 2))
+    if expanded:
+        row.professor = professor(i)
+    return row
+
+
+def enrollment(i: int, expanded: bool = False) -> StudentCourse:
+    row = StudentCourse(student_course_id=i, student_id=i, course_id=i)
+    if expanded:
+        row.student, row.course = student(i), course(i)
+    return row
+
+
+# Router prefix: row factory, list item schema, lookup item schema, whether it expands.
+ROUTERS: Dict[str, Tuple[Callable[..., Any], Type[BaseModel], Type[BaseModel], bool]] = {
+    "/availability": (availability, AvailabilityExpandedOut, AvailabilityOut, True),
+    "/classroom": (classroom, ClassroomOut, ClassroomOut, False),
+    "/course": (course, CourseExpandedOut, CourseOut, True),
+    "/professor": (professor, ProfessorOut, ProfessorOut, False),
+    "/schedule": (schedule, ScheduleExpandedOut, ScheduleOut, True),
+    "/student-course": (enrollment, StudentCourseExpandedOut, StudentCourseOut, True),
+    "/student": (student, StudentOut, StudentOut, False),
+}
+
+
+def cases(rows: int, list_rows: int) -> List[Tuple[str, Any, Any, Callable[[], bytes]]]:
+    """
+    Returns, per measured shape, its label, the response model, the route's return value
+    and the fast-path encoder.
+    """
+    measured = []
+    for prefix, (factory, list_schema, lookup_schema, expands) in ROUTERS.items():
+        for expanded in (False, True) if expands else (False,):
+            items = [factory(i, expanded) if expands else factory(i) for i in range(1, rows + 1)]
+            page = {"items": items, "next_cursor": rows}
+            label = f"{prefix}/ page" + (" ?expand=all" if expanded else "")
+            measured.append((label, Page[list_schema], page,
+                             lambda page=page, schema=list_schema: serializer_for(schema).encode_page(page)))
+        items = [factory(i) for i in range(1, list_rows + 1)]
+        measured.append((f"{prefix} lookup", List[lookup_schema], items,
+                         lambda items=items, schema=lookup_schema: serializer_for(schema).encode_list(items)))
+    return measured
+
+
+def current_path(loop: asyncio.AbstractEventLoop, response_model: Any, content: Any) -> bytes:
+    """Renders ``content`` the way FastAPI does for a route declaring ``response_model``."""
+    field = create_model_field(name="Response", type_=response_model, mode="serialization")
+    return JSONResponse(loop.run_until_complete(
+        serialize_response(field=field, response_content=content))).body
+
+
+def timed(call: Callable[[], bytes], runs: int) -> float:
+    """Returns the median duration of ``call`` in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="Items per page.")
+    parser.add_argument("--list-rows", type=int, default=50_000, help="Rows per lookup.")
+    parser.add_argument("--runs", type=int, default=20, help="Renders per shape and path.")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    print(f"{'shape':<38}{'rows':>8}{'current':>12}{'fast':>12}{'speedup':>10}")
+    try:
+        for label, response_model, content, fast in cases(args.rows, args.list_rows):
+            current = lambda: current_path(loop, response_model, content)
+            if json.loads(current()) != json.loads(fast()):
+                raise SystemExit(f"{label}: the fast path renders a different document.")
+            current_ms, fast_ms = timed(current, args.runs), timed(fast, args.runs)
+            rows = len(content["items"]) if isinstance(content, dict) else len(content)
+            print(f"{label:<38}{rows:>8}{current_ms:>10.1f}ms{fast_ms:>10.1f}ms"
+                  f"{current_ms / fast_ms:>9.1f}x")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Startup-time benchmark for a single API worker.
+
+For each run it starts ``uvicorn app.main:app`` in a fresh process and measures:
+    - ready: time until the server accepts connections (imports + lifespan warm-up);
+    - first request: latency of the first ``GET /professor/?limit=1`` once ready;
+    - boot to first response: the sum, i.e. how long a new replica takes to serve traffic.
+Runs alternate between ``DB_WARM_UP=true`` and ``DB_WARM_UP=false``. It also times
+``import app.models`` on its own, which no longer builds the database engine.
+
+Usage (from the ``uni-schem`` directory, with the usual MySQL variables set and the
+schema migrated):
+    python -m benchmarks.startup [--runs 5] [--port 8765]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+READY_TIMEOUT = 60.0
+
+
+def _wait_for_port(port: int, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError("The server did not start in time.")
+
+
+def boot(port: int, warm_up: bool) -> Dict[str, float]:
+    """
+    Starts one worker and returns its ``ready`` and ``first_request`` times in milliseconds.
+    """
+    env = dict(os.environ, DB_WARM_UP="true" if warm_up else "false")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        _wait_for_port(port, process)
+        ready = time.perf_counter()
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/professor/?limit=1") as response:
+            response.read()
+        served = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait()
+    return {"ready": (ready - started) * 1000, "first_request": (served - ready) * 1000}
+
+
+def import_models_ms() -> float:
+    """Times ``import app.models.*`` in a fresh interpreter, in milliseconds."""
+    code = ("import time; started = time.perf_counter(); "
+            "import app.models.course, app.models.schedule, app.models.student_course; "
+            "print((time.perf_counter() - started) * 1000)")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True, env=dict(os.environ))
+    return float(output.stdout.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure worker boot-to-ready latency.")
+    parser.add_argument("--runs", type=int, default=5, help="Boots per configuration.")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    samples: Dict[bool, List[Dict[str, float]]] = {True: [], False: []}
+    for _ in range(args.runs):
+        for warm_up in (False, True):
+            samples[warm_up].append(boot(args.port, warm_up))
+
+    print(f"import app.models: {statistics.median(import_models_ms() for _ in range(args.runs)):.0f} ms")
+    print(f"{'DB_WARM_UP':<12}{'ready':>10}{'first request':>16}{'boot to first response':>25}")
+    for warm_up, runs in samples.items():
+        ready = statistics.median(run["ready"] for run in runs)
+        first = statistics.median(run["first_request"] for run in runs)
+        total = statistics.median(run["ready"] + run["first_request"] for run in runs)
+        print(f"{str(warm_up).lower():<12}{ready:>8.0f}ms{first:>14.1f}ms{total:>23.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
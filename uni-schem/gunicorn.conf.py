@@ -0,0 +1,25 @@
+"""
+Gunicorn server hooks.
+
+The workers write their Prometheus metrics to files in ``PROMETHEUS_MULTIPROC_DIR`` so
+that ``/metrics`` reports the totals of the replica (see ``app.api.metrics``). The master
+empties the directory on start, since files left by a previous run would be counted
+again, and tells prometheus_client when a worker exits so that its in-progress gauge is
+dropped; its counters and histograms are kept.
+"""
+import os
+import shutil
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+
+def on_starting(server):
+    if PROMETHEUS_MULTIPROC_DIR:
+        shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(PROMETHEUS_MULTIPROC_DIR)
+
+
+def child_exit(server, worker):
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
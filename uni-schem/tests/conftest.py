@@ -0,0 +1,75 @@
+"""
+Test fixtures: the application against a fresh SQLite database per test.
+
+The MySQL URL is replaced by a SQLite file, the schema is created with the migrations,
+and the per-process caches are flushed, so every test starts from an empty database.
+"""
+import os
+
+os.environ.update(MYSQL_USER="test", MYSQL_PASSWORD="test", MYSQL_HOST="test",
+                  MYSQL_DB="test", DB_WARM_UP="false", INVALIDATION_TRANSPORT="local",
+                  CACHE_BACKEND="local", EDGE_PURGE_URL="")
+
+from typing import Iterator, List
+import pytest
+from fastapi import APIRouter
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.api.v1 import async_routes
+from app.cache.invalidation import ALL, publish
+from app.db import database
+from app.db.migrate import upgrade
+from app.main import app
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch) -> Iterator[Engine]:
+    monkeypatch.setattr(database, "database_url",
+                        lambda driver="pymysql": f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_session_factory", None)
+    engine = database.get_engine()
+    upgrade(engine)
+    publish(ALL)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine) -> Iterator[TestClient]:
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def statements(engine) -> List[str]:
+    """
+    Records the statements sent to the database; clear it before the measured call.
+    """
+    recorded: List[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    return recorded
+
+
+@pytest.fixture
+def async_client(engine, tmp_path, monkeypatch) -> Iterator[TestClient]:
+    """
+    The application with ``DB_MODE=async``: the async read routes, served through
+    aiosqlite on the same database, take precedence over the sync ones.
+    """
+    monkeypatch.setattr(database, "DB_MODE", "async")
+    monkeypatch.setattr(database, "database_url",
+                        lambda driver="pymysql": f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_async_session_factory", None)
+    async_router = APIRouter()
+    for prefix, router in async_routes.routers.items():
+        async_router.include_router(router, prefix=prefix)
+    monkeypatch.setattr(app.router, "routes", [*async_router.routes, *app.router.routes])
+    with TestClient(app) as client:
+        yield client
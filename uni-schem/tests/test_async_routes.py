@@ -0,0 +1,76 @@
+import pytest
+from app.repositories.classroom_repository import classroom_cache
+
+PATHS = [
+    "/availability/", "/availability/1", "/availability/professor/1",
+    "/availability/professor/2", "/availability/professor/9", "/availability/?expand=professor",
+    "/classroom/", "/classroom/1", "/classroom/9",
+    "/course/", "/course/1", "/course/professor/1", "/course/?expand=professor",
+    "/professor/", "/professor/1", "/professor/9",
+    "/schedule/", "/schedule/1", "/schedule/course/1", "/schedule/classroom/2",
+    "/schedule/?expand=course,classroom&limit=1",
+    "/student-course/", "/student-course/course/1", "/student-course/student/2",
+    "/student/", "/student/1",
+]
+
+
+@pytest.fixture
+def sync_responses(client):
+    """
+    Professor 1 teaches course 1 on Monday in classroom 1, where student 1 is enrolled;
+    maps each of ``PATHS`` to its status and body on the sync routes.
+    """
+    for number in range(2):
+        client.post("/professor/", json={"name": f"Professor {'AB'[number]}",
+                                         "email": f"p{number}@uni.edu",
+                                         "phone": f"300123456{number}",
+                                         "dni": f"1234567{number}"})
+    client.post("/availability/", json={"professor_id": 1, "day": 1,
+                                        "start_time": "08:00:00", "end_time": "12:00:00"})
+    client.post("/classroom/", json={"name": "Room A", "capacity": 30, "location": "Block A"})
+    client.post("/course/", json={"name": "Course C1", "code": "C1", "semester": "1",
+                                  "professor_id": 1})
+    assert client.post("/schedule/", json={"course_id": 1, "classroom_id": 1, "day": 1,
+                                           "start_time": "08:00:00",
+                                           "end_time": "10:00:00"}).status_code == 200
+    client.post("/student/", json={"name": "Grace Hopper", "email": "grace@uni.edu",
+                                   "phone": "3007654321", "dni": "87654321"})
+    client.post("/student-course/", json={"student_id": 1, "course_id": 1})
+    return {path: (response.status_code, response.json())
+            for path, response in ((path, client.get(path)) for path in PATHS)}
+
+
+def test_async_routes_answer_like_the_sync_routes(sync_responses, async_client, statements):
+    statements.clear()
+
+    for path in PATHS:
+        response = async_client.get(path)
+        assert (response.status_code, response.json()) == sync_responses[path], path
+
+    assert statements == []
+
+
+def test_async_routes_are_tagged_and_timed(sync_responses, async_client):
+    for path in ("/schedule/", "/schedule/1", "/schedule/course/1", "/student-course/"):
+        response = async_client.get(path)
+        assert 'desc="' in response.headers["server-timing"]
+        etag = response.headers["etag"]
+        assert async_client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    response = async_client.get("/classroom/1")
+    assert "etag" not in response.headers
+    assert "classroom:1" in response.headers["surrogate-key"].split()
+
+
+def test_async_lookup_by_id_goes_through_the_entity_cache(sync_responses, async_client,
+                                                          statements):
+    async_client.get("/classroom/1")
+    async_client.put("/classroom/1", json={"capacity": 35})
+    before = classroom_cache.snapshot()
+    statements.clear()
+
+    assert async_client.get("/classroom/1").json()["capacity"] == 35
+    assert async_client.get("/classroom/1").json()["capacity"] == 35
+    after = classroom_cache.snapshot()
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 1)
+    assert statements == []
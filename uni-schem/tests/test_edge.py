@@ -0,0 +1,101 @@
+import http.server
+import threading
+import pytest
+from app.api.edge import CACHE_CONTROL
+from app.cache import edge
+from app.cache.edge import EdgePurger
+
+
+@pytest.fixture
+def cache():
+    """
+    A purge endpoint standing in for the HTTP cache; records the purged key sets.
+    """
+    received = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_PURGE(self):
+            received.append(set(self.headers["Surrogate-Key"].split()))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/", received
+    server.shutdown()
+
+
+@pytest.fixture
+def purged(cache, monkeypatch):
+    url, received = cache
+    purger = EdgePurger(url)
+    monkeypatch.setattr(edge, "purger", purger)
+
+    def keys():
+        assert purger.flush(5)
+        found = set().union(*received)
+        received.clear()
+        return found
+
+    return keys
+
+
+def test_read_routes_are_tagged(client):
+    client.post("/classroom/", json={"name": "Room A", "capacity": 30, "location": "Block A"})
+
+    response = client.get("/classroom/1")
+
+    assert response.headers["cache-control"] == CACHE_CONTROL
+    assert response.headers["surrogate-key"] == "classroom:1"
+
+
+def test_create_purges_table_and_parent_keys_only(client, purged):
+    client.post("/professor/", json={"name": "Ada Lovelace", "email": "ada@uni.edu",
+                                     "phone": "3001234567", "dni": "12345678"})
+    assert purged() == {"professor"}
+
+    client.post("/course/", json={"name": "Course A", "code": "C1", "semester": "1",
+                                  "professor_id": 1})
+    assert purged() == {"course", "course:professor:1"}
+
+    client.post("/classroom/", json={"name": "Room A", "capacity": 30, "location": "Block A"})
+    purged()
+    rows = [{"course_id": 1, "classroom_id": 1, "day": 1, "start_time": f"{hour:02d}:00:00",
+             "end_time": f"{hour + 1:02d}:00:00"} for hour in range(7, 17)]
+    assert client.post("/schedule/bulk", json={"schedules": rows}).status_code == 200
+    assert purged() == {"schedule", "schedule:course:1", "schedule:classroom:1"}
+
+
+def test_update_purges_old_and_new_keys(client, purged):
+    client.post("/professor/", json={"name": "Ada Lovelace", "email": "ada@uni.edu",
+                                     "phone": "3001234567", "dni": "12345678"})
+    client.post("/course/", json={"name": "Course A", "code": "C1", "semester": "1",
+                                  "professor_id": 1})
+    for name in ("Room A", "Room B"):
+        client.post("/classroom/", json={"name": name, "capacity": 30, "location": "Block A"})
+    client.post("/schedule/", json={"course_id": 1, "classroom_id": 1, "day": 1,
+                                    "start_time": "08:00:00", "end_time": "10:00:00"})
+    purged()
+
+    assert client.put("/schedule/1", json={"classroom_id": 2}).status_code == 200
+
+    assert purged() == {"schedule", "schedule:1", "schedule:course:1",
+                        "schedule:classroom:1", "schedule:classroom:2"}
+
+
+def test_purges_do_not_block_writes(monkeypatch):
+    release = threading.Event()
+    sent = []
+    purger = EdgePurger("http://cache.invalid/")
+    monkeypatch.setattr(purger, "_send", lambda batch: (release.wait(5), sent.append(batch)))
+
+    purger.purge(["a", "b"])
+    purger.purge(["b", "c"])
+
+    assert not sent
+    release.set()
+    assert purger.flush(5)
+    assert set().union(*sent) == {"a", "b", "c"}
@@ -0,0 +1,68 @@
+import time
+import pytest
+from app.cache import entity_cache
+from app.cache.backends import CacheBackend, LocalCacheBackend
+from app.repositories.classroom_repository import classroom_cache
+
+
+class FailingBackend(LocalCacheBackend):
+    def get(self, key):
+        raise ConnectionError("cache down")
+
+
+@pytest.fixture
+def classroom_id(client) -> int:
+    return client.post(
+        "/classroom/", json={"name": "Room A", "capacity": 30, "location": "Block A"}
+    ).json()["classroom_id"]
+
+
+def test_backend_missing_a_method_fails_on_construction():
+    class Incomplete(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_repeated_lookup_is_served_from_the_cache(client, classroom_id, statements):
+    before = classroom_cache.snapshot()
+    client.get(f"/classroom/{classroom_id}")
+    statements.clear()
+
+    response = client.get(f"/classroom/{classroom_id}")
+
+    assert response.json()["name"] == "Room A"
+    assert not [statement for statement in statements if "FROM classroom" in statement]
+    after = classroom_cache.snapshot()
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 1)
+
+
+def test_update_evicts_the_cached_row(client, classroom_id):
+    client.get(f"/classroom/{classroom_id}")
+
+    client.put(f"/classroom/{classroom_id}", json={"capacity": 35})
+
+    assert client.get(f"/classroom/{classroom_id}").json()["capacity"] == 35
+
+
+def test_backend_failure_falls_back_to_the_database(client, classroom_id, monkeypatch):
+    monkeypatch.setattr(entity_cache, "_backend", FailingBackend())
+    errors = classroom_cache.snapshot()["errors"]
+
+    assert client.get(f"/classroom/{classroom_id}").json()["name"] == "Room A"
+    assert classroom_cache.snapshot()["errors"] == errors + 1
+
+
+def test_local_backend_expires_and_evicts_the_least_recently_used():
+    backend = LocalCacheBackend(max_entries=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+    backend.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+
+    assert (backend.get("a"), backend.get("b"), backend.get("c"), backend.get("d")) \
+        == (None, None, 3, None)
@@ -0,0 +1,56 @@
+"""
+``?expand=`` embeds the related rows with a fixed number of statements, whatever the
+number of listed rows (no lazy load per row).
+"""
+import datetime
+import pytest
+from sqlalchemy import insert
+from app.models.classroom import Classroom
+from app.models.course import Course
+from app.models.day import Day
+from app.models.professor import Professor
+from app.models.schedule import Schedule
+
+ROWS = 1000
+
+
+@pytest.fixture
+def timetable(engine):
+    """
+    1,000 sessions spread over 100 courses (of 10 professors) and 100 classrooms.
+    """
+    with engine.begin() as conn:
+        conn.execute(insert(Professor), [
+            {"name": f"Professor {chr(ord('A') + i)}", "email": f"p{i}@uni.edu",
+             "phone": f"300000000{i}", "dni": f"1000000{i}"} for i in range(10)])
+        conn.execute(insert(Course), [
+            {"name": f"Course {i}", "code": f"C{i}", "semester": "1",
+             "professor_id": i % 10 + 1} for i in range(100)])
+        conn.execute(insert(Classroom), [
+            {"name": f"Room {i}", "capacity": 30, "location": "Block A"} for i in range(100)])
+        conn.execute(insert(Schedule), [
+            {"course_id": i % 100 + 1, "classroom_id": i // 10 + 1, "day": Day.MONDAY,
+             "start_time": datetime.time(7 + i % 10), "end_time": datetime.time(8 + i % 10)}
+            for i in range(ROWS)])
+
+
+def count(client, statements, path):
+    statements.clear()
+    response = client.get(path)
+    assert response.status_code == 200, response.text
+    return len(statements), response.json()["items"]
+
+
+@pytest.mark.parametrize("path, relationships", [
+    ("/schedule/?expand=course,classroom", ("course", "classroom")),
+    ("/course/?expand=professor", ("professor",)),
+])
+def test_expanded_page_takes_constant_statements(client, statements, timetable, path,
+                                                 relationships):
+    client.get(path)  # reads the table versions of the ETag
+    small, _ = count(client, statements, f"{path}&limit=10")
+    large, items = count(client, statements, f"{path}&limit={ROWS}")
+
+    assert small == large <= 1 + len(relationships)
+    assert all(item[name] is not None for item in items for name in relationships)
+    assert len(items) == (ROWS if path.startswith("/schedule") else 100)
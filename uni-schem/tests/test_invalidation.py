@@ -0,0 +1,96 @@
+import threading
+import time
+import pytest
+from sqlalchemy import update
+from app.cache.invalidation import InvalidationBus, InvalidationTransport, LocalTransport
+from app.models.classroom import Classroom
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def started_bus(**kwargs) -> InvalidationBus:
+    bus = InvalidationBus(LocalTransport(), **kwargs)
+    bus.start()
+    return bus
+
+
+def test_stats_of_a_fresh_bus_build_the_transport():
+    stats = {}
+    thread = threading.Thread(target=lambda: stats.update(InvalidationBus().stats()), daemon=True)
+    thread.start()
+    thread.join(2)
+
+    assert stats["transport"] == "LocalTransport"
+    assert stats["connected"] is False and stats["published"] == 0
+
+
+def test_events_reach_the_other_peers_only():
+    sender, receiver = started_bus(), started_bus()
+    sent, received = [], []
+    sender.subscribe(lambda entity, entity_id: sent.append((entity, entity_id)))
+    receiver.subscribe(lambda entity, entity_id: received.append((entity, entity_id)))
+    try:
+        sender.publish("classroom", 7)
+
+        assert wait_until(lambda: received == [("classroom", 7)])
+        time.sleep(0.05)
+        assert sent == [("classroom", 7)]
+        assert sender.stats()["published"] == 1 and sender.stats()["received"] == 0
+        assert receiver.stats()["received"] == 1
+    finally:
+        sender.stop()
+        receiver.stop()
+
+
+def test_late_events_are_counted_with_their_lag():
+    receiver = started_bus(max_lag=1.0)
+    transport = LocalTransport()
+    try:
+        transport.publish({"entity": "course", "id": 1, "origin": "peer",
+                           "published_at": time.time() - 5})
+        transport.publish({"entity": "course", "id": 2, "origin": "peer",
+                           "published_at": time.time()})
+
+        assert wait_until(lambda: receiver.stats()["received"] == 2)
+        stats = receiver.stats()
+        assert stats["late"] == 1
+        assert stats["lag_seconds"]["max"] >= 5
+        assert stats["lag_seconds"]["last"] < 1
+    finally:
+        receiver.stop()
+
+
+def test_event_from_another_worker_evicts_the_cached_row(client, engine):
+    classroom_id = client.post(
+        "/classroom/", json={"name": "Room A", "capacity": 30, "location": "Block A"}
+    ).json()["classroom_id"]
+    client.get(f"/classroom/{classroom_id}")
+    with engine.begin() as conn:
+        conn.execute(update(Classroom).where(Classroom.classroom_id == classroom_id)
+                     .values(capacity=35))
+    assert client.get(f"/classroom/{classroom_id}").json()["capacity"] == 30
+
+    peer = started_bus()
+    try:
+        peer.publish("classroom", classroom_id)
+
+        assert wait_until(
+            lambda: client.get(f"/classroom/{classroom_id}").json()["capacity"] == 35)
+    finally:
+        peer.stop()
+
+
+def test_transport_missing_a_method_fails_on_construction():
+    class Incomplete(InvalidationTransport):
+        def publish(self, event):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,59 @@
+import importlib
+import pytest
+from sqlalchemy import create_engine, insert, select
+from app.db.migrate import schema_version, upgrade
+
+initial = importlib.import_module("app.db.migrations.0000_initial_schema")
+
+
+@pytest.fixture
+def legacy(tmp_path):
+    """
+    A database created before the unique keys, holding duplicate courses and enrollments.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        initial.upgrade(conn)
+        tables = initial.metadata.tables
+        conn.execute(insert(tables["professor"]), [{"name": "Ada", "email": "ada@uni.edu",
+                                                    "phone": "3001234567", "dni": "12345678"}])
+        conn.execute(insert(tables["course"]), [
+            {"name": f"Course {i}", "code": "C1", "semester": "1", "professor_id": 1}
+            for i in range(3)])
+        conn.execute(insert(tables["student"]), [{"name": "Grace", "email": "grace@uni.edu",
+                                                  "dni": "87654321"}])
+        conn.execute(insert(tables["student_course"]),
+                     [{"student_id": 1, "course_id": 1}, {"student_id": 1, "course_id": 1}])
+    yield engine
+    engine.dispose()
+
+
+def applied(engine):
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_version.c.version)).scalars())
+
+
+def test_duplicates_stop_the_migration_with_a_listing(legacy):
+    with pytest.raises(ValueError) as error:
+        upgrade(legacy)
+
+    message = str(error.value)
+    assert "uq_course_code: 1 group(s) of course rows share (code), e.g. ('C1',) x3" in message
+    assert "uq_student_course: 1 group(s)" in message
+    assert "uq_classroom_name" not in message
+    assert 1 not in applied(legacy)
+
+
+def test_migration_resumes_once_duplicates_are_removed(legacy):
+    with pytest.raises(ValueError):
+        upgrade(legacy)
+    tables = initial.metadata.tables
+    with legacy.begin() as conn:
+        conn.execute(tables["student_course"].delete().where(
+            tables["student_course"].c.student_course_id == 2))
+        conn.execute(tables["course"].update().where(tables["course"].c.course_id > 1)
+                     .values(code=tables["course"].c.code + tables["course"].c.course_id))
+
+    upgrade(legacy)
+
+    assert {1, 2, 3} <= applied(legacy)
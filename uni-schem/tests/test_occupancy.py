@@ -0,0 +1,73 @@
+from datetime import time
+import pytest
+from app.db.database import get_sessionmaker
+from app.models.day import Day
+from app.scheduling.occupancy import OccupancyIndex, occupancy, slot_mask
+
+
+def free_professors(client, start: str, end: str, day: int = 1):
+    response = client.get("/professor/free", params={"day": day, "start": start, "end": end})
+    assert response.status_code == 200, response.text
+    return [professor["professor_id"] for professor in response.json()]
+
+
+@pytest.fixture
+def staff(client):
+    """
+    Professors 1 and 2 are available on Monday 08:00-12:00; professor 1 teaches course 1
+    on Monday 08:00-10:00. Professor 3 has no availability.
+    """
+    for number in range(3):
+        client.post("/professor/", json={"name": f"Professor {'ABC'[number]}",
+                                         "email": f"p{number}@uni.edu",
+                                         "phone": f"300123456{number}",
+                                         "dni": f"1234567{number}"})
+    for professor_id in (1, 2):
+        client.post("/availability/", json={"professor_id": professor_id, "day": 1,
+                                            "start_time": "08:00:00", "end_time": "12:00:00"})
+    client.post("/classroom/", json={"name": "Room A", "capacity": 30, "location": "Block A"})
+    for code, professor_id in (("C1", 1), ("C2", 2)):
+        client.post("/course/", json={"name": f"Course {code}", "code": code, "semester": "1",
+                                      "professor_id": professor_id})
+    assert client.post("/schedule/", json={"course_id": 1, "classroom_id": 1, "day": 1,
+                                           "start_time": "08:00:00",
+                                           "end_time": "10:00:00"}).status_code == 200
+
+
+def test_free_professors_are_available_and_not_teaching(client, staff):
+    assert free_professors(client, "10:00:00", "12:00:00") == [1, 2]
+    assert free_professors(client, "09:00:00", "11:00:00") == [2]
+    assert free_professors(client, "11:00:00", "13:00:00") == []
+    assert free_professors(client, "10:00:00", "12:00:00", day=2) == []
+    assert client.get("/professor/free", params={
+        "day": 1, "start": "12:00:00", "end": "10:00:00"}).status_code == 400
+
+
+def test_writes_update_the_free_professors(client, staff):
+    assert free_professors(client, "10:00:00", "12:00:00") == [1, 2]
+
+    client.post("/schedule/", json={"course_id": 2, "classroom_id": 1, "day": 1,
+                                    "start_time": "10:00:00", "end_time": "11:00:00"})
+    assert free_professors(client, "10:00:00", "12:00:00") == [1]
+
+    client.put("/course/2", json={"professor_id": 1})
+    assert free_professors(client, "10:00:00", "12:00:00") == [2]
+    assert free_professors(client, "08:00:00", "09:00:00") == [2]
+
+
+def test_incremental_refresh_matches_a_rebuild(client, staff):
+    free_professors(client, "10:00:00", "12:00:00")
+    client.post("/schedule/", json={"course_id": 2, "classroom_id": 1, "day": 1,
+                                    "start_time": "10:00:00", "end_time": "11:00:00"})
+    assert client.put("/schedule/1", json={"start_time": "11:00:00",
+                                           "end_time": "12:00:00"}).status_code == 200
+    free_professors(client, "10:00:00", "12:00:00")
+
+    rebuilt = OccupancyIndex()
+    with get_sessionmaker()() as db:
+        rebuilt.refresh(db)
+    for start, end in (("08:00:00", "09:00:00"), ("10:00:00", "10:30:00"),
+                       ("11:00:00", "12:00:00")):
+        mask = slot_mask(Day.MONDAY, time.fromisoformat(start), time.fromisoformat(end))
+        assert occupancy.free_professor_ids(mask) == rebuilt.free_professor_ids(mask)
+        assert occupancy.free_classroom_ids(mask) == rebuilt.free_classroom_ids(mask)
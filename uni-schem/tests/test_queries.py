@@ -0,0 +1,26 @@
+from app.db.queries import normalize
+
+
+def test_failing_statement_keeps_its_error(client):
+    data = {"name": "Room A", "capacity": 30, "location": "Block A"}
+    assert client.post("/classroom/", json=data).status_code == 200
+
+    response = client.post("/classroom/", json=data)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "The request conflicts with an existing record."}
+    assert client.post("/classroom/", json={**data, "name": "Room B"}).status_code == 200
+
+
+def test_server_timing_counts_the_request_statements(client, statements):
+    statements.clear()
+    response = client.get("/classroom/")
+
+    assert f'desc="{len(statements)} queries"' in response.headers["server-timing"]
+
+
+def test_normalize_folds_literals_and_parameter_lists():
+    assert normalize("SELECT a FROM t\n WHERE t.id IN (?, ?, ?) AND t.b = 'x' AND t.c = 12") \
+        == "SELECT a FROM t WHERE t.id IN (...) AND t.b = ? AND t.c = ?"
+    assert normalize("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") \
+        == "INSERT INTO t (a, b) VALUES (...)"
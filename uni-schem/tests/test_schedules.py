@@ -0,0 +1,85 @@
+import pytest
+from app.cache.invalidation import bus
+
+
+@pytest.fixture
+def booked(client):
+    """
+    Two classrooms and two courses; the first course meets in the first classroom on
+    Monday 08:00-10:00 (schedule 1) and the second one on Monday 10:00-12:00 (schedule 2).
+    """
+    professor = client.post("/professor/", json={
+        "name": "Ada Lovelace", "email": "ada@uni.edu", "phone": "3001234567",
+        "dni": "12345678"}).json()
+    for name in ("Room A", "Room B"):
+        client.post("/classroom/", json={"name": name, "capacity": 30, "location": "Block A"})
+    for code in ("C1", "C2"):
+        client.post("/course/", json={"name": f"Course {code}", "code": code, "semester": "1",
+                                      "professor_id": professor["professor_id"]})
+    for course_id, start, end in ((1, "08:00:00", "10:00:00"), (2, "10:00:00", "12:00:00")):
+        response = client.post("/schedule/", json={
+            "course_id": course_id, "classroom_id": 1, "day": 1,
+            "start_time": start, "end_time": end})
+        assert response.status_code == 200, response.text
+
+
+def test_update_rejects_an_overlapping_booking(client, booked):
+    response = client.put("/schedule/2", json={"start_time": "09:30:00"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Classroom is already booked at this time."
+    assert client.get("/schedule/2").json()["start_time"] == "10:00:00"
+
+
+def test_update_rejects_a_course_clash_in_another_classroom(client, booked):
+    response = client.put("/schedule/2", json={"course_id": 1, "classroom_id": 2,
+                                              "start_time": "09:00:00"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Course is already scheduled at the same time."
+
+
+def test_update_does_not_conflict_with_itself(client, booked):
+    response = client.put("/schedule/2", json={"start_time": "10:30:00", "end_time": "12:30:00"})
+
+    assert response.status_code == 200
+    assert response.json()["start_time"] == "10:30:00"
+
+
+def test_update_validates_times_and_references(client, booked):
+    assert client.put("/schedule/2", json={"end_time": "09:00:00"}).status_code == 400
+    assert client.put("/schedule/2", json={"classroom_id": 99}).status_code == 404
+    assert client.put("/schedule/99", json={"day": 2}).status_code == 404
+
+
+def test_bulk_import_returns_the_ids_of_its_rows(client, booked):
+    rows = [{"course_id": 1 + hour % 2, "classroom_id": 2, "day": 2,
+             "start_time": f"{hour:02d}:00:00", "end_time": f"{hour + 1:02d}:00:00"}
+            for hour in range(7, 19)]
+    rows.insert(3, {"course_id": 1, "classroom_id": 2, "day": 1,  # clashes with schedule 1
+                    "start_time": "09:00:00", "end_time": "11:00:00"})
+
+    results = client.post("/schedule/bulk", json={"schedules": rows}).json()["results"]
+
+    created = [result for result in results if result["status_code"] == 201]
+    assert [result["index"] for result in results if result["status_code"] != 201] == [3]
+    assert [result["schedule_id"] for result in created] == list(range(3, 3 + len(created)))
+    for result in created:
+        stored = client.get(f"/schedule/{result['schedule_id']}").json()
+        assert (stored["course_id"], stored["start_time"]) \
+            == (result["course_id"], result["start_time"])
+
+
+def test_bulk_import_publishes_one_invalidation(client, booked, monkeypatch):
+    assert client.get("/classroom/2/timetable").json() == []
+    events = []
+    monkeypatch.setattr(bus, "_handlers",
+                        [*bus._handlers, lambda entity, entity_id: events.append((entity, entity_id))])
+    rows = [{"course_id": 1, "classroom_id": 2, "day": 3,
+             "start_time": f"{hour:02d}:00:00", "end_time": f"{hour + 1:02d}:00:00"}
+            for hour in range(7, 12)]
+
+    assert client.post("/schedule/bulk", json={"schedules": rows}).status_code == 200
+
+    assert events == [("schedule", None)]
+    assert len(client.get("/classroom/2/timetable").json()) == len(rows)
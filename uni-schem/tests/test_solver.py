@@ -0,0 +1,170 @@
+import pytest
+from app.models.day import Day
+from app.scheduling import solver
+
+
+class Stop(Exception):
+    pass
+
+
+@pytest.fixture
+def requested_workers(monkeypatch):
+    seen = []
+
+    def solve_multistart(problem, **options):
+        seen.append(options["workers"])
+        raise Stop
+
+    monkeypatch.setattr(solver, "solve_multistart", solve_multistart)
+    return seen
+
+
+def solve(client, **options):
+    client.post("/schedule/solve", json={"restarts": 256, "dry_run": True, **options})
+
+
+def test_client_workers_are_capped_at_the_server_limit(client, requested_workers, monkeypatch):
+    monkeypatch.setenv("SOLVER_WORKERS", "2")
+    monkeypatch.setattr(solver.os, "cpu_count", lambda: 8)
+
+    solve(client, workers=256)
+    solve(client, workers=1)
+    solve(client)
+
+    assert requested_workers == [2, 1, 2]
+
+
+def test_worker_limit_never_exceeds_the_cpus(monkeypatch):
+    monkeypatch.setattr(solver.os, "cpu_count", lambda: 4)
+    monkeypatch.setenv("SOLVER_WORKERS", "64")
+    assert solver.worker_limit() == 4
+    monkeypatch.delenv("SOLVER_WORKERS")
+    assert solver.worker_limit() == 4
+
+
+def feasibility_errors(problem: solver.TimetableProblem, solution: solver.Solution) -> list:
+    """
+    Checks a solution against the hard constraints of its problem.
+    """
+    courses = {course.course_id: course for course in problem.courses}
+    capacity = {room.classroom_id: room.capacity for room in problem.rooms}
+    sessions = [(placement.course_id, courses[placement.course_id].professor_id,
+                 placement.classroom_id, placement.day, placement.start, placement.end)
+                for placement in solution.placements]
+    sessions += [(fixed.course_id, fixed.professor_id, fixed.classroom_id, fixed.day,
+                  fixed.start, fixed.end) for fixed in problem.fixed]
+
+    errors = []
+    for first, (course, professor, room, day, start, end) in enumerate(sessions):
+        for other, other_professor, other_room, other_day, other_start, other_end \
+                in sessions[first + 1:]:
+            if day != other_day or end <= other_start or other_end <= start:
+                continue
+            if room == other_room:
+                errors.append(f"room {room} double-booked on {day.name} at {start}")
+            if professor == other_professor:
+                errors.append(f"professor {professor} double-booked on {day.name} at {start}")
+            if other in problem.conflicts.get(course, ()):
+                errors.append(f"courses {course} and {other} share students on {day.name}")
+
+    for placement in solution.placements:
+        course = courses[placement.course_id]
+        if not any(day == placement.day and start <= placement.start and placement.end <= end
+                   for day, start, end in problem.availability.get(course.professor_id, [])):
+            errors.append(f"course {course.course_id} outside its professor's availability")
+        if capacity[placement.classroom_id] < course.enrollment:
+            errors.append(f"course {course.course_id} in a room too small")
+
+    placed = {course_id: 0 for course_id in courses}
+    for placement in solution.placements:
+        placed[placement.course_id] += 1
+    for course_id, course in courses.items():
+        if placed[course_id] + solution.unplaced.get(course_id, 0) != course.sessions:
+            errors.append(f"course {course_id} sessions dropped without being reported")
+    return errors
+
+
+@pytest.fixture
+def problem() -> solver.TimetableProblem:
+    """
+    Two days of 08:00-14:00 with three 2-hour slots each, two rooms and a fixed session.
+    Course 5 fits no room and course 6's professor has no availability.
+    """
+    monday, tuesday = Day.MONDAY, Day.TUESDAY
+    return solver.TimetableProblem(
+        courses=[
+            solver.CourseDemand(1, professor_id=10, enrollment=35, sessions=2),
+            solver.CourseDemand(2, professor_id=10, enrollment=10, sessions=2),
+            solver.CourseDemand(3, professor_id=11, enrollment=15, sessions=2),
+            solver.CourseDemand(4, professor_id=12, enrollment=20, sessions=2),
+            solver.CourseDemand(5, professor_id=12, enrollment=100, sessions=1),
+            solver.CourseDemand(6, professor_id=13, enrollment=5, sessions=1),
+        ],
+        rooms=[solver.Room(1, capacity=20), solver.Room(2, capacity=40)],
+        availability={
+            10: [(monday, 8 * 60, 14 * 60), (tuesday, 8 * 60, 12 * 60)],
+            11: [(monday, 8 * 60, 12 * 60), (tuesday, 10 * 60, 14 * 60)],
+            12: [(monday, 8 * 60, 14 * 60), (tuesday, 8 * 60, 14 * 60)],
+        },
+        conflicts=solver.course_conflicts([(1, 3), (3, 4), (2, 4)]),
+        fixed=[solver.FixedSession(None, 11, 2, monday, 8 * 60, 10 * 60)],
+        days=[monday, tuesday],
+        day_start=8 * 60,
+        day_end=14 * 60,
+        slot_minutes=60,
+        session_minutes=120,
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solution_respects_the_hard_constraints(problem, seed):
+    solution = solver.solve(problem, seed=seed)
+
+    assert feasibility_errors(problem, solution) == []
+    assert solution.unplaced.get(5) == 1 and solution.unplaced.get(6) == 1
+    assert sum(solution.unplaced.values()) == 2
+
+
+def test_multistart_keeps_a_feasible_best_solution(problem):
+    solution = solver.solve_multistart(problem, restarts=4, workers=1, seed=0)
+
+    assert feasibility_errors(problem, solution) == []
+    assert solution.restarts == 4 and sum(solution.unplaced.values()) == 2
+
+
+def test_solve_endpoint_stores_a_feasible_timetable(client):
+    client.post("/professor/", json={"name": "Ada Lovelace", "email": "ada@uni.edu",
+                                     "phone": "3001234567", "dni": "12345678"})
+    client.post("/professor/", json={"name": "Alan Turing", "email": "alan@uni.edu",
+                                     "phone": "3001234568", "dni": "12345679"})
+    client.post("/availability/", json={"professor_id": 1, "day": 1,
+                                        "start_time": "08:00:00", "end_time": "12:00:00"})
+    for name, capacity in (("Room A", 5), ("Room B", 10)):
+        client.post("/classroom/", json={"name": name, "capacity": capacity, "location": "A"})
+    for code, professor_id in (("C1", 1), ("C2", 1), ("C3", 2)):
+        client.post("/course/", json={"name": f"Course {code}", "code": code, "semester": "1",
+                                      "professor_id": professor_id})
+    for number in range(6):
+        client.post("/student/", json={"name": f"Student {'ABCDEF'[number]}",
+                                       "email": f"s{number}@uni.edu",
+                                       "dni": f"9000000{number}"})
+        client.post("/student-course/", json={"student_id": number + 1, "course_id": 1})
+    client.post("/student-course/", json={"student_id": 1, "course_id": 2})
+
+    response = client.post("/schedule/solve", json={
+        "sessions_per_course": 1, "days": [1, 2], "day_start": "08:00:00",
+        "day_end": "14:00:00", "restarts": 2, "workers": 1, "seed": 1})
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["stored"] is True
+    assert result["unplaced"] == [{"course_id": 3, "missing_sessions": 1}]
+    stored = {entry["course_id"]: entry for entry in client.get("/schedule/").json()["items"]}
+    assert set(stored) == {1, 2}
+    assert [entry["schedule_id"] for entry in result["schedules"]] \
+        == [stored[entry["course_id"]]["schedule_id"] for entry in result["schedules"]]
+    assert stored[1]["classroom_id"] == 2
+    assert {stored[1]["day"], stored[2]["day"]} == {1}
+    assert {(stored[1]["start_time"], stored[1]["end_time"]),
+            (stored[2]["start_time"], stored[2]["end_time"])} \
+        == {("08:00:00", "10:00:00"), ("10:00:00", "12:00:00")}
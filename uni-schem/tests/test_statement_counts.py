@@ -0,0 +1,46 @@
+"""
+Statements sent per successful create, with cold entity caches: the service validates
+once, the repository inserts, the table version is bumped and the row is refreshed.
+"""
+import pytest
+from app.cache.invalidation import ALL, publish
+
+PROFESSOR = {"name": "Ada Lovelace", "email": "ada@uni.edu", "phone": "3001234567",
+             "dni": "12345678"}
+CLASSROOM = {"name": "Room A", "capacity": 30, "location": "Block A"}
+COURSE = {"name": "Course A", "code": "C1", "semester": "1", "professor_id": 1}
+STUDENT = {"name": "Grace Hopper", "email": "grace@uni.edu", "phone": "3007654321",
+           "dni": "87654321"}
+SESSION = {"day": 1, "start_time": "08:00:00", "end_time": "10:00:00"}
+
+
+@pytest.fixture
+def parents(client):
+    for path, body in (("/professor/", PROFESSOR), ("/classroom/", CLASSROOM),
+                       ("/course/", COURSE), ("/student/", STUDENT)):
+        assert client.post(path, json=body).status_code == 200
+
+
+@pytest.mark.parametrize("path, body, expected", [
+    # insert, version bump, refresh
+    ("/professor/", {**PROFESSOR, "email": "other@uni.edu", "phone": "3009999999",
+                     "dni": "11223344"}, 3),
+    ("/classroom/", {**CLASSROOM, "name": "Room B"}, 3),
+    ("/student/", {**STUDENT, "email": "other@uni.edu", "dni": "44332211"}, 3),
+    # + professor exists, name is free
+    ("/course/", {**COURSE, "name": "Course B", "code": "C2"}, 5),
+    # + course and classroom exist, one conflict index load
+    ("/schedule/", {"course_id": 1, "classroom_id": 1, **SESSION}, 6),
+    # + student and course exist
+    ("/student-course/", {"student_id": 1, "course_id": 1}, 5),
+    # + professor exists, no overlapping availability
+    ("/availability/", {"professor_id": 1, **SESSION}, 5),
+])
+def test_create_statement_count(client, statements, parents, path, body, expected):
+    publish(ALL)
+    statements.clear()
+
+    response = client.post(path, json=body)
+
+    assert response.status_code == 200, response.text
+    assert len(statements) == expected, statements
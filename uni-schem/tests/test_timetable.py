@@ -0,0 +1,87 @@
+import pytest
+from app.db.database import get_sessionmaker
+from app.scheduling.timetable import TimetableProjection
+
+
+def sessions(response):
+    assert response.status_code == 200, response.text
+    return [(entry["day"], entry["start_time"], entry["course_code"], entry["classroom_name"],
+             entry["professor_name"]) for entry in response.json()]
+
+
+def rebuilt(owner: str, owner_id: int) -> bytes:
+    projection = TimetableProjection()
+    with get_sessionmaker()() as db:
+        projection.refresh(db)
+    return projection.render(owner, owner_id)
+
+
+@pytest.fixture
+def week(client):
+    """
+    Professor 1 teaches C1 (Wednesday 10:00 and Monday 08:00, in Room A) and C2 (Monday
+    14:00, in Room B); student 1 is enrolled in C1 only.
+    """
+    client.post("/professor/", json={"name": "Ada Lovelace", "email": "ada@uni.edu",
+                                     "phone": "3001234567", "dni": "12345678"})
+    for name in ("Room A", "Room B"):
+        client.post("/classroom/", json={"name": name, "capacity": 30, "location": "Block A"})
+    for code in ("C1", "C2"):
+        client.post("/course/", json={"name": f"Course {code}", "code": code, "semester": "1",
+                                      "professor_id": 1})
+    for course_id, classroom_id, day, start, end in (
+            (1, 1, 3, "10:00:00", "12:00:00"), (1, 1, 1, "08:00:00", "10:00:00"),
+            (2, 2, 1, "14:00:00", "16:00:00")):
+        assert client.post("/schedule/", json={
+            "course_id": course_id, "classroom_id": classroom_id, "day": day,
+            "start_time": start, "end_time": end}).status_code == 200
+    client.post("/student/", json={"name": "Grace Hopper", "email": "grace@uni.edu",
+                                   "phone": "3007654321", "dni": "87654321"})
+    assert client.post("/student-course/", json={"student_id": 1, "course_id": 1}).status_code == 200
+
+
+def test_views_list_the_sessions_in_weekly_order(client, week):
+    assert sessions(client.get("/student/1/timetable")) == [
+        (1, "08:00:00", "C1", "Room A", "Ada Lovelace"),
+        (3, "10:00:00", "C1", "Room A", "Ada Lovelace")]
+    assert [session[:3] for session in sessions(client.get("/professor/1/timetable"))] == [
+        (1, "08:00:00", "C1"), (1, "14:00:00", "C2"), (3, "10:00:00", "C1")]
+    assert [session[:3] for session in sessions(client.get("/classroom/2/timetable"))] == [
+        (1, "14:00:00", "C2")]
+
+
+def test_unknown_owner_is_not_found(client, week):
+    assert client.get("/student/99/timetable").status_code == 404
+    assert client.get("/professor/99/timetable").status_code == 404
+    assert client.get("/classroom/99/timetable").status_code == 404
+
+
+def test_writes_update_the_rendered_views(client, week):
+    for path in ("/student/1/timetable", "/professor/1/timetable", "/classroom/1/timetable"):
+        client.get(path)
+
+    client.put("/course/1", json={"code": "C9"})
+    client.put("/classroom/1", json={"name": "Room Z"})
+    client.post("/student-course/", json={"student_id": 1, "course_id": 2})
+    client.put("/schedule/1", json={"day": 5})
+
+    assert sessions(client.get("/student/1/timetable")) == [
+        (1, "08:00:00", "C9", "Room Z", "Ada Lovelace"),
+        (1, "14:00:00", "C2", "Room B", "Ada Lovelace"),
+        (5, "10:00:00", "C9", "Room Z", "Ada Lovelace")]
+    for owner, owner_id in (("student", 1), ("professor", 1), ("classroom", 1)):
+        assert client.get(f"/{owner}/{owner_id}/timetable").content == rebuilt(owner, owner_id)
+
+
+def test_refresh_reads_only_the_changed_rows(client, week, statements):
+    client.get("/student/1/timetable")
+    client.post("/schedule/", json={"course_id": 1, "classroom_id": 2, "day": 2,
+                                    "start_time": "08:00:00", "end_time": "09:00:00"})
+    statements.clear()
+
+    assert len(sessions(client.get("/student/1/timetable"))) == 3
+
+    read = [statement for statement in statements if "FROM" in statement]
+    assert not [statement for statement in read
+                if "FROM professor" in statement or "FROM student_course" in statement]
+    assert [statement for statement in read if "FROM schedule" in statement]
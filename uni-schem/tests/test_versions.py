@@ -0,0 +1,62 @@
+from sqlalchemy import select
+from app.db.database import get_sessionmaker
+from app.db.versions import table_versions
+from app.models.classroom import Classroom
+from app.models.professor import Professor
+
+
+def read_versions(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(
+            select(table_versions.c.table_name, table_versions.c.version)).all())
+
+
+def test_versions_are_bumped_once_at_commit(engine, statements):
+    before = read_versions(engine)
+    with get_sessionmaker()() as db:
+        db.add(Professor(name="Ada Lovelace", email="ada@uni.edu", phone="3001234567",
+                         dni="12345678"))
+        db.flush()
+        db.add(Classroom(name="Room A", capacity=30, location="Block A"))
+        db.flush()
+        statements.clear()
+        db.commit()
+
+    bumps = [statement for statement in statements if "table_versions" in statement]
+    assert len(bumps) == 1 and statements[-1] == bumps[0]
+    after = read_versions(engine)
+    changed = {table for table in after if after[table] != before[table]}
+    assert changed == {"classroom", "professor"}
+    assert after["classroom"] == before["classroom"] + 1
+
+
+def test_rolled_back_writes_are_not_bumped(engine):
+    before = read_versions(engine)
+    with get_sessionmaker()() as db:
+        db.add(Classroom(name="Room A", capacity=30, location="Block A"))
+        db.flush()
+        db.rollback()
+        db.commit()
+
+    assert read_versions(engine) == before
+
+
+def test_write_changes_the_etag(client):
+    etag = client.get("/classroom/").headers["etag"]
+    assert client.get("/classroom/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/classroom/", json={"name": "Room A", "capacity": 30, "location": "Block A"})
+
+    assert client.get("/classroom/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_async_routes_read_the_versions_through_the_async_engine(async_client, statements):
+    async_client.post("/classroom/", json={"name": "Room A", "capacity": 30,
+                                           "location": "Block A"})
+    statements.clear()
+
+    etag = async_client.get("/classroom/").headers["etag"]
+    response = async_client.get("/classroom/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304 and response.headers["etag"] == etag
+    assert statements == []